@@ -0,0 +1,210 @@
+"""녹화된 검색 응답과 기사 페이지를 재생하는 로컬 네이버 API / 언론사 대역 서버.
+
+HTTP 프록시로 동작하므로 기사 URL의 호스트(n.news.naver.com, www.yna.co.kr ...)가 그대로 유지되어
+호스트별 추출 규칙과 연결 풀 동작을 실제와 같은 조건에서 잴 수 있다.
+
+    with FakeNaver() as fake:
+        settings = Settings(search_url=fake.search_url, ...)
+        # 프록시 환경 변수(HTTP_PROXY)를 fake.proxy_env로 설정한 뒤 수집기를 만든다
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+SEARCH_PATH = "/v1/search/news.json"
+WRITE_CHUNK = 8192
+
+
+def fixture_key(url: str) -> str:
+    """스킴을 뺀 호스트+경로+쿼리. manifest.json의 pages 키와 같은 형식"""
+    parts = urllib.parse.urlsplit(url)
+    return parts.netloc + parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+class FakeNaver:
+    """manifest.json에 기록된 응답을 돌려주는 로컬 서버.
+
+    latency는 모든 응답에 더하는 왕복 지연(초)이고, 페이지별 delay는 manifest에 기록된 값을 따른다.
+    requests/bytes_sent 카운터로 실제로 전송된 요청 수와 바이트 수를 확인할 수 있다.
+    """
+
+    def __init__(self, fixtures: Path = FIXTURES, latency: float = 0.0) -> None:
+        self.fixtures = fixtures
+        self.latency = latency
+        manifest = json.loads((fixtures / "manifest.json").read_text(encoding="utf-8"))
+        self.search: Dict[str, Dict[str, Any]] = {
+            topic: json.loads((fixtures / path).read_text(encoding="utf-8"))
+            for topic, path in manifest["search"].items()
+        }
+        self.pages: Dict[str, Dict[str, Any]] = manifest["pages"]
+        self._bodies: Dict[str, bytes] = {
+            key: _with_trailing_script((fixtures / page["file"]).read_bytes(), page.get("trailing_script_bytes", 0))
+            for key, page in self.pages.items()
+            if "file" in page
+        }
+        # 페이지별로 지금까지 돌려준 실패 응답 수 (manifest의 fail_times 재현용)
+        self._failures: Dict[str, int] = {}
+        self.requests = 0
+        self.search_requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def address(self) -> str:
+        assert self._server is not None, "start()를 먼저 호출하세요."
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url(self) -> str:
+        # 프록시를 거치도록 https 대신 http로 요청한다
+        return f"http://openapi.naver.com{SEARCH_PATH}"
+
+    @property
+    def proxy_env(self) -> Dict[str, str]:
+        return {"HTTP_PROXY": self.address, "http_proxy": self.address, "NO_PROXY": "", "no_proxy": ""}
+
+    def topics(self) -> List[str]:
+        return list(self.search)
+
+    def article_urls(self) -> List[str]:
+        """재생 가능한 모든 기사 URL (검색 응답과 같은 http 스킴)"""
+        return [f"http://{key}" for key in self.pages]
+
+    def add_page(self, url: str, body: bytes = b"", **options: Any) -> None:
+        """manifest에 없는 페이지를 추가한다. options는 manifest 항목과 같다 (status, delay, fail_times 등)."""
+        key = fixture_key(url)
+        self.pages[key] = options
+        if body:
+            self._bodies[key] = body
+        self._failures.pop(key, None)
+
+    def start(self) -> FakeNaver:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                fake._handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = _QuietServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, name="fake-naver", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = self.search_requests = self.bytes_sent = 0
+
+    def __enter__(self) -> FakeNaver:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        # 프록시 요청은 절대 URL, 직접 요청은 경로만 들어온다
+        url = handler.path if "://" in handler.path else f"http://{handler.headers.get('Host', '')}{handler.path}"
+        parts = urllib.parse.urlsplit(url)
+        if self.latency:
+            time.sleep(self.latency)
+
+        if parts.path == SEARCH_PATH:
+            status, content_type, body = self._search(handler, parts.query)
+        else:
+            page = self.pages.get(fixture_key(url))
+            if page is None:
+                status, content_type, body = 404, "text/html; charset=utf-8", b"<html><body>Not Found</body></html>"
+            else:
+                if page.get("delay"):
+                    time.sleep(page["delay"])
+                status = page.get("status", 200)
+                # 처음 fail_times번은 503으로 응답한다 (일시적 장애 재현)
+                with self._lock:
+                    failures = self._failures.get(fixture_key(url), 0)
+                    if failures < page.get("fail_times", 0):
+                        self._failures[fixture_key(url)] = failures + 1
+                        status = 503
+                content_type = page.get("content_type", "text/html; charset=utf-8")
+                body = self._bodies.get(fixture_key(url), b"<html><body>error</body></html>")
+
+        with self._lock:
+            self.requests += 1
+        try:
+            handler.send_response(status)
+            handler.send_header("Content-Type", content_type)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            # 수신 측이 중간에 끊으면 그 이후 바이트는 세지 않도록 나눠서 보낸다
+            for start in range(0, len(body), WRITE_CHUNK):
+                handler.wfile.write(body[start:start + WRITE_CHUNK])
+                handler.wfile.flush()
+                with self._lock:
+                    self.bytes_sent += len(body[start:start + WRITE_CHUNK])
+        except (BrokenPipeError, ConnectionResetError):
+            # 수집기가 마감 시간으로 요청을 취소했거나 본문을 끝까지 읽지 않은 경우
+            handler.close_connection = True
+
+    def _search(self, handler: BaseHTTPRequestHandler, query: str) -> tuple[int, str, bytes]:
+        with self._lock:
+            self.search_requests += 1
+        if not handler.headers.get("X-Naver-Client-Id") or not handler.headers.get("X-Naver-Client-Secret"):
+            return 401, "application/json", b'{"errorCode":"024","errorMessage":"Authentication failed"}'
+
+        params = dict(urllib.parse.parse_qsl(query))
+        recorded = self.search.get(params.get("query", ""))
+        if recorded is None:
+            items: List[Dict[str, Any]] = []
+        else:
+            display = int(params.get("display", 10))
+            items = [
+                # 프록시로 재생할 수 있도록 https 링크를 http로 바꾼다
+                {key: value.replace("https://", "http://", 1) if key in ("originallink", "link") else value
+                 for key, value in item.items()}
+                for item in recorded["items"][:display]
+            ]
+        payload = {
+            "lastBuildDate": (recorded or {}).get("lastBuildDate", ""),
+            "total": (recorded or {}).get("total", 0),
+            "start": 1,
+            "display": len(items),
+            "items": items,
+        }
+        return 200, "application/json; charset=utf-8", json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _with_trailing_script(body: bytes, size: int) -> bytes:
+    """본문 뒤에 size 바이트 크기의 스크립트를 붙인다 (댓글·광고 스크립트가 큰 포털 페이지 재현용)"""
+    if not size:
+        return body
+    line = b"window.__ads.push({slot:'comment-ad',lazy:true,track:'https://ad.example.com/px'});\n"
+    script = b"<script>\n" + line * (size // len(line)) + b"</script>\n"
+    index = body.rfind(b"</body>")
+    return body[:index] + script + body[index:] if index >= 0 else body + script
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # 수집기가 keep-alive 연결을 먼저 닫는 것은 정상 동작이므로 트레이스백을 남기지 않는다
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
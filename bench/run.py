@@ -0,0 +1,316 @@
+"""NewsCollector 성능 측정 스크립트.
+
+녹화된 검색 응답과 기사 페이지(bench/fixtures)를 로컬 대역 서버로 재생하므로 네트워크나 API 키 없이
+같은 조건에서 반복 측정할 수 있다. 결과는 JSON으로 저장되고, --compare로 두 결과를 비교한다.
+
+    uv run python bench/run.py --rounds 20 --latency 0.03
+    uv run python bench/run.py --scenarios --startup-rounds 5   # 서버 기동 시간만 측정
+    uv run python bench/run.py --compare bench/results/before.json bench/results/after.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "mcp_server"))
+
+from config import Settings  # noqa: E402
+from fake_naver import FakeNaver  # noqa: E402
+from tool.tool import NewsCollector  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# 새 프로세스에서 서버 모듈 import, create_server(), /ready가 200이 될 때까지의 시간을 재고 JSON으로 출력한다
+STARTUP_SCRIPT = """
+import asyncio, json, time
+started = time.perf_counter()
+import httpx
+import server
+imported = time.perf_counter()
+mcp = server.create_server()
+created = time.perf_counter()
+app = mcp.http_app()
+
+async def wait_ready():
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            while (await client.get("/ready")).status_code != 200:
+                await asyncio.sleep(0.005)
+            return time.perf_counter()
+
+ready = asyncio.run(wait_ready())
+print(json.dumps({"import_ms": (imported - started) * 1000, "create_ms": (created - imported) * 1000,
+                  "ready_ms": (ready - started) * 1000}))
+"""
+
+# 시나리오 하나의 측정값: (호출별 지연 시간(초) 목록, 처리한 단위 수)
+Samples = Tuple[List[float], int]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """최근접 순위 방식의 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def bench_search(collector: NewsCollector, fake: FakeNaver, rounds: int) -> Samples:
+    latencies = []
+    for _ in range(rounds):
+        for topic in fake.topics():
+            started = time.perf_counter()
+            collector.fetch_naver_news_items(topic, display=10)
+            latencies.append(time.perf_counter() - started)
+    return latencies, len(latencies)
+
+
+def bench_article(collector: NewsCollector, fake: FakeNaver, rounds: int) -> Samples:
+    latencies, pages = [], 0
+    for _ in range(rounds):
+        for url in fake.article_urls():
+            started = time.perf_counter()
+            text = collector.fetch_article_text(url)
+            latencies.append(time.perf_counter() - started)
+            pages += bool(text)
+    return latencies, pages
+
+
+def bench_collect(collector: NewsCollector, fake: FakeNaver, rounds: int) -> Samples:
+    latencies, pages = [], 0
+    for _ in range(rounds):
+        for topic in fake.topics():
+            started = time.perf_counter()
+            articles = collector.collect_articles(topic, display=10)
+            latencies.append(time.perf_counter() - started)
+            pages += len(articles)
+    return latencies, pages
+
+
+def bench_collect_async(collector: NewsCollector, fake: FakeNaver, rounds: int) -> Samples:
+    async def run() -> Samples:
+        latencies, pages = [], 0
+        for _ in range(rounds):
+            for topic in fake.topics():
+                started = time.perf_counter()
+                articles = await collector.collect_articles_async(topic, limit=collector.settings.max_articles)
+                latencies.append(time.perf_counter() - started)
+                pages += len(articles)
+        await collector.http.aclose()
+        return latencies, pages
+
+    return asyncio.run(run())
+
+
+SCENARIOS: Dict[str, Tuple[Callable[[NewsCollector, FakeNaver, int], Samples], str]] = {
+    "search": (bench_search, "calls"),
+    "article": (bench_article, "pages"),
+    "collect": (bench_collect, "articles"),
+    "collect_async": (bench_collect_async, "articles"),
+}
+
+
+def bench_startup(args: argparse.Namespace) -> Dict[str, object]:
+    """서버 콜드 스타트 시간. 매번 새 프로세스를 띄워 import 캐시 없이 잰다 (각 항목은 중앙값)."""
+    env = dict(
+        os.environ,
+        NAVER_CLIENT_ID="bench",
+        NAVER_CLIENT_SECRET="bench",
+        PARSE_EXECUTOR=args.parse_executor,
+        EXTRACT_BACKEND=args.backend,
+        PYTHONPATH=str(ROOT / "src" / "mcp_server"),
+    )
+    samples: Dict[str, List[float]] = {"import_ms": [], "create_ms": [], "ready_ms": []}
+    for _ in range(args.startup_rounds):
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT], cwd=ROOT / "src" / "mcp_server", env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        for key, value in json.loads(out.strip().splitlines()[-1]).items():
+            samples[key].append(value)
+    return {key: round(percentile(values, 50), 1) for key, values in samples.items()}
+
+
+def make_settings(fake: FakeNaver, args: argparse.Namespace) -> Settings:
+    return Settings(
+        client_id="bench",
+        client_secret="bench",
+        search_url=fake.search_url,
+        extract_backend=args.backend,
+        parse_executor=args.parse_executor,
+        max_concurrency=args.concurrency,
+        # 기본은 캐시를 끄고 매 호출의 콜드 경로를 잰다
+        article_cache_size=1024 if args.warm else 0,
+        search_cache_ttl=60.0 if args.warm else 0.0,
+    )
+
+
+def run_scenario(name: str, fake: FakeNaver, args: argparse.Namespace) -> Dict[str, object]:
+    func, unit = SCENARIOS[name]
+    collector = NewsCollector(make_settings(fake, args))
+    try:
+        collector.warm_up()
+        # 연결 풀과 파싱 풀을 데우는 한 바퀴는 측정에서 제외
+        func(collector, fake, 1)
+
+        fake.reset_counters()
+        downloaded_before = sum(collector.metrics.download_bytes.value(kind) for kind in ("search", "download"))
+        gc.collect()
+        started = time.perf_counter()
+        latencies, count = func(collector, fake, args.rounds)
+        elapsed = time.perf_counter() - started
+        requests, bytes_sent = fake.requests, fake.bytes_sent
+        downloaded = sum(collector.metrics.download_bytes.value(kind) for kind in ("search", "download"))
+
+        # 메모리 추적은 실행 속도를 떨어뜨리므로 별도의 한 바퀴에서만 잰다
+        gc.collect()
+        tracemalloc.start()
+        func(collector, fake, 1)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        collector.close()
+
+    return {
+        "unit": unit,
+        "calls": len(latencies),
+        "count": count,
+        "elapsed_s": round(elapsed, 4),
+        "per_sec": round(count / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "peak_mem_kb": round(peak / 1024, 1),
+        "upstream_requests": requests,
+        "upstream_bytes": bytes_sent,
+        # 수집기가 실제로 읽은 응답 본문 바이트 (중간에 끊은 요청은 읽은 만큼만)
+        "downloaded_bytes": int(downloaded - downloaded_before),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    with FakeNaver(latency=args.latency) as fake:
+        os.environ.update(fake.proxy_env)
+        results = {name: run_scenario(name, fake, args) for name in args.scenarios}
+    startup = bench_startup(args) if args.startup_rounds else {}
+
+    return {
+        "meta": {
+            "label": args.label,
+            "revision": git_revision(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "rounds": args.rounds,
+            "latency_s": args.latency,
+            "backend": args.backend,
+            "parse_executor": args.parse_executor,
+            "concurrency": args.concurrency,
+            "warm_cache": args.warm,
+            "startup_rounds": args.startup_rounds,
+            # ru_maxrss는 리눅스에서 KB 단위
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "results": results,
+        "startup": startup,
+    }
+
+
+def print_report(report: Dict[str, object]) -> None:
+    print(
+        f"{'scenario':<14}{'calls':>7}{'per_sec':>10}{'p50_ms':>10}{'p90_ms':>10}{'p99_ms':>10}{'peak_kb':>10}"
+        f"{'downloaded':>12}"
+    )
+    for name, row in report["results"].items():
+        print(
+            f"{name:<14}{row['calls']:>7}{row['per_sec']:>10}{row['p50_ms']:>10}{row['p90_ms']:>10}"
+            f"{row['p99_ms']:>10}{row['peak_mem_kb']:>10}{row['downloaded_bytes']:>12}"
+        )
+    startup = report.get("startup")
+    if startup:
+        print("startup: " + "  ".join(f"{key}={value}" for key, value in startup.items()))
+
+
+def compare(base_path: Path, new_path: Path) -> None:
+    """두 결과 파일의 같은 시나리오끼리 지표 변화를 출력한다."""
+    base = json.loads(base_path.read_text(encoding="utf-8"))
+    new = json.loads(new_path.read_text(encoding="utf-8"))
+    print(f"base: {base_path} ({base['meta']['revision']})  new: {new_path} ({new['meta']['revision']})")
+    print(f"{'scenario':<14}{'metric':<16}{'base':>12}{'new':>12}{'change':>10}")
+    for name, row in new["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            continue
+        for metric in ("per_sec", "p50_ms", "p90_ms", "p99_ms", "peak_mem_kb", "upstream_bytes", "downloaded_bytes"):
+            before, after = old.get(metric, 0), row.get(metric, 0)
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "-"
+            print(f"{name:<14}{metric:<16}{before:>12}{after:>12}{change:>10}")
+    # 기동 시간은 startup-rounds를 준 결과끼리만 비교한다
+    old_startup, new_startup = base.get("startup") or {}, new.get("startup") or {}
+    for metric, after in new_startup.items():
+        if metric not in old_startup:
+            continue
+        before = old_startup[metric]
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "-"
+        print(f"{'startup':<14}{metric:<16}{before:>12}{after:>12}{change:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NewsCollector 성능 측정")
+    parser.add_argument("--rounds", type=int, default=10, help="시나리오별 반복 횟수")
+    parser.add_argument("--latency", type=float, default=0.02, help="모든 응답에 더할 왕복 지연(초)")
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--backend", default="fast", help="본문 추출 백엔드 (fast/soup)")
+    parser.add_argument("--parse-executor", default="thread", help="process/thread/inline")
+    parser.add_argument("--concurrency", type=int, default=Settings.model_fields["max_concurrency"].default)
+    parser.add_argument("--warm", action="store_true", help="기사/검색 캐시를 켠 상태로 측정")
+    parser.add_argument(
+        "--startup-rounds", type=int, default=3, help="서버 기동 시간(import, create_server, /ready) 측정 횟수 (0이면 건너뜀)"
+    )
+    parser.add_argument("--label", default="", help="결과 파일에 남길 설명")
+    parser.add_argument("--out", type=Path, help="결과 JSON 경로 (기본: bench/results/<시각>-<리비전>.json)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"), help="두 결과 파일 비교")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args)
+    print_report(report)
+    out = args.out or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{report['meta']['revision']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"saved: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# client/calls.py
+"""Gemini 응답 하나에 담긴 함수 호출을 동시에 실행하고, 응답을 호출 순서대로 모은다."""
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from google import genai
+
+# call_once(이름, 인자, 기본 topic, 진행 알림으로 먼저 받은 기사 목록) -> 결과 텍스트
+CallOnce = Callable[[str, Dict[str, Any], Optional[str], List[Dict[str, Any]]], Awaitable[str]]
+
+
+async def run_call(
+    call: genai.types.FunctionCall,
+    fallback_topic: Optional[str],
+    call_once: CallOnce,
+    slots: asyncio.Semaphore,
+    timeout: float,
+) -> genai.types.Part:
+    """함수 호출 하나를 실행한다. 제한 시간 초과나 오류는 이 호출의 error 응답으로만 돌려준다.
+
+    collect_news가 제한 시간을 넘기면 그때까지 진행 알림으로 받은 기사로 답한다.
+    """
+    t_name = call.name
+    streamed: List[Dict[str, Any]] = []
+    async with slots:
+        print(f"  -> Executing: {t_name}")
+        try:
+            result_txt = await asyncio.wait_for(call_once(t_name, call.args, fallback_topic, streamed), timeout)
+            response = {"result": result_txt}
+        except asyncio.TimeoutError:
+            if streamed:
+                # 제한 시간 안에 먼저 도착한 기사만으로라도 답한다
+                response = {"result": json.dumps({"articles": streamed}, ensure_ascii=False, separators=(",", ":"))}
+            else:
+                response = {"error": f"{timeout:g}초 안에 응답이 없어 중단했습니다."}
+        except Exception as e:
+            response = {"error": str(e)}
+    return genai.types.Part(function_response=genai.types.FunctionResponse(name=t_name, response=response))
+
+
+async def run_calls(
+    calls: Sequence[genai.types.FunctionCall],
+    fallback_topics: Sequence[Optional[str]],
+    call_once: CallOnce,
+    slots: asyncio.Semaphore,
+    timeout: float,
+) -> List[genai.types.Part]:
+    """서로 독립적인 호출이므로 동시에 실행하고(동시 실행 수는 slots가 제한), 응답 순서는 호출 순서대로 유지한다."""
+    return list(await asyncio.gather(*(
+        run_call(call, topic, call_once, slots, timeout) for call, topic in zip(calls, fallback_topics)
+    )))
@@ -8,10 +8,18 @@ from dotenv import load_dotenv
 from google import genai
 from fastmcp import Client  # High-Level Client
 
+from calls import run_calls
+from history import ConversationHistory, PromptCache
+
 # 환경 변수 로드
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:8000/mcp")
+# 한 응답에 담긴 함수 호출을 동시에 실행할 최대 개수와 호출별 제한 시간(초)
+TOOL_CALL_CONCURRENCY = int(os.getenv("TOOL_CALL_CONCURRENCY", "4"))
+TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", "60"))
+# Gemini에 매번 다시 보내는 대화 기록의 최대 크기(바이트). 지난 도구 결과는 요약하고, 넘치면 오래된 대화부터 버린다
+HISTORY_MAX_BYTES = int(os.getenv("HISTORY_MAX_BYTES", "60000"))
 
 if not GEMINI_API_KEY:
     raise RuntimeError("GEMINI_API_KEY가 설정되지 않았습니다.")
@@ -22,8 +30,12 @@ def prepare_summary_prompt_args(raw_args: Dict[str, Any], fallback_topic: str =
         pargs["topic"] = fallback_topic
     
     if "articles" in pargs:
-        pargs["articles_blob"] = json.dumps(pargs["articles"], ensure_ascii=False, indent=2)
-        del pargs["articles"]
+        articles = pargs.pop("articles")
+        # collect_news 응답 문자열은 다시 파싱하거나 들여쓰지 않고 그대로 넘긴다
+        if isinstance(articles, str):
+            pargs["articles_blob"] = articles
+        else:
+            pargs["articles_blob"] = json.dumps(articles, ensure_ascii=False, separators=(",", ":"))
     return pargs
 
 async def main():
@@ -61,21 +73,51 @@ async def main():
             })
 
         # --- 대화 루프 ---
-        history = []
+        history = ConversationHistory(max_bytes=HISTORY_MAX_BYTES)
+        prompts = PromptCache()
         last_topic = None
         system_instruction = (
             "You are a helpful assistant. Use 'collect_news' to find info. "
             "Then use 'get_prompt' with name='summarize_articles_prompt' to summarize it."
         )
 
+        call_slots = asyncio.Semaphore(TOOL_CALL_CONCURRENCY)
+
+        async def call_once(t_name, t_args, fallback_topic, streamed):
+            if t_name == "get_prompt":
+                args = prepare_summary_prompt_args(dict(t_args["args"]), fallback_topic)
+
+                async def fetch_prompt(prompt_args):
+                    res = await mcp_client.get_prompt(t_args["name"], prompt_args)
+                    # FastMCP Client의 get_prompt 결과 처리
+                    return res.messages[0].content.text
+
+                # 기사 본문만 다른 호출은 받아 둔 템플릿에 본문만 바꿔 넣는다
+                return await prompts.render(t_args["name"], args, fetch_prompt)
+
+            async def on_progress(progress, total, message):
+                # collect_news는 기사가 추출되는 즉시 진행 알림 메시지로 먼저 보내 준다
+                if not message:
+                    return
+                try:
+                    article = json.loads(message)
+                except ValueError:
+                    return
+                streamed.append(article)
+                print(f"     [{int(progress)}] {article.get('title', '')}")
+
+            res = await mcp_client.call_tool(t_name, dict(t_args), progress_handler=on_progress)
+            # FastMCP Client의 call_tool 결과 처리
+            return res.content[0].text
+
         async def process_turn(user_input):
             nonlocal last_topic
-            history.append(genai.types.Content(role="user", parts=[genai.types.Part(text=user_input)]))
+            history.add_user_input(user_input)
             
-            print("[System] Sending to Gemini...")
+            print(f"[System] Sending to Gemini... (history {history.size()} bytes)")
             response = await gemini_client.aio.models.generate_content(
                 model="gemini-2.5-flash",
-                contents=history,
+                contents=history.contents,
                 config=genai.types.GenerateContentConfig(
                     temperature=0,
                     system_instruction=system_instruction,
@@ -87,42 +129,22 @@ async def main():
                 print(f"[System] Tool calls: {len(response.function_calls)}")
                 history.append(response.candidates[0].content)
                 
-                parts = []
+                # get_prompt의 기본 topic은 같은 응답 안에서 앞선 collect_news 호출의 topic을 따른다
+                fallback_topics = []
                 for call in response.function_calls:
-                    t_name = call.name
-                    t_args = call.args
-                    print(f"  -> Executing: {t_name}")
-                    
-                    try:
-                        result_txt = ""
-                        if t_name == "get_prompt":
-                            args = prepare_summary_prompt_args(dict(t_args["args"]), last_topic)
-                            res = await mcp_client.get_prompt(t_args["name"], args)
-                            # FastMCP Client의 get_prompt 결과 처리
-                            result_txt = res.messages[0].content.text
-                        else:
-                            if t_name == "collect_news":
-                                last_topic = t_args.get("topic")
-                            res = await mcp_client.call_tool(t_name, dict(t_args))
-                            # FastMCP Client의 call_tool 결과 처리
-                            result_txt = res.content[0].text
-
-                        parts.append(genai.types.Part(
-                            function_response=genai.types.FunctionResponse(
-                                name=t_name, response={"result": result_txt}
-                            )
-                        ))
-                    except Exception as e:
-                        parts.append(genai.types.Part(
-                            function_response=genai.types.FunctionResponse(
-                                name=t_name, response={"error": str(e)}
-                            )
-                        ))
-                
+                    fallback_topics.append(last_topic)
+                    if call.name == "collect_news":
+                        last_topic = call.args.get("topic")
+
+                # 서로 독립적인 호출이므로 동시에 실행하고, 응답 순서는 호출 순서대로 유지한다
+                parts = await run_calls(
+                    response.function_calls, fallback_topics, call_once, call_slots, TOOL_CALL_TIMEOUT
+                )
+
                 history.append(genai.types.Content(role="user", parts=parts))
                 response = await gemini_client.aio.models.generate_content(
                     model="gemini-2.5-flash",
-                    contents=history,
+                    contents=history.contents,
                     config=genai.types.GenerateContentConfig(tools=gemini_tools)
                 )
 
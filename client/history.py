@@ -0,0 +1,171 @@
+# client/history.py
+"""Gemini에 보낼 대화 기록 관리: 지난 도구 결과 요약, 크기 상한, get_prompt 템플릿 캐시."""
+import json
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List
+
+from google import genai
+
+# 요약으로 바꾼 도구 결과의 키 (이미 요약한 결과는 다시 건드리지 않는다)
+DIGEST_KEY = "digest"
+# 요약에 남길 기사 수, 형식을 모르는 결과에서 남길 글자 수
+DIGEST_ARTICLES = 10
+DIGEST_CHARS = 200
+# 지난 함수 호출 인자 중 기사 본문이 담길 수 있는 키와, 생략한 값을 나타내는 표시
+BULKY_ARGS = ("articles", "articles_blob", "article")
+OMITTED = "자 생략)"
+
+
+def _shorten(text: str, limit: int = DIGEST_CHARS) -> str:
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _digest_articles(articles: List[Dict[str, Any]]) -> str:
+    """기사 목록을 건수와 제목·URL만 남긴 한 줄로 줄인다."""
+    shown = [f"{a.get('title', '')} <{a.get('url', '')}>" for a in articles[:DIGEST_ARTICLES]]
+    digest = f"기사 {len(articles)}건"
+    if shown:
+        digest += ": " + "; ".join(shown)
+    if len(articles) > len(shown):
+        digest += f" 외 {len(articles) - len(shown)}건"
+    return digest
+
+
+def digest_response(name: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """도구 결과(function_response)를 후속 질문에 필요한 제목·URL 위주의 요약으로 바꾼다."""
+    if "error" in response:
+        return {DIGEST_KEY: "오류: " + _shorten(str(response["error"]))}
+    text = response.get("result", "")
+    if not isinstance(text, str):
+        text = json.dumps(text, ensure_ascii=False)
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        payload = None
+    if isinstance(payload, dict) and isinstance(payload.get("articles"), list):
+        return {DIGEST_KEY: _digest_articles(payload["articles"])}
+    if isinstance(payload, dict) and isinstance(payload.get("results"), list):
+        return {DIGEST_KEY: " / ".join(
+            f"{result.get('topic', '')}: {_digest_articles(result.get('articles', []))}"
+            for result in payload["results"]
+        )}
+    if name == "get_prompt":
+        return {DIGEST_KEY: f"프롬프트 {len(text)}자 (생략)"}
+    return {DIGEST_KEY: _shorten(text)}
+
+
+class ConversationHistory:
+    """generate_content에 보낼 대화 기록.
+
+    교환(사용자 입력 하나와 그에 이어진 도구 호출·응답)이 끝나면 그 안의 도구 결과를 요약으로 바꾸고,
+    전체 크기가 max_bytes를 넘으면 오래된 교환부터 버린다. 진행 중인 교환은 그대로 보낸다.
+    """
+
+    def __init__(self, max_bytes: int = 60000) -> None:
+        self.max_bytes = max_bytes
+        self.contents: List[genai.types.Content] = []
+        # 각 교환이 시작되는 위치 (사용자 입력 메시지의 인덱스)
+        self._starts: List[int] = []
+
+    def add_user_input(self, text: str) -> None:
+        """새 교환을 시작한다. 지난 교환은 요약하고 크기 상한에 맞춘다."""
+        self._compact()
+        self._trim()
+        self._starts.append(len(self.contents))
+        self.contents.append(genai.types.Content(role="user", parts=[genai.types.Part(text=text)]))
+
+    def append(self, content: genai.types.Content) -> None:
+        self.contents.append(content)
+
+    def size(self) -> int:
+        """보낼 기록의 대략적인 크기 (JSON 바이트)"""
+        return sum(self._size(content) for content in self.contents)
+
+    def _compact(self) -> None:
+        for content in self.contents:
+            for part in content.parts or []:
+                response = part.function_response
+                if response is not None and DIGEST_KEY not in (response.response or {}):
+                    part.function_response = genai.types.FunctionResponse(
+                        name=response.name, response=digest_response(response.name or "", response.response or {})
+                    )
+                call = part.function_call
+                if call is not None and call.args:
+                    args = self._compact_args(call.args)
+                    if args != call.args:
+                        part.function_call = genai.types.FunctionCall(name=call.name, args=args)
+
+    def _compact_args(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        compacted = {}
+        for key, value in args.items():
+            if isinstance(value, dict):
+                value = self._compact_args(value)
+            elif key in BULKY_ARGS and not (isinstance(value, str) and value.endswith(OMITTED)):
+                size = len(value) if isinstance(value, str) else len(json.dumps(value, ensure_ascii=False))
+                value = f"({size}{OMITTED}"
+            compacted[key] = value
+        return compacted
+
+    def _trim(self) -> None:
+        # 교환 단위로 버려야 함수 호출과 응답 짝이 깨지지 않는다
+        # 크기는 한 번만 재고 버릴 교환의 크기만 빼 나가며 남길 첫 교환(first)을 찾은 뒤, 한 번에 지운다
+        total = self.size()
+        first = 0
+        while first + 1 < len(self._starts) and total > self.max_bytes:
+            first += 1
+            total -= sum(self._size(content) for content in self.contents[self._starts[first - 1]:self._starts[first]])
+        if first + 1 == len(self._starts) and total > self.max_bytes:
+            self.contents.clear()
+            self._starts.clear()
+        elif first:
+            drop = self._starts[first]
+            del self.contents[:drop]
+            self._starts = [start - drop for start in self._starts[first:]]
+
+    @staticmethod
+    def _size(content: genai.types.Content) -> int:
+        return len(content.model_dump_json(exclude_none=True).encode("utf-8"))
+
+
+def _placeholder(key: str) -> str:
+    # 기사 본문에 나올 일이 없는 표시 문자열
+    return f"⟦{key}⟧"
+
+
+class PromptCache:
+    """get_prompt 결과를 템플릿으로 보관한다.
+
+    기사 본문이 담기는 인자(BULKY_ARGS)는 호출마다 달라 키에 넣으면 거의 적중하지 않는다.
+    그래서 그 자리에 표시 문자열을 넣어 한 번 렌더링해 두고, 호출할 때 실제 값으로 바꿔 넣는다.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.fetches = 0
+
+    async def render(self, name: str, args: Dict[str, Any], fetch: Callable[[Dict[str, Any]], Awaitable[str]]) -> str:
+        """프롬프트를 돌려준다. fetch(인자)는 서버에서 프롬프트를 렌더링한다."""
+        bulky = {key: value for key, value in args.items() if key in BULKY_ARGS}
+        if any(not isinstance(value, str) for value in bulky.values()):
+            # 목록 인자는 서버가 가공해 넣으므로 바꿔 넣을 수 없다
+            return await self._fetch(fetch, args)
+        template_args = {**args, **{key: _placeholder(key) for key in bulky}}
+        key = name + "\0" + json.dumps(template_args, ensure_ascii=False, sort_keys=True)
+        template = self._entries.get(key)
+        if template is None:
+            template = await self._fetch(fetch, template_args)
+            if any(template.count(_placeholder(arg)) != 1 for arg in bulky):
+                # 인자를 그대로 한 번 넣는 템플릿이 아니면 캐시하지 않고 실제 인자로 다시 받는다
+                return await self._fetch(fetch, args)
+            self._entries[key] = template
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        for arg, value in bulky.items():
+            template = template.replace(_placeholder(arg), value)
+        return template
+
+    async def _fetch(self, fetch: Callable[[Dict[str, Any]], Awaitable[str]], args: Dict[str, Any]) -> str:
+        self.fetches += 1
+        return await fetch(args)
@@ -19,6 +19,94 @@ class Settings(BaseModel):
     default_sort: str = "sim"
     request_timeout: float = 15.0
     user_agent: str = "Mozilla/5.0 (CollectorBot)"
+    # 공용 HTTP 연결 풀 (전체 연결 수, keep-alive 유지 연결 수와 유지 시간(초), 호스트당 동시 연결 수)
+    # http2는 h2 패키지가 설치된 경우에만 적용된다
+    http_max_connections: int = 100
+    http_max_keepalive: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_max_per_host: int = 6
+    http2: bool = True
+    # 호스트별 요청 정책 (초당 요청 수 / 순간 최대 요청 수 / 일시적 실패 재시도 횟수 / 재시도 기본 대기(초))
+    host_rate: float = 10.0
+    host_burst: int = 10
+    http_retries: int = 2
+    retry_backoff: float = 0.2
+    # 연속 breaker_failures번 실패한 호스트는 breaker_reset초 동안 건너뛴다 (0이면 끔)
+    breaker_failures: int = 5
+    breaker_reset: float = 30.0
+    # 관측한 응답 시간으로 줄이는 호스트별 제한 시간의 하한(초). 상한은 request_timeout
+    adaptive_timeout_min: float = 2.0
+    # 기사 본문 스트리밍 수신: 본문 최대 크기(바이트, 넘으면 앞부분만 사용)와 점진 추출 여부.
+    # stream_parse가 켜져 있으면 fast 백엔드는 받는 즉시 본문을 추출하고, 본문이 확정되면 나머지를 받지 않는다.
+    # 점진 추출은 이벤트 루프(parse_executor가 "thread"면 스레드 풀)에서 하고, 프로세스 풀은 다 받은 문서를 추출할 때만 쓴다
+    max_article_bytes: int = 2 * 1024 * 1024
+    stream_parse: bool = True
+    # 기사 본문 동시 수집 설정 (동시 요청 수 / collect_news 전체 마감 시간(초))
+    max_concurrency: int = 5
+    collect_deadline: float = 10.0
+    # collect_news가 돌려줄 최대 기사 수와, 본문 추출 실패를 대비한 검색 결과 초과 요청 배수
+    max_articles: int = 3
+    search_overfetch: int = 2
+    # 본문 중복 판별 (MinHash 추정 유사도 기준값 - 0이면 끔 / 요청 사이에 유지할 지문 수)
+    dedup_threshold: float = 0.75
+    dedup_index_size: int = 4096
+    # collect_news 응답 크기 예산 (본문·제목·URL의 UTF-8 바이트 합계 - 0이면 제한 없음 / 기사 한 건에 줄 최소 본문 바이트)
+    result_budget_bytes: int = 12000
+    min_article_bytes: int = 600
+    # 네이버 검색 API 일일 호출 한도 (애플리케이션 기본 25,000회)
+    naver_daily_quota: int = 25000
+    # 인기 주제 미리 수집 (켜기 / 대상 주제 수 / 대상이 되는 최소 요청 수 / 요청 수 집계 구간(초) / 미리 받은 검색 결과 유지 시간(초))
+    prefetch_enabled: bool = Field(
+        default_factory=lambda: os.getenv("PREFETCH_ENABLED", "").lower() in ("1", "true", "yes")
+    )
+    prefetch_topics: int = 20
+    prefetch_min_hits: int = 2
+    prefetch_window: float = 3600.0
+    prefetch_ttl: float = 600.0
+    # 미리 수집이 쓸 수 있는 일일 한도 비율. 호출 간격은 이 몫을 하루에 고르게 나눈 값이다
+    prefetch_quota_share: float = 0.2
+    # collect_news_updates가 기억할 (세션, 주제)별 커서 수
+    cursor_size: int = 1024
+    # collect_news_batch 한 번에 받는 최대 주제 수
+    max_batch_topics: int = 10
+    # 기사 본문 캐시 (메모리 LRU 항목 수, TTL(초), SQLite 경로 - 비워 두면 디스크 계층 미사용)
+    article_cache_size: int = 1024
+    article_cache_ttl: float = 86400.0
+    article_cache_path: str = Field(default_factory=lambda: os.getenv("ARTICLE_CACHE_PATH", ""))
+    article_cache_disk_entries: int = 50000
+    # 수집한 기사 전문 검색 색인 (SQLite 경로 - 비워 두면 메모리에만 유지, 최대 기사 수)
+    article_index_path: str = Field(default_factory=lambda: os.getenv("ARTICLE_INDEX_PATH", ""))
+    article_index_size: int = 50000
+    # search_news가 색인만으로 답하는 조건 (이 시간(초) 안에 색인된 기사가 이 건수 이상일 때)
+    article_index_max_age: float = 3600.0
+    article_index_min_results: int = 3
+    # 복제본 간 공유 저장소 (비워 두면 공유 안 함 / memory:// / sqlite:///경로 / redis://호스트:포트/DB)
+    shared_store_url: str = Field(default_factory=lambda: os.getenv("SHARED_STORE_URL", ""))
+    # 기사 하나를 받는 복제본이 URL을 선점하는 시간(초)과, 다른 복제본이 그 결과를 확인하는 간격(초)
+    fetch_lease: float = 15.0
+    fetch_lease_poll: float = 0.05
+    # 검색 결과 캐시 (TTL(초), 최대 항목 수)
+    search_cache_ttl: float = 60.0
+    search_cache_size: int = 256
+    # 본문 추출 백엔드: "fast"(단일 패스 파서) 또는 "soup"(BeautifulSoup + CSS 셀렉터)
+    extract_backend: str = Field(default_factory=lambda: os.getenv("EXTRACT_BACKEND", "fast"))
+    # HTML 디코딩/파싱 실행 방식: "process"(프로세스 풀), "thread"(스레드 풀), "inline"(이벤트 루프에서 직접)
+    # parse_workers가 0이면 쓸 수 있는 CPU 수(컨테이너 CPU 할당량 반영)만큼 워커를 둔다
+    parse_executor: str = Field(default_factory=lambda: os.getenv("PARSE_EXECUTOR", "process"))
+    parse_workers: int = Field(default_factory=lambda: int(os.getenv("PARSE_WORKERS", "0")))
+    # 서버가 뜬 직후 백그라운드에서 파싱 풀 워커를 미리 띄울지 여부. 끄면 첫 요청이 워커 기동을 기다린다
+    # 준비가 끝나기 전까지 /ready는 503을 돌려준다
+    warm_up: bool = Field(
+        default_factory=lambda: os.getenv("WARM_UP", "1").lower() in ("1", "true", "yes")
+    )
+    # 언론사별 본문 추출 규칙(JSON) 경로. 비워 두면 내장 규칙만 사용
+    extract_rules_path: str = Field(default_factory=lambda: os.getenv("EXTRACT_RULES_PATH", ""))
+    # 본문을 찾은 셀렉터를 학습해 둘 최대 호스트 수 (최근에 쓴 호스트부터 유지)
+    extract_rules_hosts: int = 1024
+    # collect_news 호출마다 단계별 소요 시간을 로그로 남길지 여부 (/metrics는 항상 노출)
+    trace_requests: bool = Field(
+        default_factory=lambda: os.getenv("TRACE_REQUESTS", "").lower() in ("1", "true", "yes")
+    )
 
 
 
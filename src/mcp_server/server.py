@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import logging
 import sys
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator, Callable
 
 from fastmcp import FastMCP
 
@@ -22,12 +24,24 @@ def configure_logging() -> None:
 
 def create_server() -> FastMCP:
     """FastMCP 인스턴스를 생성하고 필요한 도구/프롬프트를 등록한다."""
+    data_lifespan: Callable[[], AsyncContextManager[None]] | None = None
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+        # 파싱 풀 예열과 인기 주제 미리 수집은 서버 이벤트 루프에서 서버가 떠 있는 동안만 돌린다
+        if data_lifespan is None:
+            yield
+            return
+        async with data_lifespan():
+            yield
+
     mcp = FastMCP(
         name="naver-api-mcp",
         instructions="네이버 뉴스 API 기사를 수집,요약하는 MCP 서버",
+        lifespan=lifespan,
     )
 
-    register_data_tools(mcp, settings)
+    data_lifespan = register_data_tools(mcp, settings)
     register_prompt_templates(mcp)
 
     return mcp
@@ -1,2 +1,15 @@
 """Tool 패키지 초기화."""
-from .tool import register_data_tools
+from __future__ import annotations
+
+from typing import Any
+
+__all__ = ["register_data_tools"]
+
+
+def __getattr__(name: str) -> Any:
+    # 파싱 워커(forkserver)가 tool.extract만 불러올 때 fastmcp·httpx까지 딸려 오지 않도록 처음 쓸 때 불러온다
+    if name == "register_data_tools":
+        from .tool import register_data_tools
+
+        return register_data_tools
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,396 @@
+"""기사 본문 / 검색 결과 캐시."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from .shared import SharedStore
+
+logger = logging.getLogger(__name__)
+
+# 같은 기사를 가리키지만 값만 달라지는 추적용 쿼리 파라미터
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "ref_src"})
+# 디스크 계층 쓰기는 모아서 한 트랜잭션으로 처리한다 (이 건수가 차거나 가장 오래된 대기 항목이 이 시간(초)을 넘기면)
+DISK_BATCH = 32
+DISK_FLUSH_SECONDS = 1.0
+# 공유 계층에 "받았지만 본문이 비어 있었다"를 알리는 값 (기다리던 복제본이 다시 받지 않게 한다)
+EMPTY_MARKER = "\x00"
+
+
+def normalize_url(url: str) -> str:
+    """캐시 키로 쓰기 위해 URL을 정규화한다 (스킴/호스트 소문자, 추적 파라미터·프래그먼트 제거)."""
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rpartition(":")[2]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rpartition(":")[0]
+    query = urllib.parse.urlencode(sorted(
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ))
+    return urllib.parse.urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+class ArticleCache:
+    """정규화된 URL을 키로 추출된 본문을 저장하는 캐시.
+
+    메모리 LRU 계층 앞단에, db_path가 주어지면 재시작 후에도 유지되는 SQLite 계층을 둔다.
+    디스크 쓰기는 DISK_BATCH건씩 모아 한 번에 커밋하고, 비동기 경로(get_async/set_async)에서는
+    디스크 조회와 커밋을 스레드에서 실행해 이벤트 루프를 막지 않는다.
+    shared가 주어지면 마지막 계층으로 다른 서버 복제본과 본문을 나눠 쓴다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 86400.0,
+        db_path: str = "",
+        max_disk_entries: int = 50000,
+        shared: SharedStore | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.shared = shared
+        self._memory: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        # SQLite 호출은 메모리 계층 잠금과 따로 잠가, 디스크를 기다리는 동안에도 메모리 조회가 막히지 않게 한다
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        # 디스크에 아직 쓰지 않은 항목: 키 -> (저장 시각, 본문)
+        self._pending: Dict[str, Tuple[float, str]] = {}
+        self._pending_since = 0.0
+        self.hits = 0
+        self.disk_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+        self._db: sqlite3.Connection | None = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " url TEXT PRIMARY KEY, text TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS articles_stored_at ON articles (stored_at)")
+            self._db.commit()
+
+    def get(self, url: str) -> str | None:
+        """캐시된 본문을 돌려준다. 없거나 만료되었으면 None."""
+        key = normalize_url(url)
+        now = time.time()
+        batch = self._take_batch(now)
+        if batch:
+            self._write(batch, now)
+        text = self._get_memory(key, now)
+        if text is None and self._db is not None:
+            text = self._get_disk(key, now)
+        if text is not None:
+            return text
+        if self.shared is not None:
+            text = self._remember_shared(key, self.shared.get(f"article:{key}"))
+        return self._count_shared(text)
+
+    async def get_async(self, url: str) -> str | None:
+        """get()과 같지만 디스크·공유 계층은 이벤트 루프를 막지 않고 조회한다."""
+        key = normalize_url(url)
+        now = time.time()
+        batch = self._take_batch(now)
+        if batch:
+            await asyncio.to_thread(self._write, batch, now)
+        text = self._get_memory(key, now)
+        if text is None and self._db is not None:
+            text = await asyncio.to_thread(self._get_disk, key, now)
+        if text is not None:
+            return text
+        if self.shared is not None:
+            text = self._remember_shared(key, await self.shared.get_async(f"article:{key}"))
+        return self._count_shared(text)
+
+    def _get_memory(self, key: str, now: float) -> str | None:
+        """메모리 계층과 아직 디스크에 쓰지 않은 항목을 조회한다."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._memory[key]
+
+            entry = self._pending.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._remember(key, entry[0], entry[1])
+                self.disk_hits += 1
+                return entry[1]
+        return None
+
+    def _get_disk(self, key: str, now: float) -> str | None:
+        """SQLite 계층을 조회한다. 블로킹 호출이므로 비동기 경로에서는 스레드에서 실행한다."""
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT text, stored_at FROM articles WHERE url = ?", (key,)).fetchone()
+        if not row or now - row[1] >= self.ttl:
+            return None
+        with self._lock:
+            self._remember(key, row[1], row[0])
+            self.disk_hits += 1
+        return row[0]
+
+    async def get_shared_async(self, url: str) -> str | None:
+        """공유 계층만 조회한다. 찾으면 메모리 계층에도 넣는다 (다른 복제본이 받은 본문을 기다릴 때 사용).
+
+        빈 본문 표시(mark_empty_async)가 있으면 ""를 돌려준다.
+        """
+        if self.shared is None:
+            return None
+        key = normalize_url(url)
+        text = await self.shared.get_async(f"article:{key}")
+        if text == EMPTY_MARKER:
+            return ""
+        return self._remember_shared(key, text)
+
+    async def mark_empty_async(self, url: str, ttl: float) -> None:
+        """받은 본문이 비어 있었음을 ttl초 동안 공유 계층에 알린다 (빈 본문 자체는 일시적 실패일 수 있어 캐시하지 않는다)."""
+        if self.shared is not None:
+            await self.shared.set_async(f"article:{normalize_url(url)}", EMPTY_MARKER, ttl)
+
+    def _remember_shared(self, key: str, text: str | None) -> str | None:
+        if not text or text == EMPTY_MARKER:
+            return None
+        with self._lock:
+            self._remember(key, time.time(), text)
+        return text
+
+    def _count_shared(self, text: str | None) -> str | None:
+        with self._lock:
+            if text is not None:
+                self.shared_hits += 1
+            else:
+                self.misses += 1
+        return text
+
+    def set(self, url: str, text: str) -> None:
+        """추출된 본문을 저장한다. 빈 본문은 일시적 실패일 수 있으므로 저장하지 않는다."""
+        if not text:
+            return
+        key = normalize_url(url)
+        if self.shared is not None:
+            self.shared.set(f"article:{key}", text, self.ttl)
+        now = time.time()
+        batch = self._set_local(key, text, now)
+        if batch:
+            self._write(batch, now)
+
+    async def set_async(self, url: str, text: str) -> None:
+        """set()과 같지만 디스크·공유 계층에는 이벤트 루프를 막지 않고 저장한다."""
+        if not text:
+            return
+        key = normalize_url(url)
+        if self.shared is not None:
+            await self.shared.set_async(f"article:{key}", text, self.ttl)
+        now = time.time()
+        batch = self._set_local(key, text, now)
+        if batch:
+            await asyncio.to_thread(self._write, batch, now)
+
+    def _set_local(self, key: str, text: str, now: float) -> Dict[str, Tuple[float, str]] | None:
+        """메모리 계층에 넣고 디스크 쓰기 대기열에 올린다. 쓸 때가 된 묶음이 있으면 돌려준다."""
+        with self._lock:
+            self._remember(key, now, text)
+            if self._db is None:
+                return None
+            if not self._pending:
+                self._pending_since = now
+            self._pending[key] = (now, text)
+        return self._take_batch(now)
+
+    def stats(self) -> Dict[str, int]:
+        """적중/실패 카운터와 현재 메모리 항목 수"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "entries": len(self._memory),
+            }
+
+    def close(self) -> None:
+        now = time.time()
+        batch = self._take_batch(now, force=True)
+        if batch:
+            self._write(batch, now)
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _take_batch(self, now: float, force: bool = False) -> Dict[str, Tuple[float, str]] | None:
+        """쓸 때가 된 대기 항목을 꺼낸다: DISK_BATCH건이 찼거나 가장 오래된 항목이 DISK_FLUSH_SECONDS를 넘긴 경우.
+
+        조회할 때도 확인하므로, 새 저장이 없는 한가한 프로세스도 대기 항목을 오래 쥐고 있지 않는다.
+        """
+        with self._lock:
+            if not self._pending:
+                return None
+            if not force and len(self._pending) < DISK_BATCH and now - self._pending_since < DISK_FLUSH_SECONDS:
+                return None
+            batch, self._pending = self._pending, {}
+            return batch
+
+    def _write(self, batch: Dict[str, Tuple[float, str]], now: float) -> None:
+        """대기 항목 묶음을 한 트랜잭션으로 쓴다. 블로킹 호출이므로 비동기 경로에서는 스레드에서 실행한다."""
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.executemany(
+                "INSERT OR REPLACE INTO articles (url, text, stored_at) VALUES (?, ?, ?)",
+                [(key, text, stored_at) for key, (stored_at, text) in batch.items()],
+            )
+            self._writes += len(batch)
+            if self._writes >= 100:
+                self._writes = 0
+                self._prune_disk(now)
+            self._db.commit()
+
+    def _remember(self, key: str, stored_at: float, text: str) -> None:
+        self._memory[key] = (stored_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _prune_disk(self, now: float) -> None:
+        # 만료 항목을 지우고, 그래도 한도를 넘으면 오래된 순으로 정리
+        if self._db is None:
+            return
+        self._db.execute("DELETE FROM articles WHERE stored_at < ?", (now - self.ttl,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM articles").fetchone()
+        if count > self.max_disk_entries:
+            self._db.execute(
+                "DELETE FROM articles WHERE url IN ("
+                " SELECT url FROM articles ORDER BY stored_at ASC LIMIT ?)",
+                (count - self.max_disk_entries,),
+            )
+            logger.info("기사 캐시 정리: %d건 삭제", count - self.max_disk_entries)
+
+
+class SearchCache:
+    """검색 결과를 짧은 TTL로 보관하고, 진행 중인 동일 요청은 하나의 업스트림 호출로 합친다.
+
+    shared가 주어지면 다른 서버 복제본이 받은 검색 결과(JSON으로 직렬화 가능한 값)도 재사용한다.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256, shared: SharedStore | None = None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        # 키 -> (만료 시각, 값)
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        value = self._get_local(key)
+        if value is not None or self.shared is None:
+            return value
+        return self._remember_shared(key, self.shared.get(self._shared_key(key)))
+
+    async def get_async(self, key: Hashable) -> Any | None:
+        """get()과 같지만 공유 계층은 이벤트 루프를 막지 않고 조회한다."""
+        value = self._get_local(key)
+        if value is not None or self.shared is None:
+            return value
+        return self._remember_shared(key, await self.shared.get_async(self._shared_key(key)))
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """값을 저장한다. ttl을 주면 이 항목만 기본 TTL 대신 그 시간 동안 유지한다 (미리 받은 결과 등)."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._store(key, value, ttl)
+        if self.shared is not None and ttl > 0:
+            self.shared.set(self._shared_key(key), json.dumps(value, ensure_ascii=False), ttl)
+
+    async def set_async(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """set()과 같지만 공유 계층에는 이벤트 루프를 막지 않고 저장한다."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._store(key, value, ttl)
+        if self.shared is not None and ttl > 0:
+            await self.shared.set_async(self._shared_key(key), json.dumps(value, ensure_ascii=False), ttl)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시에 있으면 바로 돌려주고, 같은 키의 요청이 진행 중이면 그 결과를 함께 기다린다."""
+        cached = await self.get_async(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # 기다리던 호출 하나가 취소되어도 다른 호출이 공유하는 요청은 계속 진행한다
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+    def _get_local(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        return None
+
+    def _remember_shared(self, key: Hashable, raw: str | None) -> Any | None:
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        with self._lock:
+            self._store(key, value, self.ttl)
+            self.shared_hits += 1
+        return value
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _shared_key(key: Hashable) -> str:
+        return "search:" + json.dumps(key, ensure_ascii=False)
+
+    async def _fetch_and_store(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        # 실패한 요청은 예외가 그대로 올라가므로 캐시하지 않는다
+        value = await fetch()
+        await self.set_async(key, value)
+        return value
@@ -0,0 +1,62 @@
+"""증분 수집("지난번 이후 새 기사만")을 위한 주제별 커서."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Hashable
+
+# 커서 하나가 기억하는 전달한 기사 URL 수
+MAX_SEEN_URLS = 1000
+
+
+def parse_pub_date(value: str) -> datetime | None:
+    """검색 API의 pubDate(RFC 822, 예: "Sat, 17 Oct 2026 09:00:00 +0900")를 datetime으로 바꾼다."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TopicCursor:
+    """마지막으로 전달한 기사의 pubDate와 이미 전달한 기사 URL(정규화)"""
+
+    def __init__(self) -> None:
+        self.last_pub: datetime | None = None
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    def is_new(self, key: str, published: datetime | None) -> bool:
+        """전달한 적 없고, 마지막으로 전달한 기사보다 오래되지 않은 기사인지"""
+        if key in self._seen:
+            return False
+        return self.last_pub is None or published is None or published >= self.last_pub
+
+    def advance(self, key: str, published: datetime | None) -> None:
+        """기사 하나를 전달한 것으로 기록한다."""
+        self._seen[key] = None
+        while len(self._seen) > MAX_SEEN_URLS:
+            self._seen.popitem(last=False)
+        if published is not None and (self.last_pub is None or published > self.last_pub):
+            self.last_pub = published
+
+
+class CursorStore:
+    """(세션, 주제)별 커서를 LRU로 보관한다."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._cursors: OrderedDict[Hashable, TopicCursor] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> TopicCursor:
+        with self._lock:
+            cursor = self._cursors.get(key)
+            if cursor is None:
+                cursor = self._cursors[key] = TopicCursor()
+            self._cursors.move_to_end(key)
+            while len(self._cursors) > self.max_entries:
+                self._cursors.popitem(last=False)
+            return cursor
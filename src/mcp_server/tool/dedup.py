@@ -0,0 +1,107 @@
+"""통신사 기사 전재처럼 본문이 거의 같은 기사를 가려내는 지문 색인."""
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from typing import Dict, FrozenSet, Set, Tuple
+
+from .cache import normalize_url
+
+# 단어 3-gram을 shingle로 쓰고, 해시값이 가장 작은 SKETCH_SIZE개를 지문으로 남긴다 (bottom-k MinHash)
+SHINGLE_WORDS = 3
+SKETCH_SIZE = 128
+
+_WORD = re.compile(r"\w+")
+
+Sketch = FrozenSet[int]
+
+
+def fingerprint(text: str, size: int = SKETCH_SIZE) -> Sketch:
+    """본문의 MinHash 지문. 띄어쓰기·문장부호·대소문자 차이는 무시한다."""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return frozenset(heapq.nsmallest(size, (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles)))
+
+
+def similarity(a: Sketch, b: Sketch, size: int = SKETCH_SIZE) -> float:
+    """두 지문으로 추정한 shingle 집합의 자카드 유사도 (0~1)"""
+    union = heapq.nsmallest(size, a | b)
+    if not union:
+        return 0.0
+    return sum(1 for value in union if value in a and value in b) / len(union)
+
+
+class DuplicateIndex:
+    """요청 사이에 유지되는 기사 지문 색인.
+
+    정규화된 URL마다 지문과 중복 묶음(cluster, 처음 본 기사의 URL)을 기억한다. 한 번 중복으로 묶인
+    URL은 다음 요청에서 본문을 받기 전에 cluster_of()로 걸러낼 수 있다.
+    """
+
+    def __init__(self, max_entries: int = 4096, threshold: float = 0.75) -> None:
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._entries: OrderedDict[str, Tuple[Sketch, str]] = OrderedDict()
+        # 지문 해시값 -> 그 값을 가진 URL. 후보를 전체 비교 없이 찾는다
+        self._postings: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def cluster_of(self, url: str) -> str | None:
+        """이미 본 URL이면 중복 묶음을, 처음 보는 URL이면 None을 돌려준다."""
+        with self._lock:
+            entry = self._entries.get(normalize_url(url))
+            return entry[1] if entry else None
+
+    def add(self, url: str, text: str) -> str:
+        """본문 지문을 색인에 넣고 중복 묶음을 돌려준다. 비슷한 기사가 없으면 자기 URL이 묶음이 된다."""
+        key = normalize_url(url)
+        if self.threshold <= 0:
+            return key
+        sketch = fingerprint(text)
+        with self._lock:
+            self._forget(key)
+            cluster = self._match(sketch) or key
+            if cluster != key:
+                self.duplicates += 1
+            if self.max_entries > 0:
+                self._entries[key] = (sketch, cluster)
+                for value in sketch:
+                    self._postings.setdefault(value, set()).add(key)
+                while len(self._entries) > self.max_entries:
+                    self._forget(next(iter(self._entries)))
+            return cluster
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"duplicates": self.duplicates, "entries": len(self._entries)}
+
+    def _match(self, sketch: Sketch) -> str | None:
+        shared = Counter(key for value in sketch for key in self._postings.get(value, ()))
+        # 추정 유사도는 (공유 해시 수 / 지문 크기)를 넘을 수 없으므로 그보다 적게 겹치는 후보는 건너뛴다
+        best, best_score = None, self.threshold
+        for key, count in shared.items():
+            if count < self.threshold * len(sketch):
+                continue
+            other, cluster = self._entries[key]
+            score = similarity(sketch, other)
+            if score >= best_score:
+                best, best_score = cluster, score
+        return best
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for value in entry[0]:
+            keys = self._postings.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[value]
@@ -0,0 +1,572 @@
+"""기사 본문 추출 엔진.
+
+"soup" 백엔드는 BeautifulSoup 트리를 만든 뒤 CSS 셀렉터로 노이즈를 지우고 본문 후보를 찾는다.
+"fast" 백엔드는 트리를 만들지 않고 html.parser 이벤트를 한 번 훑으면서 노이즈 제거와 후보 탐색을
+동시에 처리한다. 두 백엔드는 같은 문서에 대해 같은 결과를 돌려주도록 BeautifulSoup(html.parser)의
+트리 구성 규칙(빈 요소 처리, 닫는 태그 매칭, 텍스트 노드 병합 등)을 그대로 따른다.
+"""
+from __future__ import annotations
+
+import codecs
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+NOISE_SELECTORS = (
+    "script", "style", "noscript", "iframe", "svg", "form",
+    "header", "footer", "nav", "aside", "button",
+    "[class*='ad']", "[id*='ad']", ".sns", ".share", ".copyright",
+    ".related", ".recommend", ".banner", ".byline", ".reporter_area",
+    ".img_desc"
+)
+
+CANDIDATE_SELECTORS = (
+    "#newsct_article", "#dic_area", "#articeBody", "#newsEndContents", # 스포츠 뉴스 추가
+    ".newsct_article", ".article_body", ".view_cont", "article"
+)
+
+# [중요 수정] 200자 -> 50자로 완화 (짧은 기사 허용)
+MIN_TEXT_LENGTH = 50
+
+
+# 추출 결과: (본문, 본문을 찾은 후보 셀렉터). 찾지 못하면 ("", None)
+Extraction = Tuple[str, Optional[str]]
+
+# 인코딩 판별 구간: UTF-8 여부를 확인하는 비ASCII 표본 크기와, <meta charset>·표본을 찾는 앞부분 최대 크기
+SNIFF_BYTES = 4096
+SNIFF_LIMIT = 65536
+# 브라우저처럼 euc-kr 계열 레이블은 상위 집합인 cp949로 디코딩한다 (확장 한글 깨짐 방지)
+CHARSET_ALIASES = {"euc-kr": "cp949", "euckr": "cp949", "ks_c_5601-1987": "cp949", "x-windows-949": "cp949"}
+_META_CHARSET = re.compile(rb"""<meta[^>]*?charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+def extract_with_soup(
+    html: str,
+    candidates: Sequence[str] = CANDIDATE_SELECTORS,
+    noise: Sequence[str] = NOISE_SELECTORS,
+) -> Extraction:
+    """BeautifulSoup 트리와 CSS 셀렉터로 본문을 추출한다 (기준 구현)."""
+    # bs4는 import만 수백 ms가 걸리므로 soup 백엔드를 실제로 쓸 때 불러온다 (fast 백엔드는 쓰지 않는다)
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    for selector in noise:
+        for tag in soup.select(selector):
+            tag.decompose()
+
+    for selector in candidates:
+        element = soup.select_one(selector)
+        if element:
+            text = element.get_text(" ", strip=True)
+            if text and len(text) > MIN_TEXT_LENGTH:
+                return text, selector
+    return "", None
+
+
+# --- fast 백엔드 ---------------------------------------------------------------
+
+# BeautifulSoup(html.parser)와 동일한 규칙을 쓰기 위한 상수들
+VOID_ELEMENTS = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr",
+    "image", "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid",
+    "param", "source", "spacer", "track", "wbr",
+})
+# 이 태그 안의 문자열은 get_text() 결과에 포함되지 않는다
+STRING_CONTAINERS = frozenset({"rt", "rp", "style", "script", "template"})
+
+_ENTITIES: Dict[str, str] = {}
+for _name, _char in sorted(html5.items()):
+    _ENTITIES.setdefault(_name[:-1] if _name.endswith(";") else _name, _char)
+
+_NON_WHITESPACE = re.compile(r"\S+")
+_SIMPLE_SELECTOR = re.compile(
+    r"""(?P<tag>[a-zA-Z][\w-]*)?"""
+    r"""(?P<rest>(?:[#.][\w-]+|\[\s*[\w-]+\s*(?:[*^$]?=\s*(?:'[^']*'|"[^"]*"|[\w-]+)\s*)?\])*)"""
+)
+_SELECTOR_PART = re.compile(
+    r"""([#.])([\w-]+)|\[\s*([\w-]+)\s*(?:([*^$]?=)\s*(?:'([^']*)'|"([^"]*)"|([\w-]+))\s*)?\]"""
+)
+
+_ATTRIBUTE_OPERATORS: Dict[str | None, Callable[[str, str], bool]] = {
+    None: lambda actual, expected: True,
+    "=": lambda actual, expected: actual == expected,
+    "*=": lambda actual, expected: bool(expected) and expected in actual,
+    "^=": lambda actual, expected: bool(expected) and actual.startswith(expected),
+    "$=": lambda actual, expected: bool(expected) and actual.endswith(expected),
+}
+
+
+class SimpleSelector:
+    """태그/#id/.class/[attr] 조합으로 된 단순 셀렉터. 하위 결합자(공백, >)는 지원하지 않는다."""
+
+    __slots__ = ("source", "tag", "id", "classes", "attrs")
+
+    def __init__(self, source: str) -> None:
+        match = _SIMPLE_SELECTOR.fullmatch(source.strip())
+        if not match or not source.strip():
+            raise ValueError(f"지원하지 않는 셀렉터입니다: {source!r}")
+        self.source = source
+        self.tag = (match.group("tag") or "").lower() or None
+        self.id: str | None = None
+        self.classes: Tuple[str, ...] = ()
+        self.attrs: Tuple[Tuple[str, str | None, str], ...] = ()
+        for part in _SELECTOR_PART.finditer(match.group("rest")):
+            prefix, name, attr, op, *values = part.groups()
+            if prefix == "#":
+                self.id = name
+            elif prefix == ".":
+                self.classes += (name,)
+            else:
+                value = next((v for v in values if v is not None), "")
+                self.attrs += ((attr.lower(), op, value),)
+
+    def matches(self, tag: str, attrs: Dict[str, str], classes: Sequence[str]) -> bool:
+        if self.tag is not None and self.tag != tag:
+            return False
+        if self.id is not None and attrs.get("id") != self.id:
+            return False
+        for name in self.classes:
+            if name not in classes:
+                return False
+        for name, op, expected in self.attrs:
+            if name not in attrs:
+                return False
+            # class는 여러 값을 갖는 속성이므로 공백 하나로 이어 붙인 값과 비교한다
+            actual = " ".join(classes) if name == "class" else attrs[name]
+            if not _ATTRIBUTE_OPERATORS[op](actual, expected):
+                return False
+        return True
+
+
+class SelectorSet:
+    """여러 셀렉터 중 하나라도 맞는지 빠르게 확인하기 위해 종류별로 색인한 집합."""
+
+    def __init__(self, selectors: Iterable[str]) -> None:
+        self.tags: set[str] = set()
+        self.ids: set[str] = set()
+        self.classes: set[str] = set()
+        self.others: List[SimpleSelector] = []
+        for source in selectors:
+            selector = SimpleSelector(source)
+            if selector.tag and not (selector.id or selector.classes or selector.attrs):
+                self.tags.add(selector.tag)
+            elif selector.id and not (selector.tag or selector.classes or selector.attrs):
+                self.ids.add(selector.id)
+            elif len(selector.classes) == 1 and not (selector.tag or selector.id or selector.attrs):
+                self.classes.add(selector.classes[0])
+            else:
+                self.others.append(selector)
+
+    def matches(self, tag: str, attrs: Dict[str, str], classes: Sequence[str]) -> bool:
+        if tag in self.tags:
+            return True
+        if self.ids and attrs.get("id") in self.ids:
+            return True
+        if self.classes and not self.classes.isdisjoint(classes):
+            return True
+        return any(selector.matches(tag, attrs, classes) for selector in self.others)
+
+
+@lru_cache(maxsize=256)
+def compile_selectors(
+    candidates: Tuple[str, ...], noise: Tuple[str, ...]
+) -> Tuple[Tuple[SimpleSelector, ...], SelectorSet]:
+    """후보/노이즈 셀렉터 목록을 한 번만 컴파일해 재사용한다."""
+    return tuple(SimpleSelector(selector) for selector in candidates), SelectorSet(noise)
+
+
+class _Frame:
+    __slots__ = ("tag", "noise", "container", "captures")
+
+    def __init__(self, tag: str, noise: bool, container: bool, captures: Tuple[int, ...]) -> None:
+        self.tag = tag
+        self.noise = noise
+        self.container = container
+        self.captures = captures
+
+
+class StreamingExtractor(HTMLParser):
+    """HTML을 조각 단위로 받아 본문을 추출하는 단일 패스 파서.
+
+    열린 요소 스택만 유지하면서, 노이즈 요소 안의 텍스트는 버리고 각 후보 셀렉터에 처음 맞는
+    요소의 텍스트만 모은다. 최우선 후보가 확정되면 done이 True가 되어 나머지 문서를 읽지 않아도 된다.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[str] = CANDIDATE_SELECTORS,
+        noise: Sequence[str] = NOISE_SELECTORS,
+    ) -> None:
+        super().__init__(convert_charrefs=False)
+        self._candidates, self._noise = compile_selectors(tuple(candidates), tuple(noise))
+        self._stack: List[_Frame] = []
+        self._open_tags: Counter[str] = Counter()
+        self._closed_void: List[str] = []
+        self._pending: List[str] = []
+        self._noise_depth = 0
+        self._container_depth = 0
+        self._active: List[int] = []
+        self._parts: List[List[str] | None] = [None] * len(self._candidates)
+        # " ".join(parts)의 길이. done을 조각마다 확인하므로 누적해 둔다
+        self._lengths = [0] * len(self._candidates)
+        self._closed = [False] * len(self._candidates)
+
+    # HTMLParser 이벤트 -----------------------------------------------------
+
+    def handle_starttag(
+        self, tag: str, attrs: List[Tuple[str, str | None]], handle_empty_element: bool = True
+    ) -> None:
+        self._flush()
+        attr_dict = {key: "" if value is None else value for key, value in attrs}
+        noise = False
+        captures: Tuple[int, ...] = ()
+        if not self._noise_depth:
+            classes = _NON_WHITESPACE.findall(attr_dict["class"]) if "class" in attr_dict else ()
+            noise = self._noise.matches(tag, attr_dict, classes)
+            if not noise:
+                captures = tuple(
+                    index
+                    for index, selector in enumerate(self._candidates)
+                    if self._parts[index] is None and selector.matches(tag, attr_dict, classes)
+                )
+                for index in captures:
+                    self._parts[index] = []
+                    self._active.append(index)
+        container = tag in STRING_CONTAINERS
+        self._stack.append(_Frame(tag, noise, container, captures))
+        self._open_tags[tag] += 1
+        self._noise_depth += noise
+        self._container_depth += container
+
+        if handle_empty_element and tag in VOID_ELEMENTS:
+            # html.parser는 빈 요소의 종료 이벤트를 따로 보내지 않으므로 바로 닫고,
+            # 나중에 나오는 </tag>는 무시한다 (BeautifulSoup과 동일)
+            self._pop_to(tag)
+            self._closed_void.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._closed_void:
+            self._closed_void.remove(tag)
+            return
+        self._flush()
+        self._pop_to(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._pending.append(data)
+
+    def handle_charref(self, name: str) -> None:
+        code = int(name[1:], 16) if name[:1] in ("x", "X") else int(name)
+        data = None
+        if code < 256:
+            # &#147; 처럼 windows-1252 코드를 가리키는 참조를 보정한다
+            try:
+                data = bytearray([code]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(code)
+            except (ValueError, OverflowError):
+                pass
+        self._pending.append(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name: str) -> None:
+        self._pending.append(_ENTITIES.get(name, "&" + name))
+
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush()
+        if data.upper().startswith("CDATA["):
+            self._emit(data[len("CDATA["):], in_container=False)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    # 결과 ------------------------------------------------------------------
+
+    @property
+    def done(self) -> bool:
+        """더 읽어도 결과가 바뀌지 않는 시점이면 True."""
+        for index, parts in enumerate(self._parts):
+            if parts is None or not self._closed[index]:
+                return False
+            if self._lengths[index] > MIN_TEXT_LENGTH:
+                return True
+        return False
+
+    def result(self) -> Extraction:
+        for selector, parts in zip(self._candidates, self._parts):
+            if parts is not None:
+                text = " ".join(parts)
+                if text and len(text) > MIN_TEXT_LENGTH:
+                    return text, selector.source
+        return "", None
+
+    # 내부 처리 -------------------------------------------------------------
+
+    def _flush(self) -> None:
+        if self._pending:
+            data = "".join(self._pending)
+            self._pending.clear()
+            self._emit(data, in_container=self._container_depth > 0)
+
+    def _emit(self, data: str, in_container: bool) -> None:
+        if self._noise_depth or in_container or not self._active:
+            return
+        text = data.strip()
+        if text:
+            for index in self._active:
+                parts = self._parts[index]
+                self._lengths[index] += len(text) + bool(parts)
+                parts.append(text)  # type: ignore[union-attr]
+
+    def _pop_to(self, tag: str) -> None:
+        # 같은 이름의 열린 태그가 없으면 무시하고, 있으면 그 태그까지 모두 닫는다
+        if not self._open_tags[tag]:
+            return
+        while self._stack:
+            frame = self._stack.pop()
+            self._open_tags[frame.tag] -= 1
+            self._noise_depth -= frame.noise
+            self._container_depth -= frame.container
+            for index in frame.captures:
+                self._active.remove(index)
+                self._closed[index] = True
+            if frame.tag == tag:
+                break
+
+
+def extract_fast(
+    html: str,
+    candidates: Sequence[str] = CANDIDATE_SELECTORS,
+    noise: Sequence[str] = NOISE_SELECTORS,
+) -> Extraction:
+    """트리를 만들지 않는 단일 패스 파서로 본문을 추출한다."""
+    parser = StreamingExtractor(candidates, noise)
+    parser.feed(html)
+    parser.close()
+    return parser.result()
+
+
+EXTRACTORS: Dict[str, Callable[[str, Sequence[str], Sequence[str]], Extraction]] = {
+    "soup": extract_with_soup,
+    "fast": extract_fast,
+}
+
+
+def extract_article(
+    html: str,
+    backend: str = "fast",
+    candidates: Sequence[str] = CANDIDATE_SELECTORS,
+    noise: Sequence[str] = NOISE_SELECTORS,
+) -> Extraction:
+    """HTML 문서에서 노이즈 영역을 제거하고 기사 본문과, 본문을 찾은 셀렉터를 돌려준다."""
+    try:
+        extractor = EXTRACTORS[backend]
+    except KeyError:
+        raise ValueError(f"알 수 없는 추출 백엔드입니다: {backend!r} (사용 가능: {', '.join(EXTRACTORS)})")
+    return extractor(html, candidates, noise)
+
+
+def extract_article_text(html: str, backend: str = "fast") -> str:
+    """HTML 문서에서 노이즈 영역을 제거하고 기사 본문 텍스트를 찾는다."""
+    return extract_article(html, backend)[0]
+
+
+def normalize_charset(charset: str | None) -> str | None:
+    """응답 헤더/메타의 charset 레이블을 파이썬 코덱 이름으로 바꾼다. 신뢰할 수 없거나 모르는 값이면 None."""
+    if not charset:
+        return None
+    charset = charset.strip().strip("\"'").lower()
+    # 헤더의 iso-8859-1은 대부분 서버 기본값이라 실제 인코딩의 근거가 되지 못한다
+    if charset == "iso-8859-1":
+        return None
+    charset = CHARSET_ALIASES.get(charset, charset)
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return None
+
+
+def sniff_charset(head: bytes, final: bool = False) -> str | None:
+    """문서 앞부분으로 인코딩을 정한다. 판단하기에 아직 이르면 None (final이면 항상 값을 돌려준다).
+
+    처음 나온 비ASCII 구간이 UTF-8로 읽히면 UTF-8로 본다. CMS가 재인코딩하면서 <meta charset>을
+    그대로 두는 경우가 있어 바이트가 메타 선언보다 확실한 근거이기 때문이다. 그렇지 않으면
+    <meta charset>, 그것도 없으면 추정 결과를 쓴다. 본문 전체가 아니라 앞부분만 보므로 비용이 일정하다.
+    """
+    match = _META_CHARSET.search(head, 0, SNIFF_LIMIT)
+    declared = normalize_charset(match.group(1).decode("ascii", "ignore")) if match else None
+    non_ascii = _NON_ASCII.search(head, 0, SNIFF_LIMIT)
+    if non_ascii is None:
+        # ASCII만으로는 구분할 수 없으므로 비ASCII 바이트가 나올 때까지 기다린다
+        return (declared or "utf-8") if final or len(head) >= SNIFF_LIMIT else None
+    start = non_ascii.start()
+    if len(head) - start < 64 and not final:
+        return None
+    try:
+        # 구간 끝에서 잘린 멀티바이트 문자는 허용한다
+        codecs.getincrementaldecoder("utf-8")().decode(head[start:start + SNIFF_BYTES], final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    if declared and declared != "utf-8":
+        return declared
+    # 인코딩을 추측해야 하는 드문 경우에만 판별기를 불러온다
+    from requests.compat import chardet
+
+    return normalize_charset(chardet.detect(head[:SNIFF_LIMIT])["encoding"]) or "cp949"
+
+
+def decode_html(content: bytes, charset: str | None) -> str:
+    """응답 바이트를 디코딩한다. charset이 없거나 iso-8859-1이면 추정 인코딩을 적용한다."""
+    # 일부 국내 언론사는 euc-kr 등을 사용하므로 추정 인코딩을 우선 적용한다.
+    charset = normalize_charset(charset) or sniff_charset(content, final=True)
+    return str(content, charset, errors="replace")
+
+
+class ArticleStream:
+    """응답 본문을 조각 단위로 받아 인코딩을 정하고, fast 백엔드면 받는 즉시 본문을 추출한다.
+
+    feed()가 True를 돌려주면 더 받을 필요가 없다 (본문이 확정되었거나 max_bytes에 도달).
+    점진 추출을 하지 않으면 받은 바이트를 content에 모아 두고 인코딩만 정해 둔다.
+    """
+
+    def __init__(
+        self,
+        charset: str | None,
+        backend: str = "fast",
+        candidates: Sequence[str] = CANDIDATE_SELECTORS,
+        noise: Sequence[str] = NOISE_SELECTORS,
+        max_bytes: int = 2 * 1024 * 1024,
+        incremental: bool = True,
+    ) -> None:
+        self.charset = normalize_charset(charset)
+        self.backend = backend
+        self.candidates = candidates
+        self.noise = noise
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.truncated = False
+        self.decode_seconds = 0.0
+        self.parse_seconds = 0.0
+        self._raw = bytearray()
+        self._parser = StreamingExtractor(candidates, noise) if incremental and backend == "fast" else None
+        self._decoder: codecs.IncrementalDecoder | None = None
+        if self._parser is not None and self.charset:
+            self._decoder = codecs.getincrementaldecoder(self.charset)(errors="replace")
+
+    @property
+    def incremental(self) -> bool:
+        return self._parser is not None
+
+    @property
+    def content(self) -> bytes:
+        return bytes(self._raw)
+
+    @property
+    def done(self) -> bool:
+        return self.truncated or (self._parser is not None and self._parser.done)
+
+    def feed(self, chunk: bytes) -> bool:
+        room = self.max_bytes - self.size
+        if len(chunk) > room:
+            chunk = chunk[:room]
+            self.truncated = True
+        self.size += len(chunk)
+
+        if self._parser is None:
+            self._raw += chunk
+            if self.charset is None:
+                self.charset = sniff_charset(self._raw)
+        elif self._decoder is None:
+            # 인코딩을 정할 때까지 앞부분을 모아 둔다
+            self._raw += chunk
+            charset = sniff_charset(self._raw, final=self.truncated)
+            if charset is not None:
+                self.charset = charset
+                self._decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+                head = bytes(self._raw)
+                self._raw.clear()
+                self._write(head)
+        else:
+            self._write(chunk)
+        return self.done
+
+    def close(self) -> Extraction:
+        """받은 내용으로 본문을 추출한다. 점진 추출이 아니면 호출하는 쪽에서 content/charset으로 처리한다."""
+        if self.charset is None:
+            self.charset = sniff_charset(bytes(self._raw), final=True)
+        if self._parser is None:
+            started = time.perf_counter()
+            html = str(self._raw, self.charset, errors="replace")
+            self.decode_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            extraction = extract_article(html, self.backend, self.candidates, self.noise)
+            self.parse_seconds += time.perf_counter() - started
+            return extraction
+        if self._decoder is None:
+            self._decoder = codecs.getincrementaldecoder(self.charset)(errors="replace")
+            head = bytes(self._raw)
+            self._raw.clear()
+            self._write(head)
+        self._write(b"", final=True)
+        started = time.perf_counter()
+        self._parser.close()
+        self.parse_seconds += time.perf_counter() - started
+        return self._parser.result()
+
+    def _write(self, data: bytes, final: bool = False) -> None:
+        assert self._parser is not None and self._decoder is not None
+        started = time.perf_counter()
+        text = self._decoder.decode(data, final)
+        decoded = time.perf_counter()
+        if text and not self._parser.done:
+            self._parser.feed(text)
+        self.decode_seconds += decoded - started
+        self.parse_seconds += time.perf_counter() - decoded
+
+
+def parse_article(
+    content: bytes,
+    charset: str | None,
+    backend: str = "fast",
+    candidates: Sequence[str] = CANDIDATE_SELECTORS,
+    noise: Sequence[str] = NOISE_SELECTORS,
+) -> Extraction:
+    """응답 바이트를 디코딩해 본문을 추출한다. 프로세스 풀에서 실행할 수 있도록 모듈 수준 함수로 둔다."""
+    return extract_article(decode_html(content, charset), backend, candidates, noise)
+
+
+def parse_article_timed(
+    content: bytes,
+    charset: str | None,
+    backend: str = "fast",
+    candidates: Sequence[str] = CANDIDATE_SELECTORS,
+    noise: Sequence[str] = NOISE_SELECTORS,
+) -> Tuple[Extraction, float, float]:
+    """parse_article과 같고, 디코딩과 본문 추출에 걸린 시간(초)을 함께 돌려준다."""
+    started = time.perf_counter()
+    html = decode_html(content, charset)
+    decoded = time.perf_counter()
+    extraction = extract_article(html, backend, candidates, noise)
+    return extraction, decoded - started, time.perf_counter() - decoded
@@ -0,0 +1,168 @@
+"""호스트별 요청 정책: 속도 제한, 재시도 대기, 서킷 브레이커, 지연 시간 기반 제한 시간."""
+from __future__ import annotations
+
+import random
+import threading
+import time
+import urllib.parse
+from email.utils import parsedate_to_datetime
+from typing import Dict
+
+import httpx
+
+from config import Settings
+
+# 재시도할 응답 상태 (요청 과다, 일시적인 서버 오류)
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+# 재시도 대기 상한(초). Retry-After가 이보다 길면 이 값만큼만 기다린다
+MAX_BACKOFF = 5.0
+# 제한 시간을 조정하기 전에 모을 최소 관측 수와, 추정 응답 시간(srtt + 4*rttvar)에 곱할 여유 배수
+MIN_SAMPLES = 5
+TIMEOUT_FACTOR = 3.0
+
+
+class CircuitOpen(httpx.RequestError):
+    """연속 실패로 잠시 건너뛰는 호스트에 대한 요청"""
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고, 그 토큰이 생길 때까지 기다려야 하는 시간(초)을 돌려준다."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class CircuitBreaker:
+    """연속 failures번 실패하면 reset초 동안 열리고(요청 차단), 이후 한 번 시험 요청을 허용한다."""
+
+    def __init__(self, failures: int, reset: float) -> None:
+        self.failures = failures
+        self.reset = reset
+        self._count = 0
+        self._opened_at: float | None = None
+        # 진행 중인 시험 요청을 보낸 시각. 취소되어 결과가 오지 않아도 reset초 뒤에는 다시 시험한다
+        self._trial_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self._opened_at >= self.reset else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.failures <= 0 or self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset:
+                return False
+            if self._trial_at is not None and now - self._trial_at < self.reset:
+                return False
+            # 열린 뒤 reset초가 지나면 시험 요청 하나만 보낸다
+            self._trial_at = now
+            return True
+
+    def success(self) -> None:
+        with self._lock:
+            self._count = 0
+            self._opened_at = None
+            self._trial_at = None
+
+    def failure(self) -> None:
+        with self._lock:
+            self._count += 1
+            if self._trial_at is not None or (self.failures > 0 and self._count >= self.failures):
+                self._opened_at = time.monotonic()
+                self._trial_at = None
+
+
+class LatencyEstimator:
+    """응답 헤더까지의 시간을 지수 평균(TCP RTO와 같은 방식)으로 추적해 호스트별 제한 시간을 정한다."""
+
+    def __init__(self, floor: float, ceiling: float) -> None:
+        self.floor = floor
+        self.ceiling = ceiling
+        self.samples = 0
+        self.srtt = 0.0
+        self.rttvar = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            if self.samples == 0:
+                self.srtt, self.rttvar = seconds, seconds / 2
+            else:
+                self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - seconds)
+                self.srtt = 0.875 * self.srtt + 0.125 * seconds
+            self.samples += 1
+
+    def timeout(self) -> float:
+        if self.samples < MIN_SAMPLES:
+            return self.ceiling
+        return min(self.ceiling, max(self.floor, (self.srtt + 4 * self.rttvar) * TIMEOUT_FACTOR))
+
+
+class HostPolicy:
+    """호스트 하나의 속도 제한·서킷 브레이커·제한 시간"""
+
+    def __init__(self, settings: Settings) -> None:
+        self.bucket = TokenBucket(settings.host_rate, settings.host_burst)
+        self.breaker = CircuitBreaker(settings.breaker_failures, settings.breaker_reset)
+        self.latency = LatencyEstimator(settings.adaptive_timeout_min, settings.request_timeout)
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.latency.timeout())
+
+
+class HostPolicies:
+    """호스트별 HostPolicy 모음과 재시도 규칙"""
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._policies: Dict[str, HostPolicy] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> HostPolicy:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            policy = self._policies.get(host)
+            if policy is None:
+                policy = self._policies[host] = HostPolicy(self.settings)
+            return policy
+
+    def backoff(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """attempt번째 재시도 전 대기 시간. Retry-After가 있으면 따르고, 없으면 지수 백오프에 지터를 준다."""
+        if response is not None:
+            retry_after = _retry_after(response.headers.get("Retry-After", ""))
+            if retry_after is not None:
+                return min(retry_after, MAX_BACKOFF)
+        return random.uniform(0, min(self.settings.retry_backoff * 2 ** attempt, MAX_BACKOFF))
+
+
+def _retry_after(value: str) -> float | None:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 바꾼다."""
+    value = value.strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
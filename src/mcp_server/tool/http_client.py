@@ -0,0 +1,398 @@
+"""검색 API와 기사 수집이 함께 쓰는 HTTP 클라이언트."""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+import time
+import urllib.parse
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping
+
+import httpx
+
+from config import Settings
+
+from .host_policy import RETRY_STATUS, CircuitOpen, HostPolicies, HostPolicy
+from .metrics import Metrics
+from .quota import DailyQuota
+
+# HTTP/2는 h2 패키지, brotli 응답 해제는 brotli(또는 brotlicffi) 패키지가 있을 때만 켜진다.
+# (uv pip install "httpx[http2,brotli]") gzip/deflate는 항상 지원된다.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 스트리밍 수신 조각 크기. None이면 소켓에서 읽힌 크기 그대로 넘겨 복사를 줄인다
+CHUNK_SIZE: int | None = None
+
+# 재시도할 전송 오류 (연결 실패, 제한 시간 초과 등). 서킷이 열려 건너뛴 요청(CircuitOpen)은 제외
+RETRY_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+# httpcore trace 이벤트 중 연결 수립(DNS 조회 포함 TCP 연결, TLS 핸드셰이크)에 해당하는 구간
+CONNECT_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+
+
+def client_options(settings: Settings, headers: Mapping[str, str]) -> Dict[str, Any]:
+    """동기/비동기 클라이언트가 공유하는 연결 풀·타임아웃 설정"""
+    return {
+        "headers": dict(headers),
+        "timeout": httpx.Timeout(settings.request_timeout),
+        "limits": httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        "http2": settings.http2 and HTTP2_AVAILABLE,
+        "follow_redirects": True,
+    }
+
+
+class HttpClients:
+    """같은 설정을 쓰는 동기(httpx.Client)·비동기(httpx.AsyncClient) 클라이언트 묶음.
+
+    keep-alive 연결을 재사용해 openapi.naver.com, 언론사 서버와의 TLS 핸드셰이크를 줄인다.
+    httpx의 연결 수 제한은 전체 기준이므로, 호스트별 동시 연결 수는 host_slot()으로 따로 제한한다.
+    호스트별 속도 제한·재시도·서킷 브레이커·제한 시간 조정은 policies(HostPolicies)가 맡는다.
+
+    AsyncClient는 만든 이벤트 루프에서만 닫을 수 있으므로, 루프마다 감시 작업을 하나 두어
+    루프가 끝날 때(asyncio.run이 남은 작업을 취소할 때)나 루프가 바뀔 때 그 루프에서 닫는다.
+    """
+
+    def __init__(self, settings: Settings, headers: Mapping[str, str], metrics: Metrics | None = None) -> None:
+        self.settings = settings
+        self.metrics = metrics or Metrics()
+        self.options = client_options(settings, headers)
+        self._sync: httpx.Client | None = None
+        self._async: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._guard: asyncio.Task | None = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        # 동기 요청은 여러 스레드에서 올 수 있으므로 스레드용 세마포어를 따로 둔다
+        self._sync_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._sync_slots_lock = threading.Lock()
+        self.policies = HostPolicies(settings)
+
+    @property
+    def sync(self) -> httpx.Client:
+        # 여러 스레드가 처음 동시에 요청해도 클라이언트는 하나만 만든다 (남는 클라이언트의 연결이 새지 않게)
+        with self._sync_slots_lock:
+            if self._sync is None:
+                self._sync = httpx.Client(**self.options)
+            return self._sync
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        # AsyncClient의 연결은 이벤트 루프에 묶이므로, 루프가 바뀌면 새로 만든다
+        loop = asyncio.get_running_loop()
+        if self._async is None or self._loop is not loop:
+            self._retire_async()
+            self._async = httpx.AsyncClient(**self.options)
+            self._loop = loop
+            self._guard = loop.create_task(self._close_with_loop(self._async), name="http-client-close")
+            self._host_slots.clear()
+        return self._async
+
+    @staticmethod
+    async def _close_with_loop(client: httpx.AsyncClient) -> None:
+        """취소될 때까지 기다렸다가 자기 루프에서 클라이언트를 닫는다."""
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await client.aclose()
+
+    def _retire_async(self) -> None:
+        """현재 AsyncClient를 만든 루프에 닫기를 요청한다 (그 루프가 다시 돌 때 닫힌다)."""
+        loop, guard = self._loop, self._guard
+        self._async = self._loop = self._guard = None
+        if guard is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(guard.cancel)
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """같은 호스트로 동시에 열리는 연결 수를 http_max_per_host로 제한한다."""
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.settings.http_max_per_host)
+        async with slot:
+            yield
+
+    @contextmanager
+    def host_slot_sync(self, url: str) -> Iterator[None]:
+        """host_slot()의 동기 버전. 여러 스레드의 동기 요청에도 같은 호스트 동시 연결 수 제한을 적용한다."""
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._sync_slots_lock:
+            slot = self._sync_slots.get(host)
+            if slot is None:
+                slot = self._sync_slots[host] = threading.BoundedSemaphore(self.settings.http_max_per_host)
+        with slot:
+            yield
+
+    async def get(
+        self, url: str, stage: str = "download", quota: DailyQuota | None = None, **kwargs: Any
+    ) -> httpx.Response:
+        """GET 요청. 슬롯 대기(queue), 연결 수립(connect), 나머지(stage) 시간과 본문 크기를 기록한다.
+
+        호스트 정책(속도 제한, 서킷 브레이커, 제한 시간)을 따르고 일시적인 실패는 재시도한다.
+        quota가 주어지면 재시도를 포함해 실제로 보낸 요청마다 호출 한도를 센다.
+        """
+        policy = self.policies.for_url(url)
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._admit(policy, url))
+            if quota is not None:
+                await quota.consume_async()
+            client = self.async_client
+            timer = _ConnectTimer()
+
+            async def trace(event: str, info: Dict[str, Any]) -> None:
+                timer.on_event(event)
+
+            queued = time.perf_counter()
+            try:
+                async with self.host_slot(url):
+                    started = time.perf_counter()
+                    self.metrics.observe_stage("queue", started - queued)
+                    response = await client.get(
+                        url, extensions={"trace": trace}, **{"timeout": policy.timeout(), **kwargs}
+                    )
+            except RETRY_ERRORS as exc:
+                delay = self._retry_delay(policy, attempt, error=exc)
+                if delay is None:
+                    raise
+            else:
+                self._observe(stage, started, timer, response)
+                delay = self._retry_delay(
+                    policy, attempt, response=response, latency=time.perf_counter() - started - timer.seconds
+                )
+                if delay is None:
+                    return response
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def get_sync(
+        self, url: str, stage: str = "download", quota: DailyQuota | None = None, **kwargs: Any
+    ) -> httpx.Response:
+        """동기 GET 요청. get()과 같은 지표를 기록하고 같은 호스트 정책·호출 한도 집계를 따른다."""
+        policy = self.policies.for_url(url)
+        attempt = 0
+        while True:
+            time.sleep(self._admit(policy, url))
+            if quota is not None:
+                quota.consume()
+            timer = _ConnectTimer()
+            queued = time.perf_counter()
+            try:
+                with self.host_slot_sync(url):
+                    started = time.perf_counter()
+                    self.metrics.observe_stage("queue", started - queued)
+                    response = self.sync.get(
+                        url,
+                        extensions={"trace": lambda event, info: timer.on_event(event)},
+                        **{"timeout": policy.timeout(), **kwargs},
+                    )
+            except RETRY_ERRORS as exc:
+                delay = self._retry_delay(policy, attempt, error=exc)
+                if delay is None:
+                    raise
+            else:
+                self._observe(stage, started, timer, response)
+                delay = self._retry_delay(
+                    policy, attempt, response=response, latency=time.perf_counter() - started - timer.seconds
+                )
+                if delay is None:
+                    return response
+            attempt += 1
+            time.sleep(delay)
+
+    @asynccontextmanager
+    async def stream(self, url: str, stage: str = "download", **kwargs: Any) -> AsyncIterator[Download]:
+        """본문을 조각 단위로 받는 GET 요청. 블록을 빠져나오면 남은 본문은 받지 않고 연결을 닫는다.
+
+        stage 시간에는 응답 헤더까지의 시간과 본문 조각을 기다린 시간만 들어간다 (조각 처리 시간 제외).
+        재시도는 응답 헤더를 받기 전까지만 한다 (본문을 넘겨준 뒤의 오류는 그대로 전달).
+        """
+        policy = self.policies.for_url(url)
+        attempt = 0
+        yielded = False
+        while True:
+            await asyncio.sleep(self._admit(policy, url))
+            client = self.async_client
+            timer = _ConnectTimer()
+
+            async def trace(event: str, info: Dict[str, Any]) -> None:
+                timer.on_event(event)
+
+            queued = time.perf_counter()
+            async with self.host_slot(url):
+                started = time.perf_counter()
+                self.metrics.observe_stage("queue", started - queued)
+                try:
+                    async with client.stream(
+                        "GET", url, extensions={"trace": trace}, **{"timeout": policy.timeout(), **kwargs}
+                    ) as response:
+                        wait = time.perf_counter() - started - timer.seconds
+                        delay = self._retry_delay(policy, attempt, response=response, latency=wait)
+                        if delay is None:
+                            download = Download(response, wait)
+                            yielded = True
+                            try:
+                                yield download
+                            finally:
+                                self._observe_stream(stage, timer, download)
+                            return
+                except RETRY_ERRORS as exc:
+                    if yielded:
+                        raise
+                    delay = self._retry_delay(policy, attempt, error=exc)
+                    if delay is None:
+                        raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @contextmanager
+    def stream_sync(self, url: str, stage: str = "download", **kwargs: Any) -> Iterator[Download]:
+        """stream()의 동기 버전"""
+        policy = self.policies.for_url(url)
+        attempt = 0
+        yielded = False
+        while True:
+            time.sleep(self._admit(policy, url))
+            timer = _ConnectTimer()
+            trace = lambda event, info: timer.on_event(event)  # noqa: E731
+            queued = time.perf_counter()
+            with self.host_slot_sync(url):
+                started = time.perf_counter()
+                self.metrics.observe_stage("queue", started - queued)
+                try:
+                    with self.sync.stream(
+                        "GET", url, extensions={"trace": trace}, **{"timeout": policy.timeout(), **kwargs}
+                    ) as response:
+                        wait = time.perf_counter() - started - timer.seconds
+                        delay = self._retry_delay(policy, attempt, response=response, latency=wait)
+                        if delay is None:
+                            download = Download(response, wait)
+                            yielded = True
+                            try:
+                                yield download
+                            finally:
+                                self._observe_stream(stage, timer, download)
+                            return
+                except RETRY_ERRORS as exc:
+                    if yielded:
+                        raise
+                    delay = self._retry_delay(policy, attempt, error=exc)
+                    if delay is None:
+                        raise
+            attempt += 1
+            time.sleep(delay)
+
+    def _admit(self, policy: HostPolicy, url: str) -> float:
+        """서킷이 열려 있으면 CircuitOpen을 던지고, 아니면 속도 제한 토큰을 받기까지 기다릴 시간을 돌려준다."""
+        if not policy.breaker.allow():
+            self.metrics.circuit_skips.inc()
+            host = urllib.parse.urlsplit(url).netloc
+            raise CircuitOpen(f"연속 실패로 {host} 요청을 잠시 건너뜁니다.")
+        return policy.bucket.reserve()
+
+    def _retry_delay(
+        self,
+        policy: HostPolicy,
+        attempt: int,
+        response: httpx.Response | None = None,
+        error: Exception | None = None,
+        latency: float = 0.0,
+    ) -> float | None:
+        """시도 결과를 호스트 정책에 기록하고, 재시도할 경우 대기 시간을, 아니면 None을 돌려준다."""
+        if error is not None:
+            policy.breaker.failure()
+            if isinstance(error, httpx.TimeoutException):
+                # 제한 시간 초과도 관측값으로 넣어, 너무 짧아진 제한 시간이 다시 늘어나게 한다
+                policy.latency.observe(policy.latency.timeout())
+                reason = "timeout"
+            else:
+                reason = "network"
+        else:
+            policy.latency.observe(latency)
+            if response.status_code not in RETRY_STATUS:
+                policy.breaker.success()
+                return None
+            policy.breaker.failure()
+            reason = "status"
+        if attempt >= self.settings.http_retries:
+            return None
+        self.metrics.retries.inc(1, reason)
+        return self.policies.backoff(attempt, response)
+
+    def _observe_stream(self, stage: str, timer: _ConnectTimer, download: Download) -> None:
+        if timer.seconds:
+            self.metrics.observe_stage("connect", timer.seconds)
+        self.metrics.observe_stage(stage, download.wait)
+        self.metrics.observe_bytes(stage, download.response.num_bytes_downloaded)
+
+    def _observe(self, stage: str, started: float, timer: _ConnectTimer, response: httpx.Response) -> None:
+        elapsed = time.perf_counter() - started
+        if timer.seconds:
+            self.metrics.observe_stage("connect", timer.seconds)
+        self.metrics.observe_stage(stage, elapsed - timer.seconds)
+        self.metrics.observe_bytes(stage, len(response.content))
+
+    def close(self) -> None:
+        """동기 클라이언트를 닫고, 비동기 클라이언트는 만든 루프에서 닫히도록 요청한다."""
+        if self._sync is not None:
+            self._sync.close()
+            self._sync = None
+        self._retire_async()
+
+    async def aclose(self) -> None:
+        """close()와 같고, 비동기 클라이언트가 현재 루프의 것이면 닫힐 때까지 기다린다."""
+        loop, guard = self._loop, self._guard
+        self.close()
+        if guard is not None and loop is asyncio.get_running_loop():
+            await asyncio.gather(guard, return_exceptions=True)
+
+
+class _ConnectTimer:
+    """httpcore trace 이벤트로 연결 수립에 걸린 시간을 잰다. 재사용된 연결이면 0."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self._started = 0.0
+
+    def on_event(self, event: str) -> None:
+        if not event.startswith(CONNECT_EVENTS):
+            return
+        if event.endswith(".started"):
+            self._started = time.perf_counter()
+        elif event.endswith((".complete", ".failed")) and self._started:
+            self.seconds += time.perf_counter() - self._started
+            self._started = 0.0
+
+
+class Download:
+    """스트리밍 응답과, 응답 헤더·본문 조각을 기다리며 보낸 시간(wait)"""
+
+    def __init__(self, response: httpx.Response, wait: float) -> None:
+        self.response = response
+        self.wait = wait
+
+    async def chunks(self, size: int | None = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        iterator = self.response.aiter_bytes(size).__aiter__()
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                self.wait += time.perf_counter() - started
+            yield chunk
+
+    def chunks_sync(self, size: int | None = CHUNK_SIZE) -> Iterator[bytes]:
+        iterator = self.response.iter_bytes(size)
+        while True:
+            started = time.perf_counter()
+            chunk = next(iterator, None)
+            self.wait += time.perf_counter() - started
+            if chunk is None:
+                return
+            yield chunk
@@ -0,0 +1,173 @@
+"""수집한 기사를 모아 두는 로컬 전문 검색 색인 (SQLite FTS5)."""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from .cache import normalize_url
+from .records import ArticleRecord
+
+logger = logging.getLogger(__name__)
+
+# 트라이그램 토크나이저는 세 글자 미만의 검색어를 MATCH로 찾지 못한다. 짧은 단어("AI", "금리")는 LIKE로 거른다
+MIN_MATCH_CHARS = 3
+# 시도할 FTS5 토크나이저 순서. trigram은 SQLite 3.34 이상에만 있으므로, 없으면 단어 단위(unicode61)로 색인한다
+TOKENIZERS = ("trigram", "unicode61")
+
+_TABLES = (
+    "CREATE TABLE IF NOT EXISTS articles ("
+    " id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, url TEXT NOT NULL, title TEXT NOT NULL,"
+    " text TEXT NOT NULL, pub_date TEXT NOT NULL, indexed_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS articles_indexed_at ON articles (indexed_at)",
+)
+# 본문은 articles 테이블에만 두고 FTS 테이블에는 색인만 둔다 (external content)
+_FTS_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    " title, text, content='articles', content_rowid='id', tokenize='{tokenizer}')"
+)
+_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN"
+    " INSERT INTO articles_fts (rowid, title, text) VALUES (new.id, new.title, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN"
+    " INSERT INTO articles_fts (articles_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text); END",
+    # 다시 수집한 기사는 제목·본문이 바뀐 경우에만 색인을 고친다
+    "CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, text ON articles"
+    " WHEN old.title IS NOT new.title OR old.text IS NOT new.text BEGIN"
+    " INSERT INTO articles_fts (articles_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);"
+    " INSERT INTO articles_fts (rowid, title, text) VALUES (new.id, new.title, new.text); END",
+)
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_query(query: str, tokenizer: str | None = "trigram") -> Tuple[str, List[str]]:
+    """검색어를 FTS5 MATCH 식(세 글자 이상 단어를 모두 포함)과 LIKE로 거를 짧은 단어 목록으로 나눈다.
+
+    unicode61은 단어 단위로 색인하므로 조사가 붙은 단어("반도체가")도 찾도록 접두어 검색을 쓴다.
+    tokenizer가 None(FTS5 없음)이면 모든 단어를 LIKE로 거른다.
+    """
+    terms = list(dict.fromkeys(query.split()))
+    if tokenizer is None:
+        return "", terms
+    suffix = "*" if tokenizer == "unicode61" else ""
+    phrases = ['"' + term.replace('"', '""') + '"' + suffix for term in terms if len(term) >= MIN_MATCH_CHARS]
+    short = [term for term in terms if len(term) < MIN_MATCH_CHARS]
+    return " AND ".join(phrases), short
+
+
+class ArticleIndex:
+    """정규화된 URL당 한 건씩 기사를 저장하고, 제목·본문을 트라이그램으로 색인한다.
+
+    db_path가 비어 있으면 메모리에만 두고, 경로가 주어지면 재시작 후에도 유지된다.
+    SQLite가 trigram을 지원하지 않으면 unicode61로, FTS5 자체가 없으면 LIKE 검색으로 낮춰 동작한다.
+    """
+
+    def __init__(self, db_path: str = "", max_entries: int = 50000) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        for statement in _TABLES:
+            self._db.execute(statement)
+        self.tokenizer = self._create_fts()
+        self._db.commit()
+
+    def _create_fts(self) -> str | None:
+        """FTS 테이블과 트리거를 만들고 사용한 토크나이저를 돌려준다. 모두 실패하면 None."""
+        for tokenizer in TOKENIZERS:
+            try:
+                self._db.execute(_FTS_TABLE.format(tokenizer=tokenizer))
+            except sqlite3.OperationalError as exc:
+                logger.warning("FTS5 %s 토크나이저를 쓸 수 없습니다 (SQLite %s): %s", tokenizer, sqlite3.sqlite_version, exc)
+                continue
+            for statement in _TRIGGERS:
+                self._db.execute(statement)
+            return tokenizer
+        logger.warning("전문 검색 색인 없이 LIKE로 기사를 찾습니다.")
+        return None
+
+    def add(self, articles: List[ArticleRecord]) -> None:
+        """기사를 색인에 넣는다. 이미 있는 기사는 색인 시각과 (바뀌었으면) 내용을 갱신한다."""
+        if not articles:
+            return
+        now = time.time()
+        rows = [
+            (normalize_url(article.url), article.url, article.title, article.text, article.pub_date, now)
+            for article in articles
+            if article.url and article.text
+        ]
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.executemany(
+                "INSERT INTO articles (key, url, title, text, pub_date, indexed_at) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET url = excluded.url, title = excluded.title, text = excluded.text,"
+                " pub_date = excluded.pub_date, indexed_at = excluded.indexed_at",
+                rows,
+            )
+            self._writes += len(rows)
+            if self._writes >= 100:
+                self._writes = 0
+                self._prune()
+            self._db.commit()
+
+    def search(self, query: str, limit: int, max_age: float | None = None) -> List[ArticleRecord]:
+        """검색어의 모든 단어를 제목이나 본문에 포함한 기사를 관련도 순으로 돌려준다.
+
+        max_age가 주어지면 그보다 오래전에 색인된 기사는 제외한다.
+        """
+        match, short = build_query(query, self.tokenizer)
+        if not match and not short:
+            return []
+        if match:
+            sql = (
+                "SELECT a.title, a.url, a.text, a.pub_date FROM articles_fts"
+                " JOIN articles a ON a.id = articles_fts.rowid WHERE articles_fts MATCH ?"
+            )
+            params: List[object] = [match]
+        else:
+            sql = "SELECT a.title, a.url, a.text, a.pub_date FROM articles a WHERE 1"
+            params = []
+        if max_age is not None:
+            sql += " AND a.indexed_at >= ?"
+            params.append(time.time() - max_age)
+        for term in short:
+            sql += " AND (a.title LIKE ? ESCAPE '\\' OR a.text LIKE ? ESCAPE '\\')"
+            pattern = f"%{_escape_like(term)}%"
+            params += [pattern, pattern]
+        sql += " ORDER BY bm25(articles_fts)" if match else " ORDER BY a.indexed_at DESC"
+        sql += " LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            if self._db is None:
+                return []
+            rows = self._db.execute(sql, params).fetchall()
+        return [ArticleRecord(*row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            if self._db is None:
+                return {"entries": 0}
+            (count,) = self._db.execute("SELECT COUNT(*) FROM articles").fetchone()
+            return {"entries": count}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _prune(self) -> None:
+        # 한도를 넘으면 오래전에 색인된 기사부터 지운다
+        (count,) = self._db.execute("SELECT COUNT(*) FROM articles").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM articles WHERE id IN (SELECT id FROM articles ORDER BY indexed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            logger.info("기사 색인 정리: %d건 삭제", count - self.max_entries)
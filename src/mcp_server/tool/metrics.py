@@ -0,0 +1,197 @@
+"""수집 경로 단계별 계측과 Prometheus 텍스트 노출."""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# search: 검색 API, queue: 호스트별 연결 슬롯 대기, connect: DNS+TCP+TLS, download: 요청 전송~본문 수신,
+# decode: 바이트 -> 문자열(인코딩 추정 포함), parse: 본문 추출, dedup: 중복 기사 판별, select: 결과 선별/정렬,
+# index: 로컬 전문 검색 색인 조회·저장
+STAGES = ("search", "queue", "connect", "download", "decode", "parse", "dedup", "select", "index")
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # 라벨 값별 [버킷별 개수..., 합계, 전체 개수]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                row[index] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        row = self._values.get(labels)
+        return int(row[-1]) if row else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, row in sorted(self._values.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, row):
+                    cumulative += count
+                    bucket = _labels(self.labels, labels, 'le="%g"' % bound)
+                    lines.append(f"{self.name}_bucket{bucket} {cumulative:g}")
+                bucket = _labels(self.labels, labels, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{bucket} {row[-1]:g}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {row[-2]:.6f}")
+                lines.append(f"{self.name}_count{_labels(self.labels, labels)} {row[-1]:g}")
+        return lines
+
+
+class Trace:
+    """요청 하나(collect_news 호출)의 단계별 누적 시간. 추적 로그용"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}
+        self.bytes = 0
+
+    def add(self, stage: str, seconds: float) -> None:
+        entry = self.stages.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "bytes": self.bytes,
+            # 동시에 진행된 요청의 시간이 더해지므로 단계 합계가 전체 시간보다 클 수 있다
+            "stages": {
+                stage: {"ms": round(seconds * 1000, 1), "count": int(count)}
+                for stage, (seconds, count) in self.stages.items()
+            },
+        }
+
+
+_current_trace: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("news_trace", default=None)
+
+
+class Metrics:
+    """NewsCollector가 기록하는 지표 모음. render()가 /metrics 응답 본문을 만든다."""
+
+    def __init__(self) -> None:
+        self.stage_seconds = Histogram("news_stage_seconds", "Time spent per collection stage", ("stage",))
+        self.collect_seconds = Histogram("news_collect_seconds", "End-to-end collect_news latency")
+        self.download_bytes = Counter("news_download_bytes_total", "Response body bytes downloaded", ("kind",))
+        self.fetches = Counter("news_article_fetch_total", "Article fetches by outcome", ("result",))
+        self.articles = Counter("news_articles_returned_total", "Articles returned to callers")
+        self.stream_stops = Counter(
+            "news_stream_early_stop_total", "Article downloads stopped before the end of the body", ("reason",)
+        )
+        self.duplicates = Counter(
+            "news_duplicates_skipped_total", "Search results dropped as duplicates", ("kind",)
+        )
+        self.result_bytes = Counter(
+            "news_result_bytes_total", "Article text bytes before and after budget packing", ("stage",)
+        )
+        self.retries = Counter("news_http_retries_total", "HTTP request retries by reason", ("reason",))
+        self.circuit_skips = Counter("news_circuit_skip_total", "Requests skipped because the host circuit was open")
+        self.prefetches = Counter("news_prefetch_total", "Background topic refreshes by outcome", ("result",))
+        self.index_queries = Counter(
+            "news_index_queries_total", "search_news queries answered from the local index or live", ("result",)
+        )
+        self._sources: List[Tuple[str, str, str, Callable[[], Dict[str, int]]]] = []
+
+    def add_source(self, name: str, help: str, label: str, read: Callable[[], Dict[str, int]]) -> None:
+        """스크레이프 시점에 읽는 카운터 묶음(예: 캐시 적중 통계)을 등록한다."""
+        self._sources.append((name, help, label, read))
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self.stage_seconds.observe(seconds, stage)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(stage, seconds)
+
+    def observe_bytes(self, kind: str, size: int) -> None:
+        self.download_bytes.inc(size, kind)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.bytes += size
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - started)
+
+    @contextmanager
+    def trace(self, name: str) -> Iterator[Trace]:
+        """이 블록 안에서(이 블록에서 만든 태스크 포함) 기록되는 단계 시간을 Trace에 모은다."""
+        trace = Trace(name)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        metrics = (
+            self.stage_seconds, self.collect_seconds, self.download_bytes, self.fetches, self.articles,
+            self.stream_stops, self.duplicates, self.result_bytes, self.prefetches, self.retries,
+            self.circuit_skips, self.index_queries,
+        )
+        for metric in metrics:
+            lines.extend(metric.render())
+        for name, help, label, read in self._sources:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(read().items()):
+                lines.append(f'{name}{{{label}="{key}"}} {value}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,70 @@
+"""검색 결과 필드와 기사 본문의 텍스트 정규화.
+
+정규식은 모듈을 불러올 때 한 번만 컴파일하고, 한 요청에서 돌려줄 기사 전체에 같은 단계를 차례로 적용한다.
+"""
+from __future__ import annotations
+
+import html
+import re
+import unicodedata
+from dataclasses import replace
+from typing import List
+
+from .records import ArticleRecord
+
+# 검색 API 제목·요약의 강조 태그(<b>...</b>)
+_TAG = re.compile(r"<[^>]*>")
+# 화면에 보이지 않는 문자(폭 없는 공백, BOM, 소프트 하이픈)는 지운다. 그 밖의 공백 문자는 str.split()이 접는다
+# (str.translate는 비ASCII 문자마다 dict를 조회해 한글 본문에서 정규식보다 수십 배 느리다)
+_INVISIBLE = re.compile("[\u200b\u200c\u200d\u2060\ufeff\u00ad]")
+
+# 기자 서명·이메일·저작권 문구
+_EMAIL = r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+_BYLINE = r"[가-힣]{2,4} ?(?:기자|특파원|통신원)"
+_COPYRIGHT = r"[<\[(〈]?\s*(?:저작권자|(?i:copyright)|ⓒ|©)[^<>\[\]()〈〉]{0,60}?(?:금지|(?i:reserved))\.?\s*[>\])〉]?"
+_DATELINE = r"[\[(【][^\])】=]{1,20}=[^\])】]{1,20}[\])】]"
+# 본문 앞의 발신지·기자명 ("[서울=뉴시스] 홍길동 기자 =")
+_HEAD = re.compile(rf"\s*(?:{_DATELINE})?\s*(?:{_BYLINE}\s*(?:{_EMAIL})?\s*=)?")
+# 본문 끝에 이어 붙은 기자 서명·이메일·저작권 문구 묶음
+_TAIL = re.compile(rf"(?:\s*[(<\[]?(?:{_BYLINE}|{_EMAIL}|{_COPYRIGHT})[)>\]]?)+\s*$")
+_INLINE_EMAIL = re.compile(_EMAIL)
+# 끝부분 문구는 본문 마지막 TAIL_CHARS자 안에서만 찾는다 (모든 위치에서 시도하면 본문 길이에 비례해 느려진다)
+TAIL_CHARS = 200
+
+
+def normalize_text(text: str) -> str:
+    """HTML 엔티티를 풀고, 보이지 않는 문자를 지우고, NFC로 합치고, 연속 공백을 한 칸으로 줄인다."""
+    if "&" in text:
+        text = html.unescape(text)
+    text = _INVISIBLE.sub("", text)
+    # 자모가 분리된(NFD) 한글은 완성형으로 합쳐야 같은 글자로 검색·비교된다
+    if not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+
+def clean_markup(text: str) -> str:
+    """검색 API의 제목·요약에서 태그를 지운 뒤 normalize_text를 적용한다."""
+    return normalize_text(_TAG.sub("", text))
+
+
+def clean_body(text: str) -> str:
+    """기사 본문을 정규화하고 발신지·기자 서명·이메일·저작권 문구를 지운다.
+
+    파서가 이미 엔티티를 풀어 둔 본문도 다시 푼다 (이중으로 이스케이프한 언론사 대응).
+    """
+    text = normalize_text(text)
+    head = _HEAD.match(text)
+    if head.end():
+        text = text[head.end():]
+    tail = _TAIL.search(text, max(len(text) - TAIL_CHARS, 0))
+    if tail is not None:
+        text = text[:tail.start()]
+    if "@" in text:
+        text = " ".join(_INLINE_EMAIL.sub("", text).split())
+    return text.strip()
+
+
+def normalize_articles(articles: List[ArticleRecord]) -> List[ArticleRecord]:
+    """한 요청에서 돌려줄 기사 전체의 제목과 본문을 정규화한다."""
+    return [replace(article, title=normalize_text(article.title), text=clean_body(article.text)) for article in articles]
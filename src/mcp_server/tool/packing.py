@@ -0,0 +1,123 @@
+"""collect_news 응답을 크기 예산에 맞춰 줄이는 단계."""
+from __future__ import annotations
+
+import re
+from dataclasses import replace
+from typing import Dict, List, Sequence, Tuple
+
+from .normalize import normalize_articles
+from .records import ArticleRecord
+
+# 문장 경계: 마침표·물음표·느낌표·말줄임표 뒤의 공백
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+# 관련 기사·사진 안내처럼 본문 내용이 아닌 문장
+_BOILERPLATE = re.compile(r"^[▶■☞◆△]|^\[[^\]]*(?:사진|그래픽|영상)[^\]]*\]$")
+# 기자 서명·이메일·저작권 표시로 시작하는 짧은 줄. 본문 끝의 서명 묶음은 clean_body가 먼저 지우고,
+# 여기서는 본문 중간에 끼어 남은 것만 거른다 (본문 문장 속의 '저작권' 같은 낱말은 건드리지 않는다)
+_SIGNATURE = re.compile(
+    r"\W*(?:[가-힣]{2,4} ?(?:기자|특파원|통신원)\s*)?"
+    r"(?:[\w.+-]+@[\w-]+(?:\.[\w-]+)+|저작권자|무단\s*전재|ⓒ|©|copyright)",
+    re.IGNORECASE,
+)
+SIGNATURE_CHARS = 80
+ELLIPSIS = "…"
+
+# 예산 안에 고른 기사: (원래 순서, 기사, 리드 문장들, 정리한 본문 바이트 수)
+Chosen = Tuple[int, ArticleRecord, List[str], int]
+
+
+def _is_boilerplate(sentence: str) -> bool:
+    if _BOILERPLATE.search(sentence):
+        return True
+    return len(sentence) <= SIGNATURE_CHARS and _SIGNATURE.match(sentence) is not None
+
+
+def lead_sentences(text: str) -> List[str]:
+    """본문을 문장으로 나누고 상투 문구와 반복된 문장을 뺀 나머지를 원래 순서대로 돌려준다."""
+    seen = set()
+    sentences = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if not sentence or sentence in seen or _is_boilerplate(sentence):
+            continue
+        seen.add(sentence)
+        sentences.append(sentence)
+    return sentences
+
+
+def query_terms(query: str) -> List[str]:
+    """검색어를 공백으로 나눈 낱말 (소문자, 중복 제거)"""
+    return list(dict.fromkeys(query.lower().split()))
+
+
+def relevance(article: ArticleRecord, sentences: Sequence[str], terms: Sequence[str]) -> int:
+    """검색어 낱말이 제목에 있으면 2점, 리드 문장에 있으면 1점씩 더한 점수.
+
+    한국어는 조사가 붙으므로 낱말 단위가 아니라 부분 문자열로 비교한다.
+    """
+    title = article.title.lower()
+    body = " ".join(sentences).lower()
+    return sum(2 * (term in title) + (term in body) for term in terms)
+
+
+def trim_to_bytes(sentences: List[str], budget: int) -> str:
+    """앞 문장부터 UTF-8 budget 바이트 안에 들어가는 만큼 이어 붙인다. 첫 문장부터 넘치면 글자 단위로 자른다."""
+    kept: List[str] = []
+    used = 0
+    for sentence in sentences:
+        size = len(sentence.encode("utf-8")) + (1 if kept else 0)
+        if used + size > budget:
+            break
+        kept.append(sentence)
+        used += size
+    if kept or not sentences:
+        return " ".join(kept)
+    cut = sentences[0].encode("utf-8")[: max(budget - len(ELLIPSIS.encode("utf-8")), 0)]
+    return cut.decode("utf-8", errors="ignore").rstrip() + ELLIPSIS
+
+
+def pack_articles(
+    articles: List[ArticleRecord], budget: int, min_bytes: int = 600, query: str = ""
+) -> List[ArticleRecord]:
+    """기사 목록을 순서대로 유지하면서 본문·제목·URL 합계가 budget 바이트 안에 들도록 줄인다.
+
+    제목·본문을 정규화(normalize_articles)한 뒤, 본문은 상투 문구를 빼고 앞 문장(리드)부터 남긴다.
+    짧은 기사가 다 쓰지 않은 몫은 긴 기사에 돌리고, 본문에 min_bytes도 줄 수 없는 기사부터는 넣지 않는다.
+    query가 있으면 예산에 넣을 기사를 검색어 관련도(relevance)가 높은 것부터 고른다 (응답 순서는 그대로).
+    budget이 0이면 정규화와 본문 정리만 한다.
+    """
+    cleaned = [(article, lead_sentences(article.text)) for article in normalize_articles(articles)]
+    cleaned = [(article, sentences) for article, sentences in cleaned if sentences]
+    if budget <= 0:
+        return [replace(article, text=" ".join(sentences)) for article, sentences in cleaned]
+
+    # 예산 안에 최소 분량으로라도 들어가는 기사만 고른다 (검색어가 있으면 관련도 순, 없으면 앞쪽부터)
+    order = list(range(len(cleaned)))
+    terms = query_terms(query)
+    if terms:
+        scores = [relevance(article, sentences, terms) for article, sentences in cleaned]
+        order.sort(key=lambda index: -scores[index])
+    chosen: List[Chosen] = []
+    remaining = budget
+    for position in order:
+        article, sentences = cleaned[position]
+        overhead = len(article.title.encode("utf-8")) + len(article.url.encode("utf-8"))
+        size = len(" ".join(sentences).encode("utf-8"))
+        if remaining < overhead + min(size, min_bytes):
+            break
+        chosen.append((position, article, sentences, size))
+        remaining -= overhead + min(size, min_bytes)
+    remaining += sum(min(size, min_bytes) for _, _, _, size in chosen)
+    chosen.sort(key=lambda item: item[0])
+
+    # 남은 예산을 짧은 기사부터 나눠 주어, 짧은 기사가 남긴 몫이 긴 기사에 돌아가게 한다
+    allotted: Dict[int, int] = {}
+    by_size = sorted(range(len(chosen)), key=lambda index: chosen[index][3])
+    for rank, index in enumerate(by_size):
+        share = remaining // (len(by_size) - rank)
+        allotted[index] = min(chosen[index][3], share)
+        remaining -= allotted[index]
+
+    return [
+        replace(article, text=trim_to_bytes(sentences, allotted[index]))
+        for index, (_, article, sentences, _) in enumerate(chosen)
+    ]
@@ -0,0 +1,129 @@
+"""자주 요청되는 주제를 백그라운드에서 미리 수집하는 스케줄러."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Deque, Dict, List
+
+from config import Settings
+
+if TYPE_CHECKING:
+    from .tool import NewsCollector
+
+logger = logging.getLogger(__name__)
+
+# 검색 결과가 만료되기 전에 갱신하도록 유지 시간의 이 비율이 지나면 다시 받는다
+REFRESH_AHEAD = 0.8
+# 사용자 요청 몫으로 남겨 둘 일일 한도 비율. 남은 호출 수가 이보다 적으면 미리 수집을 멈춘다
+QUOTA_RESERVE = 0.1
+# 미리 수집할 때의 기사 본문 동시 요청 수 (사용자 요청의 연결 슬롯을 빼앗지 않도록 작게 둔다)
+PREFETCH_CONCURRENCY = 2
+# 요청 수를 기억할 최대 주제 수
+MAX_TRACKED_TOPICS = 1000
+
+
+class PrefetchScheduler:
+    """인기 주제의 검색 결과와 기사 본문을 미리 받아, 사용자 요청이 데워진 캐시에서 바로 응답되게 한다.
+
+    record()로 collect_news 요청을 집계하고, running() 블록 동안 최근 prefetch_window초 안에
+    prefetch_min_hits번 이상 요청된 상위 prefetch_topics개 주제를 검색 결과가 만료되기 전에 갱신한다.
+    검색 API 호출은 일일 한도 중 prefetch_quota_share 비율을 하루에 고르게 나눈 간격으로 한 번씩만 한다.
+    """
+
+    def __init__(self, collector: NewsCollector, settings: Settings) -> None:
+        self.collector = collector
+        self.settings = settings
+        self._hits: Dict[str, Deque[float]] = {}
+        self._refreshed: Dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def interval(self) -> float:
+        """미리 수집 호출 사이의 최소 간격(초)"""
+        per_day = self.settings.naver_daily_quota * self.settings.prefetch_quota_share
+        return 86400.0 / max(per_day, 1.0)
+
+    def record(self, topic: str) -> None:
+        """사용자 요청 하나를 집계한다."""
+        topic = topic.strip()
+        if not topic:
+            return
+        now = time.monotonic()
+        hits = self._hits.get(topic)
+        if hits is None:
+            if len(self._hits) >= MAX_TRACKED_TOPICS:
+                self._prune(now)
+            if len(self._hits) >= MAX_TRACKED_TOPICS:
+                # 그래도 가득 차 있으면 가장 오래전에 요청된 주제를 잊는다
+                oldest = min(self._hits, key=lambda name: self._hits[name][-1])
+                del self._hits[oldest]
+                self._refreshed.pop(oldest, None)
+            hits = self._hits[topic] = deque()
+        hits.append(now)
+
+    def hot_topics(self) -> List[str]:
+        """집계 구간 안에서 요청이 많은 순서의 대상 주제"""
+        self._prune(time.monotonic())
+        ranked = sorted(
+            (topic for topic, hits in self._hits.items() if len(hits) >= self.settings.prefetch_min_hits),
+            key=lambda topic: len(self._hits[topic]),
+            reverse=True,
+        )
+        return ranked[: self.settings.prefetch_topics]
+
+    def due_topics(self) -> List[str]:
+        """갱신할 때가 된 대상 주제 (인기 순)"""
+        now = time.monotonic()
+        stale = self.settings.prefetch_ttl * REFRESH_AHEAD
+        return [topic for topic in self.hot_topics() if now - self._refreshed.get(topic, -stale) >= stale]
+
+    async def refresh(self, topic: str, semaphore: asyncio.Semaphore) -> bool:
+        """주제 하나를 미리 수집한다. 한도가 부족하거나 실패하면 False."""
+        quota = self.collector.quota
+        if await quota.remaining_async() <= quota.limit * QUOTA_RESERVE:
+            self.collector.metrics.prefetches.inc(1, "quota")
+            return False
+        self._refreshed[topic] = time.monotonic()
+        try:
+            count = await self.collector.prefetch_topic(topic, self.settings.prefetch_ttl, semaphore)
+        except Exception as exc:
+            logger.warning("'%s' 미리 수집 실패: %s", topic, exc)
+            self.collector.metrics.prefetches.inc(1, "error")
+            return False
+        self.collector.metrics.prefetches.inc(1, "ok")
+        logger.info("'%s' 미리 수집 완료 (기사 %d건)", topic, count)
+        return True
+
+    async def run(self) -> None:
+        """interval초마다 갱신할 때가 된 가장 인기 있는 주제 하나를 미리 수집한다."""
+        semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        while True:
+            await asyncio.sleep(self.interval)
+            due = self.due_topics()
+            if due:
+                await self.refresh(due[0], semaphore)
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator[PrefetchScheduler]:
+        """블록 안에서 스케줄러를 실행한다. 서버 lifespan에서 사용한다."""
+        self._task = asyncio.create_task(self.run(), name="news-prefetch")
+        logger.info("인기 주제 미리 수집 시작 (최대 %d개 주제, %.1f초 간격)", self.settings.prefetch_topics, self.interval)
+        try:
+            yield self
+        finally:
+            # 종료 중에는 바깥 취소 범위 안에서 불릴 수 있으므로 기다리지 않고 취소만 요청한다
+            self._task.cancel()
+            self._task = None
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.settings.prefetch_window
+        for topic in list(self._hits):
+            hits = self._hits[topic]
+            while hits and hits[0] < cutoff:
+                hits.popleft()
+            if not hits:
+                del self._hits[topic]
+                self._refreshed.pop(topic, None)
@@ -0,0 +1,90 @@
+"""네이버 검색 API 일일 호출 한도 집계."""
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict
+
+from .shared import SharedStore
+
+# 네이버 오픈 API 호출 한도는 한국 시간 자정에 초기화된다
+KST = timezone(timedelta(hours=9))
+# 공유 저장소의 날짜별 카운터 유지 시간(초). 하루가 지나면 새 키를 쓰므로 넉넉히 둔다
+COUNTER_TTL = 2 * 86400.0
+
+
+class DailyQuota:
+    """오늘(한국 시간) 검색 API를 몇 번 호출했는지 센다. 호출을 막지는 않고, 백그라운드 작업이 남은 양을 보고 물러선다.
+
+    shared가 주어지면 같은 API 키를 쓰는 모든 서버 복제본의 호출 수를 합쳐 센다.
+    이벤트 루프에서는 공유 저장소 호출이 루프를 막지 않도록 *_async 메서드를 쓴다.
+    """
+
+    def __init__(self, limit: int = 25000, shared: SharedStore | None = None) -> None:
+        self.limit = limit
+        self.shared = shared
+        self.used = 0
+        self._day = self._today()
+        self._lock = threading.Lock()
+
+    def consume(self, count: int = 1) -> None:
+        day = self._count_local(count)
+        if day is not None:
+            self._settle(day, self.shared.incr(f"quota:{day.isoformat()}", count, COUNTER_TTL))
+
+    async def consume_async(self, count: int = 1) -> None:
+        day = self._count_local(count)
+        if day is not None:
+            self._settle(day, await self.shared.incr_async(f"quota:{day.isoformat()}", count, COUNTER_TTL))
+
+    def remaining(self) -> int:
+        return max(self.limit - self._refresh(), 0)
+
+    async def remaining_async(self) -> int:
+        day = self._today_shared()
+        if day is None:
+            return max(self.limit - self.used, 0)
+        value = await self.shared.get_async(f"quota:{day.isoformat()}")
+        return max(self.limit - self._settle(day, value), 0)
+
+    def stats(self) -> Dict[str, int]:
+        return {"used": self._refresh(), "limit": self.limit}
+
+    def _refresh(self) -> int:
+        """공유 저장소가 있으면 다른 복제본의 호출까지 합친 오늘 호출 수를 읽어 온다."""
+        day = self._today_shared()
+        if day is None:
+            return self.used
+        return self._settle(day, self.shared.get(f"quota:{day.isoformat()}"))
+
+    def _count_local(self, count: int) -> date | None:
+        """공유 저장소가 없으면 바로 센다. 있으면 공유 카운터를 올릴 날짜를 돌려준다."""
+        with self._lock:
+            self._roll()
+            if self.shared is None:
+                self.used += count
+                return None
+            return self._day
+
+    def _today_shared(self) -> date | None:
+        """공유 저장소에서 읽어 올 오늘 날짜. 공유 저장소가 없으면 None."""
+        with self._lock:
+            self._roll()
+            return None if self.shared is None else self._day
+
+    def _settle(self, day: date, value: int | str | None) -> int:
+        """공유 저장소에서 받은 값을 그날의 호출 수로 반영한다 (그사이 날짜가 바뀌었으면 버린다)."""
+        with self._lock:
+            if self._day == day and value is not None:
+                self.used = int(value)
+            return self.used
+
+    def _roll(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(KST).date()
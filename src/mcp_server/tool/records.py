@@ -0,0 +1,30 @@
+"""수집한 기사 레코드와 도구 응답 JSON 인코딩."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import pydantic_core
+
+# orjson이 있으면 응답 인코딩에 쓰고, 없으면 pydantic_core(Rust 구현, pydantic 의존성)로 인코딩한다.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@dataclass(slots=True)
+class ArticleRecord:
+    """기사 한 건. 수집부터 응답 인코딩까지 이 레코드 하나로 전달한다."""
+
+    title: str
+    url: str
+    text: str
+    pub_date: str = ""
+
+
+def dumps(value: Any) -> str:
+    """dict·list·ArticleRecord로 이뤄진 값을 공백 없는 UTF-8 JSON 문자열로 만든다."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return pydantic_core.to_json(value).decode("utf-8")
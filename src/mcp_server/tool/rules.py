@@ -0,0 +1,127 @@
+"""언론사(호스트)별 본문 추출 규칙."""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import urllib.parse
+from collections import Counter, OrderedDict
+from typing import Dict, Mapping, Sequence, Tuple
+
+from .extract import CANDIDATE_SELECTORS, NOISE_SELECTORS, compile_selectors
+
+logger = logging.getLogger(__name__)
+
+# 트래픽이 많은 언론사의 본문 컨테이너. 맞지 않으면 공통 후보(CANDIDATE_SELECTORS)로 넘어간다.
+# 레이아웃이 바뀌면 EXTRACT_RULES_PATH(JSON)로 코드 수정 없이 덮어쓸 수 있다.
+DEFAULT_RULES: Dict[str, Dict[str, Sequence[str]]] = {
+    "n.news.naver.com": {"candidates": ("#dic_area", "#newsct_article")},
+    "m.entertain.naver.com": {"candidates": ("#dic_area",)},
+    "m.sports.naver.com": {"candidates": ("#newsEndContents", "._article_content")},
+    "sports.news.naver.com": {"candidates": ("#newsEndContents",)},
+    "yna.co.kr": {"candidates": (".story-news", "#articleWrap")},
+    "chosun.com": {"candidates": (".article-body",)},
+    "joongang.co.kr": {"candidates": ("#article_body",)},
+    "donga.com": {"candidates": (".news_view", "#article_txt")},
+    "hani.co.kr": {"candidates": (".article-text",)},
+    "khan.co.kr": {"candidates": ("#articleBody", ".art_body")},
+    "hankyung.com": {"candidates": ("#articletxt",)},
+    "mk.co.kr": {"candidates": (".news_cnt_detail_wrap",)},
+    "mt.co.kr": {"candidates": ("#textBody",)},
+    "newsis.com": {"candidates": (".viewer",)},
+    "news1.kr": {"candidates": ("#articles_detail",)},
+    "sbs.co.kr": {"candidates": (".text_area",)},
+    "kbs.co.kr": {"candidates": ("#cont_newstext",)},
+    "etnews.com": {"candidates": ("#articleBody",)},
+    "edaily.co.kr": {"candidates": (".news_body",)},
+}
+
+Selectors = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def _host(url: str) -> str:
+    host = (urllib.parse.urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class ExtractionRules:
+    """호스트별 본문 후보 셀렉터 레지스트리.
+
+    호스트 전용 후보를 먼저, 공통 후보를 나중에 시도한다. 실제로 본문을 찾은 셀렉터를 호스트별로
+    세어 두었다가 다음 페이지부터는 가장 자주 맞은 셀렉터를 가장 먼저 시도한다.
+    학습 기록과 우선순위 목록은 최근에 쓴 호스트 max_hosts개까지만 유지한다 (LRU).
+    """
+
+    def __init__(
+        self, rules: Mapping[str, Mapping[str, Sequence[str]]] = DEFAULT_RULES, max_hosts: int = 1024
+    ) -> None:
+        self._rules: Dict[str, Selectors] = {}
+        for host, rule in rules.items():
+            candidates = tuple(rule.get("candidates", ()))
+            noise = tuple(rule.get("noise", ()))
+            # 잘못된 셀렉터는 요청 처리 중이 아니라 시작 시점에 드러나도록 미리 컴파일한다
+            compile_selectors(candidates, noise)
+            self._rules[host.lower()] = (candidates, noise)
+        self.max_hosts = max_hosts
+        self._learned: OrderedDict[str, Counter[str]] = OrderedDict()
+        self._plans: OrderedDict[str, Selectors] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = "", max_hosts: int = 1024) -> ExtractionRules:
+        """기본 규칙에 path(JSON: {"host": {"candidates": [...], "noise": [...]}})의 규칙을 덧씌운다."""
+        rules: Dict[str, Mapping[str, Sequence[str]]] = dict(DEFAULT_RULES)
+        if path:
+            with open(path, encoding="utf-8") as fp:
+                rules.update(json.load(fp))
+            logger.info("본문 추출 규칙 로드: %s (%d개 호스트)", path, len(rules))
+        return cls(rules, max_hosts)
+
+    def selectors_for(self, url: str) -> Selectors:
+        """url의 호스트에 맞는 (후보 셀렉터, 노이즈 셀렉터)를 우선순위 순으로 돌려준다."""
+        host = _host(url)
+        with self._lock:
+            plan = self._plans.get(host)
+            if plan is None:
+                candidates, noise = self._rule_for(host)
+                learned = [selector for selector, _ in self._learned.get(host, Counter()).most_common()]
+                plan = (
+                    tuple(dict.fromkeys([*learned, *candidates, *CANDIDATE_SELECTORS])),
+                    NOISE_SELECTORS + noise,
+                )
+                self._plans[host] = plan
+            self._touch(self._plans, host)
+            return plan
+
+    def record(self, url: str, selector: str | None) -> None:
+        """url에서 본문을 찾은 셀렉터를 기록한다. 우선순위가 바뀌면 다음 요청부터 반영된다."""
+        if not selector:
+            return
+        host = _host(url)
+        with self._lock:
+            counter = self._learned.setdefault(host, Counter())
+            before = [name for name, _ in counter.most_common()]
+            counter[selector] += 1
+            self._touch(self._learned, host)
+            if [name for name, _ in counter.most_common()] != before:
+                self._plans.pop(host, None)
+
+    def learned(self) -> Dict[str, Dict[str, int]]:
+        """호스트별로 본문을 찾은 셀렉터와 횟수"""
+        with self._lock:
+            return {host: dict(counter) for host, counter in self._learned.items()}
+
+    def _touch(self, entries: OrderedDict[str, object], host: str) -> None:
+        # 호출하는 쪽이 _lock을 잡고 있다. 임의 호스트가 계속 들어와도 메모리가 늘지 않게 오래된 것부터 버린다
+        entries.move_to_end(host)
+        while len(entries) > self.max_hosts:
+            entries.popitem(last=False)
+
+    def _rule_for(self, host: str) -> Selectors:
+        # m.sports.naver.com -> sports.naver.com -> naver.com 순으로 가장 구체적인 규칙을 찾는다
+        parts = host.split(".")
+        for index in range(len(parts) - 1):
+            rule = self._rules.get(".".join(parts[index:]))
+            if rule is not None:
+                return rule
+        return (), ()
@@ -0,0 +1,301 @@
+"""여러 서버 복제본이 캐시·호출 한도·기사 수집 작업을 나눠 쓰기 위한 공유 저장소."""
+from __future__ import annotations
+
+import abc
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import urllib.parse
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 같은 Redis를 다른 서비스와 함께 쓰더라도 키가 겹치지 않도록 붙이는 접두사
+KEY_PREFIX = "news:"
+
+
+class SharedStore(abc.ABC):
+    """만료 시간이 있는 문자열 키-값 저장소. 모든 연산은 복제본 사이에서 원자적이어야 한다.
+
+    SQLite·Redis 호출은 블로킹이므로 이벤트 루프에서는 *_async 메서드를 쓴다.
+    기본 구현은 동기 메서드를 스레드에서 실행한다.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> str | None: ...
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str, ttl: float) -> None: ...
+
+    @abc.abstractmethod
+    def add(self, key: str, value: str, ttl: float) -> bool:
+        """키가 없을 때만 저장하고 저장했는지 돌려준다 (작업 선점에 사용)."""
+
+    @abc.abstractmethod
+    def incr(self, key: str, amount: int, ttl: float) -> int:
+        """정수 값을 amount만큼 늘리고 늘린 값을 돌려준다. 키가 새로 생기면 ttl초 뒤 만료된다."""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+    async def get_async(self, key: str) -> str | None:
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: str, ttl: float) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def add_async(self, key: str, value: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self.add, key, value, ttl)
+
+    async def incr_async(self, key: str, amount: int, ttl: float) -> int:
+        return await asyncio.to_thread(self.incr, key, amount, ttl)
+
+    async def delete_async(self, key: str) -> None:
+        await asyncio.to_thread(self.delete, key)
+
+
+class MemoryStore(SharedStore):
+    """한 프로세스 안에서만 공유되는 구현 (테스트와 단일 복제본용)"""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            return self._live(key)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def add(self, key: str, value: str, ttl: float) -> bool:
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._entries[key] = (time.monotonic() + ttl, value)
+            return True
+
+    def incr(self, key: str, amount: int, ttl: float) -> int:
+        with self._lock:
+            current = self._live(key)
+            if current is None:
+                self._entries[key] = (time.monotonic() + ttl, str(amount))
+                return amount
+            value = int(current) + amount
+            self._entries[key] = (self._entries[key][0], str(value))
+            return value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    # 메모리 연산은 막히지 않으므로 스레드를 거치지 않고 바로 실행한다
+    async def get_async(self, key: str) -> str | None:
+        return self.get(key)
+
+    async def set_async(self, key: str, value: str, ttl: float) -> None:
+        self.set(key, value, ttl)
+
+    async def add_async(self, key: str, value: str, ttl: float) -> bool:
+        return self.add(key, value, ttl)
+
+    async def incr_async(self, key: str, amount: int, ttl: float) -> int:
+        return self.incr(key, amount, ttl)
+
+    async def delete_async(self, key: str) -> None:
+        self.delete(key)
+
+    def _live(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del self._entries[key]
+            return None
+        return entry[1]
+
+
+class SqliteStore(SharedStore):
+    """같은 호스트(또는 같은 볼륨)의 여러 프로세스가 공유하는 SQLite 구현"""
+
+    def __init__(self, path: str) -> None:
+        # 문장 하나가 곧 트랜잭션이 되도록 autocommit으로 열고, 다른 프로세스가 쓰는 중이면 잠시 기다린다
+        self._db = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS shared (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM shared WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO shared (key, value, expires_at) VALUES (?, ?, ?)", (key, value, now + ttl)
+            )
+            self._prune(now)
+
+    def add(self, key: str, value: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO shared (key, value, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at"
+                " WHERE shared.expires_at <= ?",
+                (key, value, now + ttl, now),
+            )
+            return cursor.rowcount == 1
+
+    def incr(self, key: str, amount: int, ttl: float) -> int:
+        now = time.time()
+        with self._lock:
+            (value,) = self._db.execute(
+                "INSERT INTO shared (key, value, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET"
+                "  value = CASE WHEN shared.expires_at <= ? THEN excluded.value"
+                "  ELSE CAST(shared.value AS INTEGER) + excluded.value END,"
+                "  expires_at = CASE WHEN shared.expires_at <= ? THEN excluded.expires_at ELSE shared.expires_at END"
+                " RETURNING value",
+                (key, amount, now + ttl, now, now),
+            ).fetchone()
+        return int(value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM shared WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _prune(self, now: float) -> None:
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            self._db.execute("DELETE FROM shared WHERE expires_at <= ?", (now,))
+
+
+class RedisStore(SharedStore):
+    """Redis(또는 호환 서버) 구현. 저장소에 닿지 못하면 공유 없이 동작하도록 물러선다."""
+
+    def __init__(self, url: str) -> None:
+        # redis 패키지는 redis:// 저장소를 쓸 때만 불러온다 (서버 기동 시간 단축)
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("SHARED_STORE_URL에 redis://를 쓰려면 redis 패키지를 설치하세요: uv pip install redis") from None
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(url, decode_responses=True, socket_timeout=1.0, socket_connect_timeout=1.0)
+
+    def get(self, key: str) -> str | None:
+        try:
+            return self._client.get(key)
+        except self._errors as exc:
+            logger.warning("공유 저장소 조회 실패: %s", exc)
+            return None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        try:
+            self._client.set(key, value, px=max(int(ttl * 1000), 1))
+        except self._errors as exc:
+            logger.warning("공유 저장소 저장 실패: %s", exc)
+
+    def add(self, key: str, value: str, ttl: float) -> bool:
+        try:
+            return bool(self._client.set(key, value, px=max(int(ttl * 1000), 1), nx=True))
+        except self._errors as exc:
+            # 선점 여부를 알 수 없으면 직접 처리한다 (중복 요청이 작업 유실보다 낫다)
+            logger.warning("공유 저장소 선점 실패: %s", exc)
+            return True
+
+    def incr(self, key: str, amount: int, ttl: float) -> int:
+        try:
+            value = self._client.incrby(key, amount)
+            if value == amount:
+                self._client.pexpire(key, max(int(ttl * 1000), 1))
+            return int(value)
+        except self._errors as exc:
+            logger.warning("공유 저장소 카운터 갱신 실패: %s", exc)
+            return 0
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(key)
+        except self._errors as exc:
+            logger.warning("공유 저장소 삭제 실패: %s", exc)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class PrefixedStore(SharedStore):
+    """모든 키 앞에 KEY_PREFIX를 붙인다."""
+
+    def __init__(self, store: SharedStore, prefix: str = KEY_PREFIX) -> None:
+        self.store = store
+        self.prefix = prefix
+
+    def get(self, key: str) -> str | None:
+        return self.store.get(self.prefix + key)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.store.set(self.prefix + key, value, ttl)
+
+    def add(self, key: str, value: str, ttl: float) -> bool:
+        return self.store.add(self.prefix + key, value, ttl)
+
+    def incr(self, key: str, amount: int, ttl: float) -> int:
+        return self.store.incr(self.prefix + key, amount, ttl)
+
+    def delete(self, key: str) -> None:
+        self.store.delete(self.prefix + key)
+
+    def close(self) -> None:
+        self.store.close()
+
+    async def get_async(self, key: str) -> str | None:
+        return await self.store.get_async(self.prefix + key)
+
+    async def set_async(self, key: str, value: str, ttl: float) -> None:
+        await self.store.set_async(self.prefix + key, value, ttl)
+
+    async def add_async(self, key: str, value: str, ttl: float) -> bool:
+        return await self.store.add_async(self.prefix + key, value, ttl)
+
+    async def incr_async(self, key: str, amount: int, ttl: float) -> int:
+        return await self.store.incr_async(self.prefix + key, amount, ttl)
+
+    async def delete_async(self, key: str) -> None:
+        await self.store.delete_async(self.prefix + key)
+
+
+def open_store(url: str) -> SharedStore | None:
+    """SHARED_STORE_URL로 공유 저장소를 연다. 비어 있으면 None(복제본마다 따로 캐시).
+
+    memory:// (프로세스 내부), sqlite:///경로 (같은 호스트의 여러 프로세스), redis://호스트:포트/DB
+    """
+    if not url:
+        return None
+    scheme = urllib.parse.urlsplit(url).scheme
+    if scheme == "memory":
+        store: SharedStore = MemoryStore()
+    elif scheme == "sqlite":
+        store = SqliteStore(url[len("sqlite:///"):] or ":memory:")
+    elif scheme in ("redis", "rediss", "unix"):
+        store = RedisStore(url)
+    else:
+        raise ValueError(f"지원하지 않는 공유 저장소 URL: {url}")
+    return PrefixedStore(store)
@@ -191,29 +191,73 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import re
+import multiprocessing
+import os
+import socket
+import threading
+import time
 import urllib.parse
-import urllib.request
-from typing import Dict, List
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Dict, List
 
-import requests
-from bs4 import BeautifulSoup, Tag
-from fastmcp import FastMCP
-from pydantic import BaseModel
+import httpx
+from fastmcp import Context, FastMCP
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
 
 from config import Settings
 
+from .cache import ArticleCache, SearchCache, normalize_url
+from .cursor import CursorStore, TopicCursor, parse_pub_date
+from .dedup import DuplicateIndex
+from .extract import ArticleStream, parse_article, parse_article_timed
+from .host_policy import CircuitOpen
+from .http_client import HttpClients
+from .index import ArticleIndex
+from .metrics import CONTENT_TYPE, Metrics
+from .normalize import clean_markup
+from .packing import pack_articles
+from .prefetch import PrefetchScheduler
+from .quota import DailyQuota
+from .records import ArticleRecord, dumps
+from .rules import ExtractionRules
+from .shared import open_store
+
 logger = logging.getLogger(__name__)
 
-class Article(BaseModel):
-    text: str
-    title: str
-    url: str
+def _available_cpus() -> int:
+    """이 프로세스가 실제로 쓸 수 있는 CPU 수.
 
-class NewsCollectionResult(BaseModel):
-    articles: list[Article]
+    os.cpu_count()는 호스트 전체 코어 수를 돌려주므로, CPU 친화도와 컨테이너(cgroup v2/v1)의 CPU 할당량을 반영한다.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    quota = period = None
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            fields = f.read().split()
+        if fields[0] != "max":
+            quota, period = int(fields[0]), int(fields[1])
+    except (OSError, ValueError, IndexError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                quota = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+        except (OSError, ValueError):
+            pass
+    if quota is not None and period and quota > 0:
+        cpus = min(cpus, max(quota // period, 1))
+    return max(cpus, 1)
 
 class NewsCollector:
     """네이버 뉴스 검색 및 기사 본문 추출을 담당하는 헬퍼 클래스."""
@@ -222,13 +266,142 @@ class NewsCollector:
         if not settings.client_id or not settings.client_secret:
             raise RuntimeError("NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET 환경 변수를 설정하세요.")
         self.settings = settings
-        self.session = requests.Session()
+        self.metrics = Metrics()
+        # 검색 API와 기사 수집이 같은 연결 풀(keep-alive, HTTP/2)을 공유한다
         # [강화] 헤더 추가 (차단 방지)
-        self.session.headers.update({
+        self.http = HttpClients(settings, {
             "User-Agent": self.settings.user_agent,
             "Referer": "https://news.naver.com/",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
-        })
+        }, self.metrics)
+        # 여러 복제본을 띄울 때 캐시·호출 한도·기사 수집 선점을 나눠 쓰는 저장소 (없으면 복제본마다 따로 둔다)
+        self.shared = open_store(settings.shared_store_url)
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.article_cache = ArticleCache(
+            max_entries=settings.article_cache_size,
+            ttl=settings.article_cache_ttl,
+            db_path=settings.article_cache_path,
+            max_disk_entries=settings.article_cache_disk_entries,
+            shared=self.shared,
+        )
+        self.search_cache = SearchCache(
+            ttl=settings.search_cache_ttl, max_entries=settings.search_cache_size, shared=self.shared
+        )
+        self.index = ArticleIndex(db_path=settings.article_index_path, max_entries=settings.article_index_size)
+        self.quota = DailyQuota(settings.naver_daily_quota, shared=self.shared)
+        self.cursors = CursorStore(max_entries=settings.cursor_size)
+        self.duplicates = DuplicateIndex(max_entries=settings.dedup_index_size, threshold=settings.dedup_threshold)
+        self.rules = ExtractionRules.load(settings.extract_rules_path, settings.extract_rules_hosts)
+        self._parse_executor: Executor | None = None
+        self._executor_lock = threading.Lock()
+        # 파싱 풀 준비가 끝났는지 여부 (/ready가 참조한다)
+        self.ready = False
+        self.metrics.add_source(
+            "news_article_cache_total", "Article cache lookups by result", "result",
+            lambda: {key: value for key, value in self.article_cache.stats().items() if key != "entries"},
+        )
+        self.metrics.add_source(
+            "news_search_cache_total", "Search cache lookups by result", "result",
+            lambda: {key: value for key, value in self.search_cache.stats().items() if key != "entries"},
+        )
+
+    def close(self) -> None:
+        """HTTP 클라이언트, 캐시, 색인, 파싱 풀을 정리한다."""
+        self.http.close()
+        self.article_cache.close()
+        self.index.close()
+        if self.shared is not None:
+            self.shared.close()
+        with self._executor_lock:
+            executor, self._parse_executor = self._parse_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_parse_executor(self) -> Executor | None:
+        """설정에 맞는 파싱 실행기를 처음 사용할 때 만든다. inline이면 None."""
+        # 백그라운드 예열과 첫 요청이 동시에 만들더라도 풀은 하나만 생기게 한다
+        with self._executor_lock:
+            if self._parse_executor is None:
+                mode = self.settings.parse_executor
+                workers = self.settings.parse_workers or _available_cpus()
+                if mode == "process":
+                    # 서버 프로세스는 스레드를 쓰므로 직접 fork하지 않고, 추출 모듈만 미리 올린
+                    # forkserver에서 워커를 복제한다 (무거운 import 비용은 한 번만 든다)
+                    context = multiprocessing.get_context("forkserver")
+                    preload = ["tool.extract"]
+                    if self.settings.extract_backend == "soup":
+                        preload.append("bs4")
+                    context.set_forkserver_preload(preload)
+                    self._parse_executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                elif mode == "thread":
+                    self._parse_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+                elif mode != "inline":
+                    raise ValueError(f"알 수 없는 parse_executor 값입니다: {mode!r}")
+            return self._parse_executor
+
+    def _discard_parse_executor(self, broken: Executor) -> None:
+        """손상된 풀을 버리고 정리한다. 다음 _get_parse_executor 호출이 새 풀을 만든다.
+
+        동시에 실패한 다른 요청이 이미 새 풀로 바꿨다면 그 풀은 건드리지 않는다.
+        """
+        with self._executor_lock:
+            if self._parse_executor is not broken:
+                return
+            self._parse_executor = None
+        logger.warning("파싱 프로세스 풀이 손상되어 다시 생성합니다.")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self) -> None:
+        """파싱 프로세스 풀 워커를 미리 띄워 첫 요청이 워커 기동 시간을 기다리지 않게 한다.
+
+        모든 워커가 빈 문서를 한 번 처리할 때까지 기다린 뒤 ready를 켠다.
+        스레드 풀·inline은 기동 비용이 없으므로 풀을 만들지 않고 바로 준비 완료로 본다.
+        """
+        if self.settings.parse_executor == "process":
+            executor = self._get_parse_executor()
+            futures = [
+                executor.submit(parse_article, b"", "utf-8")
+                for _ in range(self.settings.parse_workers or _available_cpus())
+            ]
+            for future in futures:
+                future.result()
+        self.ready = True
+
+    async def warm_up_async(self) -> None:
+        """warm_up을 이벤트 루프 밖에서 실행한다 (서버는 그동안에도 요청을 받는다)."""
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.warm_up)
+        except Exception as exc:
+            # 예열에 실패해도 요청 처리 중에 풀을 다시 만들 수 있으므로 서버는 계속 띄운다
+            logger.exception("파싱 풀 예열 실패", exc_info=exc)
+            self.ready = True
+            return
+        logger.info("파싱 풀 준비 완료 (%.2f초)", time.perf_counter() - started)
+
+    async def parse_article_async(self, content: bytes, charset: str | None, url: str) -> str:
+        """디코딩과 본문 추출(CPU 작업)을 이벤트 루프 밖의 풀에서 수행한다."""
+        backend = self.settings.extract_backend
+        candidates, noise = self.rules.selectors_for(url)
+        executor = self._get_parse_executor()
+        if executor is None:
+            (text, selector), decode_time, parse_time = parse_article_timed(content, charset, backend, candidates, noise)
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                (text, selector), decode_time, parse_time = await loop.run_in_executor(
+                    executor, parse_article_timed, content, charset, backend, candidates, noise
+                )
+            except BrokenProcessPool:
+                # 워커가 비정상 종료된 경우 풀을 새로 만들고 이번 요청은 직접 처리
+                self._discard_parse_executor(executor)
+                (text, selector), decode_time, parse_time = parse_article_timed(
+                    content, charset, backend, candidates, noise
+                )
+        self.metrics.observe_stage("decode", decode_time)
+        self.metrics.observe_stage("parse", parse_time)
+        self.rules.record(url, selector)
+        return text
 
     def fetch_naver_news_items(self, topic: str, display: int | None = None, sort: str | None = None) -> List[Dict[str, str]]:
         """네이버 뉴스 검색 API 호출"""
@@ -237,70 +410,210 @@ class NewsCollector:
         sort = sort or self.settings.default_sort
         url = f"{self.settings.search_url}?query={query}&display={display}&sort={sort}"
 
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", self.settings.client_id)
-        request.add_header("X-Naver-Client-Secret", self.settings.client_secret)
+        try:
+            response = self.http.get_sync(url, stage="search", quota=self.quota, headers=self._search_headers())
+            if response.status_code != 200:
+                raise RuntimeError(f"API Error Code: {response.status_code}")
+            payload = json.loads(response.content.decode("utf-8"))
+        except Exception as exc:
+            raise RuntimeError(f"네이버 뉴스 검색 API 호출 실패: {exc}") from exc
+
+        return self._parse_search_items(payload)
+
+    async def _search_async(self, topic: str, display: int, sort: str) -> List[Dict[str, str]]:
+        query = urllib.parse.quote(topic)
+        url = f"{self.settings.search_url}?query={query}&display={display}&sort={sort}"
 
         try:
-            with urllib.request.urlopen(request, timeout=self.settings.request_timeout) as response:
-                if response.getcode() != 200:
-                    raise RuntimeError(f"API Error Code: {response.getcode()}")
-                payload = json.loads(response.read().decode("utf-8"))
+            response = await self.http.get(url, stage="search", quota=self.quota, headers=self._search_headers())
+            if response.status_code != 200:
+                raise RuntimeError(f"API Error Code: {response.status_code}")
+            payload = json.loads(response.content.decode("utf-8"))
         except Exception as exc:
             raise RuntimeError(f"네이버 뉴스 검색 API 호출 실패: {exc}") from exc
 
+        return self._parse_search_items(payload)
+
+    def _search_headers(self) -> Dict[str, str]:
+        return {
+            "X-Naver-Client-Id": self.settings.client_id,
+            "X-Naver-Client-Secret": self.settings.client_secret,
+        }
+
+    @staticmethod
+    def _parse_search_items(payload: Dict[str, Any]) -> List[Dict[str, str]]:
         results = []
         for item in payload.get("items", []):
             results.append({
-                "title": re.sub(r"<.*?>|&quot;", "", item.get("title", "")), # HTML 엔티티 제거 강화
+                # 강조 태그를 지우고 &quot;, &amp; 등 HTML 엔티티를 모두 푼다
+                "title": clean_markup(item.get("title", "")),
                 "url": item.get("originallink") or item.get("link") or "",
+                "description": clean_markup(item.get("description", "")),
+                "pubDate": item.get("pubDate", ""),
             })
         return results
 
+    async def fetch_naver_news_items_async(
+        self, topic: str, display: int | None = None, sort: str | None = None
+    ) -> List[Dict[str, str]]:
+        """검색 결과 캐시를 거쳐 네이버 뉴스 검색 API를 호출한다. 동일한 요청이 진행 중이면 합친다."""
+        display = display or self.settings.default_display
+        sort = sort or self.settings.default_sort
+        key = (topic.strip(), display, sort)
+        return await self.search_cache.get_or_fetch(key, lambda: self._search_async(topic, display, sort))
+
+    async def prefetch_topic(self, topic: str, ttl: float, semaphore: asyncio.Semaphore) -> int:
+        """collect_news가 쓸 검색 결과와 기사 본문을 미리 받아 캐시를 데운다. 캐시에 담긴 기사 수를 돌려준다.
+
+        검색 결과는 캐시에 있더라도 새로 받아 ttl초 동안 유지한다.
+        """
+        limit = self.settings.max_articles
+        display = self._search_count(None, limit)
+        sort = self.settings.default_sort
+        items = await self._search_async(topic, display, sort)
+        await self.search_cache.set_async((topic.strip(), display, sort), items, ttl=ttl)
+
+        deadline_at = asyncio.get_running_loop().time() + self.settings.collect_deadline
+        articles = await self._collect_items(topic, items, limit, deadline_at, semaphore)
+        return len(articles)
+
     def fetch_article_text(self, url: str) -> str:
         """기사 상세 페이지 본문 추출"""
         if not url: return ""
 
+        cached = self.article_cache.get(url)
+        if cached is not None:
+            self.metrics.fetches.inc(1, "cached")
+            return cached
+
         try:
-            response = self.session.get(url, timeout=self.settings.request_timeout, allow_redirects=True)
-            response.raise_for_status()
-        except requests.RequestException:
+            with self.http.stream_sync(url) as download:
+                download.response.raise_for_status()
+                final_url = str(download.response.url)
+                reader = self._article_stream(final_url, download.response.charset_encoding)
+                for chunk in download.chunks_sync():
+                    if reader.feed(chunk):
+                        break
+        except CircuitOpen:
+            self.metrics.fetches.inc(1, "skipped")
+            return ""
+        except httpx.HTTPError:
+            self.metrics.fetches.inc(1, "error")
             return ""
 
-        if not response.encoding or response.encoding.lower() == "iso-8859-1":
-            response.encoding = response.apparent_encoding or "utf-8"
+        text, selector = reader.close()
+        self._observe_stream(reader)
+        self.rules.record(final_url, selector)
+        self.metrics.fetches.inc(1, "ok" if text else "empty")
+        self.article_cache.set(url, text)
+        return text
 
-        soup = BeautifulSoup(response.text, "html.parser")
+    async def fetch_article_text_async(self, url: str) -> str:
+        """fetch_article_text의 비동기(httpx) 버전.
 
-        noise_selectors = (
-            "script", "style", "noscript", "iframe", "svg", "form",
-            "header", "footer", "nav", "aside", "button",
-            "[class*='ad']", "[id*='ad']", ".sns", ".share", ".copyright", 
-            ".related", ".recommend", ".banner", ".byline", ".reporter_area",
-            ".img_desc"
-        )
-        for selector in noise_selectors:
-            for tag in soup.select(selector):
-                tag.decompose()
+        공유 저장소가 있으면 URL을 선점한 복제본 하나만 기사를 받고, 나머지는 공유 캐시에 올라온 본문을 쓴다.
+        """
+        if not url: return ""
+
+        cached = await self.article_cache.get_async(url)
+        if cached is not None:
+            self.metrics.fetches.inc(1, "cached")
+            return cached
+
+        if self.shared is None:
+            return await self._download_article_async(url)
+        lease = f"fetch:{normalize_url(url)}"
+        if not await self.shared.add_async(lease, self.instance_id, self.settings.fetch_lease):
+            self.metrics.fetches.inc(1, "peer")
+            return await self._wait_for_peer(url, lease)
+        try:
+            text = await self._download_article_async(url)
+            if not text:
+                # 빈 결과도 알려야 기다리던 복제본이 선점 만료까지 기다렸다가 같은 페이지를 다시 받지 않는다
+                await self.article_cache.mark_empty_async(url, self.settings.fetch_lease)
+            return text
+        finally:
+            await self.shared.delete_async(lease)
+
+    async def _wait_for_peer(self, url: str, lease: str) -> str:
+        """다른 복제본이 받는 중인 기사의 본문이 공유 캐시에 올라올 때까지 기다린다."""
+        while True:
+            await asyncio.sleep(self.settings.fetch_lease_poll)
+            text = await self.article_cache.get_shared_async(url)
+            if text is not None:
+                return text
+            if await self.shared.get_async(lease) is None:
+                # 선점이 풀렸는데 본문이 없으면 그 복제본이 실패했거나 멈춘 것이므로 다시 선점을 시도한다
+                text = await self.article_cache.get_shared_async(url)
+                return text if text is not None else await self.fetch_article_text_async(url)
+
+    async def _download_article_async(self, url: str) -> str:
+        # 점진 추출(fast 백엔드)은 가벼우므로 받는 대로 처리해 본문이 확정되면 수신을 멈춘다. 추출기 상태는
+        # 다른 프로세스로 넘길 수 없으므로 스레드 풀일 때만 풀에 맡기고, 그 밖에는 이벤트 루프에서 처리한다.
+        # 프로세스 풀은 다 받은 문서를 한 번에 추출할 때(soup 백엔드, stream_parse 끔)만 쓴다
+        executor = self._get_parse_executor()
+        feeder = executor if isinstance(executor, ThreadPoolExecutor) else None
+        loop = asyncio.get_running_loop()
+        try:
+            async with self.http.stream(url) as download:
+                download.response.raise_for_status()
+                final_url = str(download.response.url)
+                reader = self._article_stream(
+                    final_url, download.response.charset_encoding, incremental=self.settings.stream_parse
+                )
+                async with aclosing(download.chunks()) as chunks:
+                    async for chunk in chunks:
+                        if feeder is None or not reader.incremental:
+                            done = reader.feed(chunk)
+                        else:
+                            done = await loop.run_in_executor(feeder, reader.feed, chunk)
+                        if done:
+                            break
+        except CircuitOpen:
+            self.metrics.fetches.inc(1, "skipped")
+            return ""
+        except httpx.HTTPError:
+            self.metrics.fetches.inc(1, "error")
+            return ""
 
-        candidates = (
-            "#newsct_article", "#dic_area", "#articeBody", "#newsEndContents", # 스포츠 뉴스 추가
-            ".newsct_article", ".article_body", ".view_cont", "article"
+        if reader.incremental:
+            if feeder is None:
+                text, selector = reader.close()
+            else:
+                text, selector = await loop.run_in_executor(feeder, reader.close)
+            self._observe_stream(reader)
+            self.rules.record(final_url, selector)
+        else:
+            # 본문은 다 받아 두었으므로 디코딩과 추출은 파싱 풀에서 처리한다
+            text = await self.parse_article_async(reader.content, reader.charset, final_url)
+        self.metrics.fetches.inc(1, "ok" if text else "empty")
+        await self.article_cache.set_async(url, text)
+        return text
+
+    def _article_stream(self, url: str, charset: str | None, incremental: bool = True) -> ArticleStream:
+        candidates, noise = self.rules.selectors_for(url)
+        return ArticleStream(
+            charset,
+            self.settings.extract_backend,
+            candidates,
+            noise,
+            max_bytes=self.settings.max_article_bytes,
+            incremental=incremental,
         )
-        
-        for selector in candidates:
-            element = soup.select_one(selector)
-            if element:
-                text = element.get_text(" ", strip=True)
-                # [중요 수정] 200자 -> 50자로 완화 (짧은 기사 허용)
-                if text and len(text) > 50:
-                    return text
-        return ""
-
-    def collect_articles(self, topic: str, display: int | None = None) -> List[Dict[str, str]]:
+
+    def _observe_stream(self, reader: ArticleStream) -> None:
+        self.metrics.observe_stage("decode", reader.decode_seconds)
+        self.metrics.observe_stage("parse", reader.parse_seconds)
+        if reader.truncated:
+            self.metrics.stream_stops.inc(1, "max_bytes")
+        elif reader.done:
+            self.metrics.stream_stops.inc(1, "extracted")
+
+    def collect_articles(self, topic: str, display: int | None = None) -> List[ArticleRecord]:
         count = display or 5 # 기본값 5개로 증가
-        items = self.fetch_naver_news_items(topic, display=count)
-        articles: List[Dict[str, str]] = []
+        items = self._skip_duplicates(self.fetch_naver_news_items(topic, display=count))
+        articles: List[ArticleRecord] = []
+        clusters: set[str] = set()
         
         for item in items:
             try:
@@ -308,30 +621,468 @@ class NewsCollector:
                 # [필터링] 공백 포함 50자 미만 제외
                 if not text or len(text.strip()) < 50:
                     continue
+                # [필터링] 앞선 기사와 본문이 거의 같은 기사(통신사 기사 전재 등) 제외
+                with self.metrics.stage("dedup"):
+                    cluster = self.duplicates.add(item["url"], text)
+                if cluster in clusters:
+                    self.metrics.duplicates.inc(1, "near")
+                    continue
+                clusters.add(cluster)
                 
-                articles.append({
-                    "title": item["title"],
-                    "url": item["url"],
-                    "text": text,
-                })
+                articles.append(ArticleRecord(item["title"], item["url"], text, item.get("pubDate", "")))
             except Exception:
                 continue
+        with self.metrics.stage("index"):
+            self.index.add(articles)
+        return articles
+
+    async def collect_articles_async(
+        self,
+        topic: str,
+        display: int | None = None,
+        deadline: float | None = None,
+        limit: int | None = None,
+        on_article: Callable[[ArticleRecord], Awaitable[None]] | None = None,
+    ) -> List[ArticleRecord]:
+        """기사 본문을 동시에 수집한다. 전체 마감 시간 안에 끝난 기사만 돌려준다.
+
+        limit이 주어지면 검색 결과를 여유 있게 요청하고, 유효 기사 limit건이 모이는 즉시
+        남은 요청을 취소한다. on_article이 주어지면 유효 기사를 추출되는 순서대로 먼저 넘겨준다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or self.settings.collect_deadline)
+
+        items = await self._search_before(
+            deadline_at, self.fetch_naver_news_items_async(topic, self._search_count(display, limit))
+        )
+        semaphore = asyncio.Semaphore(self.settings.max_concurrency)
+        return await self._collect_items(topic, items, limit, deadline_at, semaphore, on_article)
+
+    async def collect_new_articles_async(
+        self,
+        topic: str,
+        cursor: TopicCursor,
+        deadline: float | None = None,
+        limit: int | None = None,
+    ) -> List[ArticleRecord]:
+        """커서 이후 새로 올라온 기사만 최신순 검색으로 수집하고 커서를 전진시킨다.
+
+        이미 전달한 기사와 마지막으로 전달한 기사보다 오래된 기사는 본문을 받지 않고 건너뛴다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or self.settings.collect_deadline)
+
+        items = await self._search_before(
+            deadline_at, self.fetch_naver_news_items_async(topic, self._search_count(None, limit), sort="date")
+        )
+        fresh = [
+            item for item in items
+            if item["url"] and cursor.is_new(normalize_url(item["url"]), parse_pub_date(item["pubDate"]))
+        ]
+        semaphore = asyncio.Semaphore(self.settings.max_concurrency)
+        articles = await self._collect_items(topic, fresh, limit, deadline_at, semaphore)
+        for article in articles:
+            cursor.advance(normalize_url(article.url), parse_pub_date(article.pub_date))
+        logger.info("'%s' 새 기사 후보 %d/%d건, 전달 %d건", topic, len(fresh), len(items), len(articles))
         return articles
 
-def register_data_tools(mcp: FastMCP, settings: Settings) -> None:
-    """도구 등록"""
+    async def collect_topics_async(
+        self,
+        topics: List[str],
+        deadline: float | None = None,
+        limit: int | None = None,
+    ) -> Dict[str, List[ArticleRecord]]:
+        """여러 주제를 한 번에 수집한다. 검색과 본문 수집을 주제 사이에서도 동시에 진행한다.
+
+        여러 주제의 검색 결과에 같은 기사가 있으면 한 번만 받고, 받은 본문을 먼저 받아들인 주제에만 넣는다.
+        그 주제가 이미 다 모아 기사를 쓰지 않으면 다른 주제가 가져가고, 못 가져간 주제는 다음 후보로 넘어간다.
+        동시 요청 수(max_concurrency)와 마감 시간은 배치 전체가 공유한다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or self.settings.collect_deadline)
+        count = self._search_count(None, limit)
+
+        searches = await asyncio.gather(
+            *(self._search_before(deadline_at, self.fetch_naver_news_items_async(topic, count)) for topic in topics),
+            return_exceptions=True,
+        )
+        candidates: Dict[str, List[Dict[str, str]]] = {}
+        for topic, items in zip(topics, searches):
+            if isinstance(items, BaseException):
+                logger.warning("'%s' 검색 실패: %s", topic, items)
+                items = []
+            candidates[topic] = items
+
+        semaphore = asyncio.Semaphore(self.settings.max_concurrency)
+        inflight: Dict[str, asyncio.Task] = {}
+        # 정규화한 URL -> 그 기사를 받아들인 주제
+        claims: Dict[str, str] = {}
+
+        async def fetch_limited(url: str) -> str:
+            async with semaphore:
+                return await self.fetch_article_text_async(url)
+
+        def fetch_once(url: str) -> Awaitable[str]:
+            key = normalize_url(url)
+            task = inflight.get(key)
+            if task is None:
+                task = inflight[key] = asyncio.ensure_future(fetch_limited(url))
+            # 한 주제가 다 모아 요청을 취소해도, 같은 기사를 기다리는 다른 주제를 위해 받기는 계속한다
+            return asyncio.shield(task)
+
+        try:
+            collected = await asyncio.gather(*(
+                self._collect_items(topic, items, limit, deadline_at, semaphore, fetch_text=fetch_once, claims=claims)
+                for topic, items in candidates.items()
+            ))
+        finally:
+            leftover = [task for task in inflight.values() if not task.done()]
+            for task in leftover:
+                task.cancel()
+            await asyncio.gather(*leftover, return_exceptions=True)
+        return dict(zip(candidates, collected))
+
+    async def search_articles_async(self, query: str, limit: int | None = None) -> List[ArticleRecord]:
+        """로컬 색인에서 기사를 찾는다.
+
+        최근 article_index_max_age초 안에 색인된 결과가 article_index_min_results건보다 적으면 실시간으로 수집해
+        앞에 두고, 모자란 자리는 색인 결과로 채운다.
+        """
+        limit = limit or self.settings.max_articles
+        with self.metrics.stage("index"):
+            articles = self.index.search(query, limit, max_age=self.settings.article_index_max_age)
+        if len(articles) >= min(self.settings.article_index_min_results, limit):
+            self.metrics.index_queries.inc(1, "hit")
+            return articles
+        self.metrics.index_queries.inc(1, "live")
+        live = await self.collect_articles_async(query, limit=limit)
+        delivered = {normalize_url(article.url) for article in live}
+        return (live + [article for article in articles if normalize_url(article.url) not in delivered])[:limit]
+
+    def pack_results(
+        self, articles: List[ArticleRecord], budget: int | None = None, query: str = ""
+    ) -> List[ArticleRecord]:
+        """응답 크기 예산(기본 result_budget_bytes)에 맞춰 기사 본문을 정리하고 줄인다.
+
+        예산이 모자라면 query(주제·검색어)와 관련도가 높은 기사부터 남긴다.
+        """
+        budget = self.settings.result_budget_bytes if budget is None else budget
+        packed = pack_articles(articles, budget, self.settings.min_article_bytes, query)
+        self.metrics.result_bytes.inc(sum(len(article.text.encode("utf-8")) for article in articles), "raw")
+        self.metrics.result_bytes.inc(sum(len(article.text.encode("utf-8")) for article in packed), "packed")
+        return packed
+
+    def _skip_duplicates(self, items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """본문을 받기 전에 중복 기사를 걸러낸다.
+
+        정규화한 URL이 같은 기사와, 이전 요청에서 앞선 순위 기사와 같은 중복 묶음으로 판별된 기사는 받지 않는다.
+        """
+        urls: set[str] = set()
+        clusters: set[str] = set()
+        kept: List[Dict[str, str]] = []
+        for item in items:
+            key = normalize_url(item["url"]) if item["url"] else ""
+            cluster = self.duplicates.cluster_of(item["url"]) if item["url"] else None
+            if key in urls:
+                self.metrics.duplicates.inc(1, "url")
+                continue
+            if cluster is not None and cluster in clusters:
+                self.metrics.duplicates.inc(1, "known")
+                continue
+            urls.add(key)
+            # 색인에 없는 기사는 자기 URL이 중복 묶음 이름이 된다
+            clusters.add(cluster or key)
+            kept.append(item)
+        return kept
+
+    async def _search_before(
+        self, deadline_at: float, search: Awaitable[List[Dict[str, str]]]
+    ) -> List[Dict[str, str]]:
+        """검색도 수집 마감 시간 안에 끝나야 한다. 넘기면 검색 결과가 없는 것으로 본다.
+
+        캐시가 합친 검색 요청은 shield되어 있으므로 여기서 기다리기를 그만두어도 계속 진행되어 캐시에 남는다.
+        """
+        remaining = deadline_at - asyncio.get_running_loop().time()
+        try:
+            return await asyncio.wait_for(search, max(remaining, 0))
+        except asyncio.TimeoutError:
+            logger.warning("검색이 마감 시간(%.1f초) 안에 끝나지 않아 수집을 건너뜁니다.", max(remaining, 0))
+            return []
+
+    def _search_count(self, display: int | None, limit: int | None) -> int:
+        if display:
+            return display
+        if limit:
+            # 본문 추출 실패분을 감안해 검색 결과를 더 받아 둔다 (네이버 API 최대 100건)
+            return min(limit * self.settings.search_overfetch, 100)
+        return 5
+
+    async def _collect_items(
+        self,
+        topic: str,
+        items: List[Dict[str, str]],
+        limit: int | None,
+        deadline_at: float,
+        semaphore: asyncio.Semaphore,
+        on_article: Callable[[ArticleRecord], Awaitable[None]] | None = None,
+        fetch_text: Callable[[str], Awaitable[str]] | None = None,
+        claims: Dict[str, str] | None = None,
+    ) -> List[ArticleRecord]:
+        """검색 결과의 본문을 동시에 받아, 마감 시간 안에 끝난 유효 기사를 검색 순위 순으로 돌려준다.
+
+        on_article에는 유효 기사를 끝난 순서대로 넘긴다. 나중에 검색 순위가 더 높은 중복 기사로 바뀌거나
+        limit 밖으로 밀려 최종 결과에 빠지는 기사가 있을 수 있다.
+        여러 주제를 함께 수집할 때는 fetch_text(동시 요청 수를 스스로 제한하는 공용 수신 함수)와
+        claims(URL -> 받아들인 주제)를 넘겨, 다른 주제가 먼저 받아들인 기사는 건너뛴다.
+        """
+        loop = asyncio.get_running_loop()
+        items = self._skip_duplicates(items)
+
+        async def fetch(item: Dict[str, str]) -> str:
+            if fetch_text is not None:
+                return await fetch_text(item["url"])
+            async with semaphore:
+                return await self.fetch_article_text_async(item["url"])
+
+        texts: Dict[int, str] = {}
+        # 중복 묶음 -> 그 묶음에서 남긴 기사(검색 순위가 가장 높은 기사)의 순번
+        clusters: Dict[str, int] = {}
+        tasks = {asyncio.create_task(fetch(item)): index for index, item in enumerate(items)}
+        pending = set(tasks)
+        while pending and (limit is None or len(texts) < limit):
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None:
+                    continue
+                text = task.result()
+                # [필터링] 공백 포함 50자 미만 제외
+                if not text or len(text.strip()) < 50:
+                    continue
+                index = tasks[task]
+                # [필터링] 다른 주제가 먼저 받아들인 기사
+                if claims is not None and claims.setdefault(normalize_url(items[index]["url"]), topic) != topic:
+                    self.metrics.duplicates.inc(1, "url")
+                    continue
+                # [필터링] 본문이 거의 같은 기사는 검색 순위가 높은 한 건만 남긴다
+                with self.metrics.stage("dedup"):
+                    cluster = self.duplicates.add(items[index]["url"], text)
+                kept = clusters.get(cluster)
+                if kept is not None:
+                    self.metrics.duplicates.inc(1, "near")
+                    # 남기지 않는 기사는 다른 주제가 가져갈 수 있게 놓아 준다
+                    dropped = index if kept < index else kept
+                    if claims is not None:
+                        claims.pop(normalize_url(items[dropped]["url"]), None)
+                    if kept < index:
+                        continue
+                    del texts[kept]
+                clusters[cluster] = index
+                texts[index] = text
+                if on_article is not None:
+                    item = items[index]
+                    await on_article(ArticleRecord(item["title"], item["url"], text, item.get("pubDate", "")))
+        # 마감 시간을 넘겼거나 이미 충분히 모인 경우 남은 요청은 취소
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        # 동시에 끝난 기사가 limit을 넘으면 검색 순위가 높은 기사를 우선한다
+        with self.metrics.stage("select"):
+            indices = sorted(texts)[:limit] if limit else sorted(texts)
+            articles = [
+                ArticleRecord(items[index]["title"], items[index]["url"], texts[index], items[index].get("pubDate", ""))
+                for index in indices
+            ]
+
+        # 다음 search_news 요청은 색인에서 바로 답할 수 있도록 수집한 기사를 남겨 둔다
+        with self.metrics.stage("index"):
+            self.index.add(articles)
+
+        if pending:
+            self.metrics.fetches.inc(len(pending), "cancelled")
+            logger.info("'%s' 기사 %d건 요청 중 %d건 취소", topic, len(items), len(pending))
+        return articles
+
+def _json_result(payload: Dict[str, Any]) -> ToolResult:
+    """응답을 한 번만 JSON으로 인코딩해 텍스트로 돌려준다.
+
+    구조화 출력(structuredContent)을 함께 보내면 같은 기사 본문이 한 응답에 두 번 실리므로 텍스트만 보낸다.
+    """
+    return ToolResult(content=[TextContent(type="text", text=dumps(payload))])
+
+def register_data_tools(mcp: FastMCP, settings: Settings) -> Callable[[], AsyncContextManager[None]]:
+    """도구 등록. 서버 lifespan에서 실행할 컨텍스트(파싱 풀 예열, 인기 주제 미리 수집)를 돌려준다.
+
+    파싱 풀은 등록 시점에 만들지 않는다. 서버가 뜬 뒤 백그라운드에서 예열하거나(warm_up), 첫 요청 때 만든다.
+    """
     collector = NewsCollector(settings)
+    prefetch = PrefetchScheduler(collector, settings) if settings.prefetch_enabled else None
+
+    @mcp.tool(
+        name="collect_news",
+        description=(
+            "주제에 대한 최신 뉴스 기사를 검색하고 본문을 수집합니다. "
+            "진행 알림을 요청하면 기사마다 추출되는 즉시 알림 메시지(JSON)로 먼저 보냅니다."
+        ),
+    )
+    async def collect_news(topic: str, ctx: Context) -> ToolResult:
+        started = time.perf_counter()
+        if prefetch is not None:
+            prefetch.record(topic)
+        streamed = 0
+
+        async def stream_article(article: ArticleRecord) -> None:
+            # 전체 수집이 끝나기 전에 기사를 하나씩 진행 알림 메시지로 보낸다 (최종 응답이 기준)
+            nonlocal streamed
+            packed = pack_articles(
+                [article], settings.result_budget_bytes // max(settings.max_articles, 1), settings.min_article_bytes
+            )
+            if not packed:
+                return
+            streamed += 1
+            try:
+                await ctx.report_progress(streamed, message=dumps(packed[0]))
+            except Exception as exc:
+                logger.debug("진행 알림 전송 실패: %s", exc)
+
+        # 클라이언트가 진행 알림을 요청하지 않았으면 (progressToken 없음) 미리 보내지 않는다
+        meta = ctx.request_context.meta if ctx.request_context else None
+        on_article = stream_article if meta is not None and meta.progressToken is not None else None
+        with collector.metrics.trace(topic) as trace:
+            try:
+                # 유효 기사가 max_articles건 모이면 나머지 수집은 중단하여 토큰과 요청 수를 절약
+                raw_articles = await collector.collect_articles_async(
+                    topic, limit=settings.max_articles, on_article=on_article
+                )
+                # 응답 크기 예산 안에서 상투 문구를 빼고 리드 문장부터 담는다
+                articles = collector.pack_results(raw_articles, query=topic)
+            except Exception as exc:
+                logger.exception("기사 수집 실패", exc_info=exc)
+                articles = []
+        collector.metrics.collect_seconds.observe(time.perf_counter() - started)
+        collector.metrics.articles.inc(len(articles))
 
-    @mcp.tool(name="collect_news", description="주제에 대한 최신 뉴스 기사를 검색하고 본문을 수집합니다.")
-    def collect_news(topic: str) -> NewsCollectionResult:
+        logger.info("총 %d건 유효 기사 수집 완료", len(articles))
+        if settings.trace_requests:
+            logger.info("collect_news trace: %s", json.dumps(trace.summary(), ensure_ascii=False))
+        return _json_result({"articles": articles})
+
+    @mcp.tool(
+        name="collect_news_updates",
+        description="주제에 대해 이전 호출 이후 새로 올라온 기사만 최신순으로 수집합니다. 이미 전달한 기사는 다시 보내지 않습니다.",
+    )
+    async def collect_news_updates(topic: str, ctx: Context) -> ToolResult:
+        started = time.perf_counter()
+        # 커서는 MCP 세션마다 따로 둔다 (세션 정보가 없으면 서버 전체가 하나를 공유)
         try:
-            raw_articles = collector.collect_articles(topic)
-            # 최대 3개까지만 전달하여 토큰 절약 (선택 사항)
-            article_models = [Article(**article) for article in raw_articles[:3]]
-        except Exception as exc:
-            logger.exception("기사 수집 실패", exc_info=exc)
-            article_models = []
+            session = ctx.session_id
+        except RuntimeError:
+            session = ""
+        cursor = collector.cursors.get((session, topic.strip()))
+        with collector.metrics.trace(topic) as trace:
+            try:
+                raw_articles = await collector.collect_new_articles_async(topic, cursor, limit=settings.max_articles)
+                articles = collector.pack_results(raw_articles, query=topic)
+            except Exception as exc:
+                logger.exception("새 기사 수집 실패", exc_info=exc)
+                articles = []
+        collector.metrics.collect_seconds.observe(time.perf_counter() - started)
+        collector.metrics.articles.inc(len(articles))
+
+        if settings.trace_requests:
+            logger.info("collect_news_updates trace: %s", json.dumps(trace.summary(), ensure_ascii=False))
+        return _json_result({"articles": articles})
+
+    @mcp.tool(
+        name="collect_news_batch",
+        description="여러 주제의 뉴스를 한 번에 수집합니다. 주제 간 중복 기사는 먼저 나온 주제에만 포함됩니다.",
+    )
+    async def collect_news_batch(topics: list[str]) -> ToolResult:
+        # 공백·중복 주제를 걸러내고 순서는 유지
+        unique = list(dict.fromkeys(topic.strip() for topic in topics if topic.strip()))
+        unique = unique[: settings.max_batch_topics]
+        started = time.perf_counter()
+        if prefetch is not None:
+            for topic in unique:
+                prefetch.record(topic)
+        with collector.metrics.trace(",".join(unique)) as trace:
+            try:
+                collected = await collector.collect_topics_async(unique, limit=settings.max_articles)
+            except Exception as exc:
+                logger.exception("배치 기사 수집 실패", exc_info=exc)
+                collected = {}
+        collector.metrics.collect_seconds.observe(time.perf_counter() - started)
+
+        # 배치 전체 응답이 예산 안에 들도록 주제별로 예산을 나눈다
+        budget = settings.result_budget_bytes // max(len(unique), 1)
+        results = [
+            {"topic": topic, "articles": collector.pack_results(collected.get(topic, []), budget, topic)}
+            for topic in unique
+        ]
+        total = sum(len(result["articles"]) for result in results)
+        collector.metrics.articles.inc(total)
+        logger.info("%d개 주제, 총 %d건 유효 기사 수집 완료", len(results), total)
+        if settings.trace_requests:
+            logger.info("collect_news_batch trace: %s", json.dumps(trace.summary(), ensure_ascii=False))
+        return _json_result({"results": results})
+
+    @mcp.tool(
+        name="search_news",
+        description=(
+            "이전에 수집한 기사 색인에서 검색어의 모든 단어를 포함한 기사를 찾습니다. "
+            "최근 색인된 기사가 부족하면 네이버 뉴스에서 새로 수집합니다."
+        ),
+    )
+    async def search_news(query: str) -> ToolResult:
+        started = time.perf_counter()
+        with collector.metrics.trace(query) as trace:
+            try:
+                articles = collector.pack_results(await collector.search_articles_async(query), query=query)
+            except Exception as exc:
+                logger.exception("색인 검색 실패", exc_info=exc)
+                articles = []
+        collector.metrics.collect_seconds.observe(time.perf_counter() - started)
+        collector.metrics.articles.inc(len(articles))
+
+        if settings.trace_requests:
+            logger.info("search_news trace: %s", json.dumps(trace.summary(), ensure_ascii=False))
+        return _json_result({"articles": articles})
+
+    @mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+    async def metrics(request: Request) -> Response:
+        """Prometheus 스크레이프용 단계별 지연 시간, 다운로드 바이트, 캐시 적중 지표"""
+        return PlainTextResponse(collector.metrics.render(), media_type=CONTENT_TYPE)
+
+    @mcp.custom_route("/ready", methods=["GET"], include_in_schema=False)
+    async def ready(request: Request) -> Response:
+        """준비 상태 검사(readiness probe). 파싱 풀 예열이 끝나기 전에는 503을 돌려준다."""
+        if collector.ready:
+            return PlainTextResponse("ready")
+        return PlainTextResponse("warming up", status_code=503)
+
+    @asynccontextmanager
+    async def lifespan() -> AsyncIterator[None]:
+        # 예열은 기다리지 않고 백그라운드에서 돌린다. 예열을 끄면 바로 준비 완료로 본다
+        warming = None
+        if settings.warm_up:
+            warming = asyncio.create_task(collector.warm_up_async(), name="news-warm-up")
+        else:
+            collector.ready = True
+        try:
+            if prefetch is None:
+                yield
+            else:
+                async with prefetch.running():
+                    yield
+        finally:
+            if warming is not None:
+                warming.cancel()
+            # 서버 루프에서 만든 비동기 HTTP 클라이언트는 그 루프가 살아 있을 때 닫는다
+            await collector.http.aclose()
 
-        logger.info("총 %d건 유효 기사 수집 완료", len(article_models))
-        result = NewsCollectionResult(articles=article_models)
-        return result
\ No newline at end of file
+    return lifespan
\ No newline at end of file
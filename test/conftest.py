@@ -0,0 +1,12 @@
+import sys
+from pathlib import Path
+
+# 서버 코드는 PYTHONPATH=src/mcp_server 기준으로 import 한다 (Dockerfile.server와 동일)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "mcp_server"))
+# 녹화된 응답을 재생하는 로컬 대역 서버(bench/fake_naver.py)를 테스트에서도 사용한다
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "bench"))
+# 클라이언트 모듈도 client/ 디렉터리 기준으로 import 한다 (uv run python client/client.py와 동일)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "client"))
+
+# 실제 Gemini API를 호출하는 수동 점검 스크립트이므로 pytest 수집에서 제외
+collect_ignore = ["test_gemini.py"]
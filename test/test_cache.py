@@ -0,0 +1,179 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from tool.cache import DISK_BATCH, ArticleCache, SearchCache
+from tool.shared import SharedStore, open_store
+
+URL = "https://news.example.kr/article/1"
+
+
+def test_article_cache_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = ArticleCache(db_path=path)
+    first.set(URL + "?utm_source=feed", "디스크에 남은 본문")
+    first.close()
+
+    second = ArticleCache(db_path=path)
+    try:
+        assert second.get(URL) == "디스크에 남은 본문"
+        assert second.stats()["disk_hits"] == 1
+    finally:
+        second.close()
+
+
+def test_article_cache_disk_entries_expire(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = ArticleCache(db_path=path, ttl=0.05)
+    first.set(URL, "곧 만료되는 본문")
+    first.close()
+    time.sleep(0.1)
+
+    second = ArticleCache(db_path=path, ttl=0.05)
+    try:
+        assert second.get(URL) is None
+        assert second.stats()["misses"] == 1
+    finally:
+        second.close()
+
+
+def test_article_cache_batches_disk_writes_and_prunes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ArticleCache(db_path=path, max_disk_entries=10)
+    try:
+        for index in range(DISK_BATCH - 1):
+            cache.set(f"{URL}/{index}", f"본문 {index}")
+        # 한 묶음이 차기 전에는 디스크에 쓰지 않는다
+        assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM articles").fetchone() == (0,)
+
+        for index in range(DISK_BATCH - 1, 100):
+            cache.set(f"{URL}/{index}", f"본문 {index}")
+    finally:
+        cache.close()
+    # 100건을 쓴 뒤에는 오래된 항목부터 지워 한도를 지킨다
+    rows = sqlite3.connect(path).execute("SELECT url FROM articles").fetchall()
+    assert len(rows) == 10
+    assert (f"{URL}/99",) in rows
+
+
+def test_article_cache_flushes_stale_pending_writes_on_get(tmp_path, monkeypatch):
+    monkeypatch.setattr("tool.cache.DISK_FLUSH_SECONDS", 0.05)
+    path = str(tmp_path / "cache.db")
+    cache = ArticleCache(db_path=path)
+
+    async def run():
+        await cache.set_async(URL, "대기 중인 본문")
+        # 새 저장이 없어도 오래 기다린 항목은 다음 조회 때 디스크에 쓴다
+        time.sleep(0.1)
+        assert await cache.get_async(URL + "/other") is None
+        return sqlite3.connect(path).execute("SELECT url FROM articles").fetchall()
+
+    try:
+        assert asyncio.run(run()) == [(URL,)]
+        # 메모리에 없는 항목은 비동기 경로에서도 디스크 계층에서 찾는다
+        fresh = ArticleCache(db_path=path)
+        try:
+            assert asyncio.run(fresh.get_async(URL)) == "대기 중인 본문"
+            assert fresh.stats()["disk_hits"] == 1
+        finally:
+            fresh.close()
+    finally:
+        cache.close()
+
+
+class SlowSearch:
+    """호출 수를 세고 잠시 뒤 결과를 돌려주는(또는 실패하는) 검색 대역"""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if self.fail:
+            raise RuntimeError("검색 실패")
+        return [{"title": "기사", "url": URL}]
+
+
+def test_search_cache_coalesces_concurrent_requests():
+    cache = SearchCache()
+    search = SlowSearch()
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_fetch(("반도체", 6, "sim"), search) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert search.calls == 1
+    assert all(result == results[0] for result in results)
+    assert cache.stats()["coalesced"] == 9
+    assert cache.stats()["misses"] == 1
+
+
+def test_search_cache_waiter_cancellation_keeps_shared_fetch():
+    cache = SearchCache()
+    search = SlowSearch()
+
+    async def run():
+        first = asyncio.create_task(cache.get_or_fetch("반도체", search))
+        second = asyncio.create_task(cache.get_or_fetch("반도체", search))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first
+
+    result, first = asyncio.run(run())
+    assert first.cancelled()
+    assert result == [{"title": "기사", "url": URL}]
+    assert search.calls == 1
+    assert cache.get("반도체") == result
+
+
+def test_search_cache_does_not_keep_failures():
+    cache = SearchCache()
+    failing = SlowSearch(fail=True)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("반도체", failing)
+        return await cache.get_or_fetch("반도체", SlowSearch())
+
+    assert asyncio.run(run()) == [{"title": "기사", "url": URL}]
+    assert failing.calls == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_shared_store_requires_every_operation():
+    class Partial(SharedStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_caches_share_through_async_store(tmp_path):
+    store = open_store(f"sqlite:///{tmp_path / 'shared.db'}")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return [{"title": "공유된 검색 결과"}]
+
+    async def run():
+        # 다른 복제본 흉내: 캐시는 따로, 공유 저장소는 같은 것을 쓴다
+        await ArticleCache(shared=store).set_async(URL, "공유된 본문")
+        await SearchCache(shared=store).get_or_fetch(("반도체", 10, "date"), fetch)
+        peer_articles, peer_search = ArticleCache(shared=store), SearchCache(shared=store)
+        text = await peer_articles.get_async(URL)
+        items = await peer_search.get_or_fetch(("반도체", 10, "date"), fetch)
+        return text, items, peer_articles.stats(), peer_search.stats()
+
+    try:
+        text, items, article_stats, search_stats = asyncio.run(run())
+    finally:
+        store.close()
+    assert text == "공유된 본문" and article_stats["shared_hits"] == 1
+    assert items == [{"title": "공유된 검색 결과"}] and search_stats["shared_hits"] == 1
+    assert len(calls) == 1
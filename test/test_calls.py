@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+from google.genai import types
+
+from calls import run_calls
+
+
+def calls(*names):
+    return [types.FunctionCall(name=name, args={"topic": name}) for name in names]
+
+
+def responses(parts):
+    return [(part.function_response.name, part.function_response.response) for part in parts]
+
+
+def test_responses_keep_call_order():
+    delays = {"first": 0.15, "second": 0.0, "third": 0.05}
+
+    async def call_once(name, args, fallback_topic, streamed):
+        await asyncio.sleep(delays[name])
+        return f"{name} 결과"
+
+    async def run():
+        return await run_calls(calls("first", "second", "third"), [None] * 3, call_once, asyncio.Semaphore(3), 1.0)
+
+    # 늦게 끝난 호출도 호출한 자리에 응답이 놓인다
+    assert responses(asyncio.run(run())) == [
+        ("first", {"result": "first 결과"}),
+        ("second", {"result": "second 결과"}),
+        ("third", {"result": "third 결과"}),
+    ]
+
+
+def test_timeout_fails_only_the_slow_call():
+    async def call_once(name, args, fallback_topic, streamed):
+        if name == "slow":
+            await asyncio.sleep(5)
+        if name == "streaming":
+            streamed.append({"title": "먼저 도착한 기사"})
+            await asyncio.sleep(5)
+        if name == "broken":
+            raise RuntimeError("서버 오류")
+        return "ok"
+
+    async def run():
+        return await run_calls(
+            calls("slow", "fast", "streaming", "broken"), [None] * 4, call_once, asyncio.Semaphore(4), 0.1
+        )
+
+    slow, fast, streaming, broken = responses(asyncio.run(run()))
+    assert slow == ("slow", {"error": "0.1초 안에 응답이 없어 중단했습니다."})
+    assert fast == ("fast", {"result": "ok"})
+    # 제한 시간을 넘긴 collect_news는 진행 알림으로 받은 기사로 답한다
+    assert json.loads(streaming[1]["result"]) == {"articles": [{"title": "먼저 도착한 기사"}]}
+    assert broken == ("broken", {"error": "서버 오류"})
+
+
+def test_semaphore_bounds_concurrent_calls():
+    active = peak = 0
+
+    async def call_once(name, args, fallback_topic, streamed):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return name
+
+    async def run():
+        names = [f"call{n}" for n in range(8)]
+        return await run_calls(calls(*names), [None] * 8, call_once, asyncio.Semaphore(2), 1.0)
+
+    parts = asyncio.run(run())
+    assert len(parts) == 8
+    assert peak == 2
@@ -0,0 +1,415 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+
+from config import Settings
+from fake_naver import FakeNaver
+from tool.cache import normalize_url
+from tool.cursor import TopicCursor
+from tool.extract import parse_article
+from tool.prefetch import PrefetchScheduler
+from tool.tool import NewsCollector, register_data_tools
+
+PAGES = Path(__file__).parent / "fixtures" / "pages"
+
+
+@pytest.fixture(scope="module")
+def fake():
+    with FakeNaver() as server:
+        yield server
+
+
+@pytest.fixture
+def collector(fake, monkeypatch):
+    for key, value in fake.proxy_env.items():
+        monkeypatch.setenv(key, value)
+    settings = Settings(
+        client_id="test",
+        client_secret="test",
+        search_url=fake.search_url,
+        parse_executor="inline",
+        article_cache_size=0,
+        search_cache_ttl=0.0,
+    )
+    collector = NewsCollector(settings)
+    yield collector
+    collector.close()
+
+
+def test_search_strips_markup_from_titles(collector):
+    items = collector.fetch_naver_news_items("반도체", display=10)
+    assert len(items) == 10
+    # 강조 태그는 지우고 &quot; 같은 엔티티는 원래 문자로 푼다
+    assert items[0]["title"] == 'SK하이닉스, HBM 증설 발표…"공급 부족 지속"'
+    assert all(item["url"].startswith("http://") for item in items)
+
+
+def test_fetch_article_text_decodes_legacy_charset(collector):
+    # 헤더에 charset이 없는 euc-kr 페이지
+    text = collector.fetch_article_text("http://www.etnews.com/20261017000001")
+    assert text.startswith("소재·부품·장비 국산화율")
+
+
+def test_fetch_article_stops_reading_after_article(collector):
+    # 본문 뒤에 3MB 스크립트가 붙은 페이지
+    text = collector.fetch_article_text("http://n.news.naver.com/mnews/article/009/0005300001")
+    assert text.startswith("전기차 충전 요금이 내년부터")
+    assert collector.metrics.download_bytes.value("download") < 1_000_000
+    assert collector.metrics.stream_stops.value("extracted") == 1
+
+
+def test_collect_articles_async_skips_broken_and_short_pages(collector):
+    articles = asyncio.run(collector.collect_articles_async("전기차", display=8))
+    urls = [article.url for article in articles]
+    assert "http://www.mt.co.kr/industry/2026/10/17/2026101700001" not in urls
+    assert len(articles) == 7
+    assert all(len(article.text) >= 50 for article in articles)
+
+
+def test_metrics_record_stages_and_bytes(collector):
+    asyncio.run(collector.collect_articles_async("반도체", limit=2))
+    metrics = collector.metrics
+    for stage in ("search", "download", "decode", "parse", "select"):
+        assert metrics.stage_seconds.count(stage) > 0, stage
+    assert metrics.download_bytes.value("download") > 0
+    assert 'news_stage_seconds_count{stage="search"} 1' in metrics.render()
+
+
+def test_collect_topics_async_dedups_urls_across_topics(collector):
+    shared = "http://www.yna.co.kr/view/AKR20261017000100003"
+    results = asyncio.run(collector.collect_topics_async(["반도체", "전기차"], limit=10))
+    assert list(results) == ["반도체", "전기차"]
+    urls = [[article.url for article in articles] for articles in results.values()]
+    assert shared in urls[0] and shared not in urls[1]
+    assert len(set(urls[0]) & set(urls[1])) == 0
+
+
+def test_shared_url_goes_to_next_topic_when_first_is_full(collector):
+    shared = "http://news.example.kr/shared"
+    searches = {
+        "반도체": ["http://news.example.kr/a1", "http://news.example.kr/a2", shared],
+        "전기차": [shared, "http://news.example.kr/b1"],
+    }
+    fetched = []
+
+    async def search(topic, display=None, sort=None):
+        return [{"title": url, "url": url, "description": "", "pubDate": ""} for url in searches[topic]]
+
+    async def fetch(url):
+        fetched.append(url)
+        # 공유 기사는 늦게 끝나므로 첫 주제는 그 전에 한도(2건)를 채운다
+        await asyncio.sleep(0.2 if url == shared else 0.01)
+        return " ".join(f"{url.rsplit('/', 1)[1]}-{n}" for n in range(30))
+
+    collector.fetch_naver_news_items_async = search
+    collector.fetch_article_text_async = fetch
+    results = asyncio.run(collector.collect_topics_async(["반도체", "전기차"], limit=2))
+
+    assert [a.url for a in results["반도체"]] == ["http://news.example.kr/a1", "http://news.example.kr/a2"]
+    assert [a.url for a in results["전기차"]] == [shared, "http://news.example.kr/b1"]
+    # 두 주제가 함께 기다린 공유 기사도 한 번만 받는다
+    assert fetched.count(shared) == 1
+
+
+def test_near_duplicate_wire_copy_is_dropped_and_skipped_next_time(collector):
+    # 뉴시스 기사는 연합뉴스 기사를 거의 그대로 옮긴 것
+    copy = "http://www.newsis.com/view/NISX20261017_0002900001"
+    articles = asyncio.run(collector.collect_articles_async("반도체", display=8))
+    urls = [article.url for article in articles]
+    assert "http://www.yna.co.kr/view/AKR20261017000100003" in urls
+    assert copy not in urls
+    assert collector.metrics.duplicates.value("near") == 1
+
+    # 다음 요청에서는 본문을 받기 전에 건너뛴다
+    asyncio.run(collector.collect_articles_async("반도체", display=8))
+    assert collector.metrics.duplicates.value("known") == 1
+
+
+def test_prefetch_warms_caches_for_hot_topics(collector, fake):
+    settings = collector.settings.model_copy(update={"article_cache_size": 64, "prefetch_min_hits": 2})
+    warm = NewsCollector(settings)
+    scheduler = PrefetchScheduler(warm, settings)
+    for topic in ("반도체", "반도체", "전기차"):
+        scheduler.record(topic)
+    assert scheduler.due_topics() == ["반도체"]
+
+    async def run():
+        assert await scheduler.refresh("반도체", asyncio.Semaphore(2))
+        fake.reset_counters()
+        return await warm.collect_articles_async("반도체", limit=settings.max_articles)
+
+    try:
+        articles = asyncio.run(run())
+    finally:
+        warm.close()
+    assert len(articles) == settings.max_articles
+    # 사용자 요청은 검색 API도 기사 페이지도 다시 부르지 않는다
+    assert fake.requests == 0
+    assert scheduler.due_topics() == []
+    assert warm.quota.used == 1
+
+
+def test_collect_new_articles_only_returns_undelivered(collector, fake):
+    cursor = TopicCursor()
+    first = asyncio.run(collector.collect_new_articles_async("반도체", cursor, limit=3))
+    assert len(first) == 3
+    assert all(article.pub_date for article in first)
+
+    fake.reset_counters()
+    second = asyncio.run(collector.collect_new_articles_async("반도체", cursor, limit=3))
+    # 이미 전달한 기사와 그보다 오래된 기사는 본문을 받지 않는다
+    assert not {a.url for a in first} & {a.url for a in second}
+    assert fake.requests - fake.search_requests == len(second)
+
+
+def test_transient_errors_are_retried_and_failing_hosts_skipped(collector, fake):
+    body = "<html><body><article>" + "일시적인 장애 뒤에도 본문을 받아야 한다. " * 10 + "</article></body></html>"
+    fake.add_page("http://flaky.example.kr/news/1", body.encode("utf-8"), fail_times=1)
+    fake.add_page("http://down.example.kr/news/1", status=503)
+    collector.settings.retry_backoff = 0.0
+    collector.settings.breaker_failures = 3
+
+    assert collector.fetch_article_text("http://flaky.example.kr/news/1").startswith("일시적인 장애")
+    assert collector.metrics.retries.value("status") == 1
+
+    # 재시도 포함 3번 연속 실패하면 서킷이 열리고, 이후 요청은 보내지 않고 건너뛴다
+    assert collector.fetch_article_text("http://down.example.kr/news/1") == ""
+    fake.reset_counters()
+    assert collector.fetch_article_text("http://down.example.kr/news/2") == ""
+    assert fake.requests == 0
+    assert collector.metrics.fetches.value("skipped") == 1
+
+
+def test_search_articles_answers_from_index_after_collection(collector, fake):
+    live = asyncio.run(collector.search_articles_async("반도체", limit=3))
+    assert len(live) == 3
+    assert collector.metrics.index_queries.value("live") == 1
+
+    # 같은 검색어는 색인에서 바로 답하고 네이버 API와 언론사 페이지를 다시 부르지 않는다
+    fake.reset_counters()
+    indexed = asyncio.run(collector.search_articles_async("반도체", limit=3))
+    assert len(indexed) == 3
+    assert fake.requests == 0
+    assert collector.metrics.index_queries.value("hit") == 1
+
+
+def test_replicas_share_caches_quota_and_fetch_leases(collector, fake, tmp_path):
+    settings = collector.settings.model_copy(
+        update={"shared_store_url": f"sqlite:///{tmp_path / 'shared.db'}", "search_cache_ttl": 60.0}
+    )
+    first, second = NewsCollector(settings), NewsCollector(settings)
+    url = "http://peer.example.kr/news/1"
+
+    async def run():
+        articles = await first.collect_articles_async("반도체", limit=3)
+        fake.reset_counters()
+        # 다른 복제본은 검색 결과와 본문을 공유 저장소에서 가져온다
+        again = await second.collect_articles_async("반도체", limit=3)
+        # 첫 복제본은 먼저 끝난 기사부터 캐시하므로 고른 기사는 다를 수 있지만, 업스트림 요청은 없다
+        assert len(again) == len(articles)
+        assert fake.requests == 0
+
+        # 다른 복제본이 선점한 기사는 직접 받지 않고 그 결과를 기다린다
+        lease = f"fetch:{normalize_url(url)}"
+        assert second.shared.add(lease, "peer", 5.0)
+        waiting = asyncio.create_task(first.fetch_article_text_async(url))
+        await asyncio.sleep(0.1)
+        second.article_cache.set(url, "다른 복제본이 받은 본문")
+        second.shared.delete(lease)
+        return await waiting
+
+    try:
+        assert asyncio.run(run()) == "다른 복제본이 받은 본문"
+        assert fake.requests == 0
+        assert second.quota.stats()["used"] == 1
+        assert first.metrics.fetches.value("peer") == 1
+    finally:
+        first.close()
+        second.close()
+
+
+def test_waiting_replica_gets_empty_result_without_refetching(collector, fake, tmp_path):
+    settings = collector.settings.model_copy(update={"shared_store_url": f"sqlite:///{tmp_path / 'shared.db'}"})
+    first, second = NewsCollector(settings), NewsCollector(settings)
+    url = "http://empty.example.kr/news/1"
+    fake.add_page(url, b"<html><body></body></html>", delay=0.3)
+
+    async def run():
+        holder = asyncio.create_task(second.fetch_article_text_async(url))
+        await asyncio.sleep(0.1)
+        started = time.perf_counter()
+        # 선점한 복제본이 빈 본문을 받으면 기다리던 복제본도 다시 받지 않고 바로 ""를 돌려받는다
+        text = await first.fetch_article_text_async(url)
+        return text, await holder, time.perf_counter() - started
+
+    try:
+        fake.reset_counters()
+        waited, held, elapsed = asyncio.run(run())
+        assert waited == held == ""
+        assert elapsed < 2.0
+        assert fake.requests == 1
+        assert first.metrics.fetches.value("peer") == 1
+    finally:
+        first.close()
+        second.close()
+
+
+def test_collect_news_streams_articles_as_progress(collector):
+    mcp = FastMCP("test")
+    register_data_tools(mcp, collector.settings)
+    streamed = []
+
+    async def on_progress(progress, total, message):
+        streamed.append(json.loads(message))
+
+    async def run():
+        async with Client(mcp) as client:
+            return await client.call_tool("collect_news", {"topic": "반도체"}, progress_handler=on_progress)
+
+    result = asyncio.run(run())
+    final = json.loads(result.content[0].text)["articles"]
+    assert final
+    # 최종 응답의 기사는 모두 그 전에 진행 알림으로 한 번씩 먼저 전달된다
+    assert {article["url"] for article in final} <= {article["url"] for article in streamed}
+    assert all(article["title"] and article["text"] for article in streamed)
+
+
+def test_ready_turns_green_once_parse_pool_is_warm(collector):
+    settings = collector.settings.model_copy(update={"parse_executor": "process", "parse_workers": 1, "warm_up": True})
+    mcp = FastMCP("test")
+    lifespan = register_data_tools(mcp, settings)
+    transport = httpx.ASGITransport(app=mcp.http_app())
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # 도구 등록만으로는 파싱 풀을 만들지 않는다
+            statuses = [(await client.get("/ready")).status_code]
+            async with lifespan():
+                for _ in range(200):
+                    status = (await client.get("/ready")).status_code
+                    if status == 200:
+                        break
+                    await asyncio.sleep(0.01)
+                statuses.append(status)
+        return statuses
+
+    assert asyncio.run(run()) == [503, 200]
+
+
+def test_thread_executor_is_ready_without_warm_up(collector):
+    settings = collector.settings.model_copy(update={"parse_executor": "thread", "warm_up": True})
+    threaded = NewsCollector(settings)
+    try:
+        threaded.warm_up()
+        # 스레드 풀은 기동 비용이 없으므로 예열 단계에서 만들지 않는다
+        assert threaded.ready and threaded._parse_executor is None
+    finally:
+        threaded.close()
+
+
+def test_default_config_stops_async_download_early(collector):
+    # 기본 설정(프로세스 풀, fast 백엔드, stream_parse 켬)에서도 본문이 확정되면 나머지를 받지 않는다
+    settings = collector.settings.model_copy(update={"parse_executor": "process", "parse_workers": 1})
+    assert settings.stream_parse and settings.extract_backend == "fast"
+    pooled = NewsCollector(settings)
+    try:
+        text = asyncio.run(pooled.fetch_article_text_async("http://n.news.naver.com/mnews/article/009/0005300001"))
+    finally:
+        pooled.close()
+    assert text.startswith("전기차 충전 요금이 내년부터")
+    assert pooled.metrics.download_bytes.value("download") < 1_000_000
+    assert pooled.metrics.stream_stops.value("extracted") == 1
+
+
+@pytest.mark.parametrize(("mode", "stream_parse"), [("thread", True), ("process", False)])
+def test_download_parses_in_configured_executor(collector, mode, stream_parse):
+    # 스레드 풀은 조각마다, 프로세스 풀은 다 받은 문서를 한 번에 추출한다
+    settings = collector.settings.model_copy(
+        update={"parse_executor": mode, "parse_workers": 1, "stream_parse": stream_parse}
+    )
+    pooled = NewsCollector(settings)
+    executor = pooled._get_parse_executor()
+    submitted = []
+    submit = executor.submit
+
+    def spy(fn, *args, **kwargs):
+        submitted.append(fn)
+        return submit(fn, *args, **kwargs)
+
+    executor.submit = spy
+    try:
+        text = asyncio.run(pooled.fetch_article_text_async("http://www.etnews.com/20261017000001"))
+    finally:
+        pooled.close()
+    assert text.startswith("소재·부품·장비 국산화율")
+    assert submitted
+
+
+def test_broken_process_pool_is_replaced_once(collector):
+    settings = collector.settings.model_copy(update={"parse_executor": "process", "parse_workers": 1})
+    pooled = NewsCollector(settings)
+    url = "https://n.news.naver.com/mnews/article/001/0014900001"
+    content = (PAGES / "naver_mnews.html").read_bytes()
+    broken = pooled._get_parse_executor()
+    broken.submit(parse_article, b"", "utf-8").result()
+    for process in list(broken._processes.values()):
+        process.kill()
+        process.join()
+    shutdowns = []
+    shutdown = broken.shutdown
+
+    def spy(*args, **kwargs):
+        shutdowns.append(kwargs)
+        return shutdown(*args, **kwargs)
+
+    broken.shutdown = spy
+    try:
+        # 이번 요청은 직접 처리하고, 손상된 풀은 정리된 뒤 다음 요청에서 새로 만든다
+        text = asyncio.run(pooled.parse_article_async(content, "utf-8", url))
+        assert text == parse_article(content, "utf-8", "fast", *pooled.rules.selectors_for(url))[0]
+        assert pooled._parse_executor is None
+        assert shutdowns == [{"wait": False, "cancel_futures": True}]
+        replaced = pooled._get_parse_executor()
+        assert replaced is not broken
+        # 늦게 실패를 알린 요청이 이미 바뀐 풀을 버리지 않는다
+        pooled._discard_parse_executor(broken)
+        assert pooled._parse_executor is replaced
+    finally:
+        pooled.close()
+
+
+def test_collect_deadline_bounds_slow_search(collector):
+    async def slow_search(topic, display, sort):
+        await asyncio.sleep(2.0)
+        return []
+
+    collector._search_async = slow_search
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        articles = await collector.collect_articles_async("반도체", deadline=0.3, limit=3)
+        return articles, loop.time() - started
+
+    articles, elapsed = asyncio.run(run())
+    assert articles == []
+    assert elapsed < 1.0
+
+
+def test_process_pool_parses_articles(collector):
+    settings = collector.settings.model_copy(update={"parse_executor": "process", "parse_workers": 1})
+    pooled = NewsCollector(settings)
+    url = "https://n.news.naver.com/mnews/article/001/0014900001"
+    content = (PAGES / "naver_mnews.html").read_bytes()
+    try:
+        text = asyncio.run(pooled.parse_article_async(content, "utf-8", url))
+        assert isinstance(pooled._parse_executor, ProcessPoolExecutor)
+    finally:
+        pooled.close()
+    assert text and text == parse_article(content, "utf-8", "fast", *pooled.rules.selectors_for(url))[0]
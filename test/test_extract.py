@@ -0,0 +1,137 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import tool.extract
+from tool.extract import (
+    CANDIDATE_SELECTORS,
+    NOISE_SELECTORS,
+    ArticleStream,
+    StreamingExtractor,
+    extract_article_text,
+    extract_fast,
+    extract_with_soup,
+    parse_article,
+    sniff_charset,
+)
+from tool.rules import ExtractionRules
+
+PAGES = sorted((Path(__file__).parent / "fixtures" / "pages").glob("*.html"))
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+def test_fast_backend_matches_soup(page):
+    html = page.read_text(encoding="utf-8")
+    assert extract_fast(html) == extract_with_soup(html)
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+def test_fast_backend_matches_soup_when_fed_in_chunks(page):
+    html = page.read_text(encoding="utf-8")
+    parser = StreamingExtractor()
+    for start in range(0, len(html), 97):
+        parser.feed(html[start:start + 97])
+    parser.close()
+    assert parser.result() == extract_with_soup(html)
+
+
+def test_noise_is_removed_from_naver_article():
+    html = (Path(__file__).parent / "fixtures" / "pages" / "naver_mnews.html").read_text(encoding="utf-8")
+    text = extract_article_text(html)
+    assert text.startswith("(세종=연합뉴스)")
+    assert "연합뉴스 자료사진" not in text  # .img_desc
+    assert "Copyright" not in text
+    assert '"9월 수출입 동향"' in text
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        extract_article_text("<html></html>", backend="lxml")
+
+
+def test_rules_prefer_host_rule_then_learned_selector():
+    rules = ExtractionRules({"naver.com": {"candidates": ("#dic_area",)}})
+    candidates, noise = rules.selectors_for("https://m.sports.naver.com/article/1")
+    assert candidates[0] == "#dic_area"
+    assert candidates[1:] == tuple(s for s in CANDIDATE_SELECTORS if s != "#dic_area")
+    assert noise == NOISE_SELECTORS
+
+    rules.record("https://m.sports.naver.com/article/2", "#newsEndContents")
+    candidates, _ = rules.selectors_for("https://m.sports.naver.com/article/3")
+    assert candidates[:2] == ("#newsEndContents", "#dic_area")
+    # 다른 호스트에는 영향을 주지 않는다
+    assert rules.selectors_for("https://n.news.naver.com/a")[0][0] == "#dic_area"
+
+
+def test_rules_keep_only_recent_hosts():
+    rules = ExtractionRules({}, max_hosts=2)
+    for host in ("a.example.kr", "b.example.kr", "c.example.kr"):
+        rules.record(f"https://{host}/1", "#body")
+        rules.selectors_for(f"https://{host}/2")
+    # 가장 오래 쓰지 않은 호스트부터 잊는다
+    assert set(rules.learned()) == {"b.example.kr", "c.example.kr"}
+    assert list(rules._plans) == ["b.example.kr", "c.example.kr"]
+
+
+def test_rules_reject_unsupported_selector():
+    with pytest.raises(ValueError):
+        ExtractionRules({"example.com": {"candidates": ("div > p",)}})
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+def test_article_stream_matches_whole_document(page):
+    content = page.read_bytes()
+    stream = ArticleStream(None)
+    for start in range(0, len(content), 512):
+        if stream.feed(content[start:start + 512]):
+            break
+    assert stream.close() == parse_article(content, "utf-8")
+
+
+def test_article_stream_stops_after_article_and_caps_size():
+    content = (Path(__file__).parent / "fixtures" / "pages" / "naver_mnews.html").read_bytes()
+    padded = content.replace(b"</body>", b"<script>" + b"x" * 200_000 + b"</script></body>")
+    stream = ArticleStream("utf-8", candidates=("#dic_area",))
+    fed = 0
+    for start in range(0, len(padded), 4096):
+        fed += 4096
+        if stream.feed(padded[start:start + 4096]):
+            break
+    assert fed < len(content) + 4096
+    assert stream.close()[0].startswith("(세종=연합뉴스)")
+
+    capped = ArticleStream("utf-8", max_bytes=1000)
+    assert capped.feed(padded) is True
+    assert capped.truncated and capped.size == 1000
+
+
+@pytest.mark.parametrize(
+    "head, expected",
+    [
+        (b'<html><head><meta charset="EUC-KR">', "cp949"),
+        (b"<meta http-equiv='Content-Type' content='text/html; charset=ks_c_5601-1987'>", "cp949"),
+        ("<p>한글 본문</p>".encode("utf-8") * 400, "utf-8"),
+        ("<p>한글 본문</p>".encode("cp949") * 400, "cp949"),
+        # 메타 선언과 실제 바이트가 다르면 바이트를 따른다
+        ('<meta charset="euc-kr"><p>한글 본문입니다</p>'.encode("utf-8") * 10, "utf-8"),
+        ('<meta charset="utf-8"><p>한글 본문입니다</p>'.encode("cp949") * 10, "cp949"),
+    ],
+)
+def test_sniff_charset(head, expected):
+    assert sniff_charset(head, final=True) == expected
+
+
+def test_sniff_charset_waits_for_more_bytes():
+    assert sniff_charset(b"<html><head><meta charset=euc-kr><title>") is None
+    assert sniff_charset("<title>한".encode("utf-8")) is None
+
+
+def test_extract_module_imports_without_server_stack():
+    # 파싱 워커(forkserver)는 tool.extract만 미리 불러온다. 서버 쪽 무거운 모듈이 딸려 오면 안 된다
+    code = "import sys, tool.extract; print(sorted(m for m in ('tool.tool', 'fastmcp', 'httpx') if m in sys.modules))"
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(tool.extract.__file__).parents[1], capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip() == "[]"
@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+from google.genai import types
+
+from history import DIGEST_KEY, OMITTED, ConversationHistory, PromptCache
+
+ARTICLES = json.dumps(
+    {"articles": [{"title": f"기사 {n}", "url": f"https://news.example.kr/{n}", "text": "본문 " * 500} for n in range(3)]},
+    ensure_ascii=False,
+)
+
+
+def exchange(history, topic):
+    """사용자 입력 하나에 함수 호출 두 개와 그 응답, 최종 답변이 이어진 교환"""
+    history.add_user_input(f"{topic} 뉴스 요약해줘")
+    history.append(types.Content(role="model", parts=[
+        types.Part(function_call=types.FunctionCall(name="collect_news", args={"topic": topic})),
+        types.Part(function_call=types.FunctionCall(
+            name="get_prompt", args={"name": "summarize_articles_prompt", "args": {"articles": ARTICLES}}
+        )),
+    ]))
+    history.append(types.Content(role="user", parts=[
+        types.Part(function_response=types.FunctionResponse(name="collect_news", response={"result": ARTICLES})),
+        types.Part(function_response=types.FunctionResponse(name="get_prompt", response={"result": "요약 지침\n" + ARTICLES})),
+    ]))
+    history.append(types.Content(role="model", parts=[types.Part(text=f"{topic} 요약")]))
+
+
+def user_inputs(history):
+    return [content.parts[0].text for content in history.contents if content.role == "user" and content.parts[0].text]
+
+
+def assert_calls_paired(contents):
+    for index, content in enumerate(contents):
+        calls = [part.function_call.name for part in content.parts if part.function_call]
+        if calls:
+            responses = [part.function_response.name for part in contents[index + 1].parts if part.function_response]
+            assert responses == calls
+        if any(part.function_response for part in content.parts):
+            assert index > 0 and any(part.function_call for part in contents[index - 1].parts)
+
+
+def test_finished_exchange_keeps_only_digests():
+    history = ConversationHistory()
+    exchange(history, "반도체")
+    before = history.size()
+    history.add_user_input("두 번째 기사만 자세히 알려줘")
+
+    calls, responses = history.contents[1].parts, history.contents[2].parts
+    assert responses[0].function_response.response[DIGEST_KEY].startswith("기사 3건: 기사 0 <https://news.example.kr/0>")
+    assert responses[1].function_response.response[DIGEST_KEY].startswith("프롬프트 ")
+    assert calls[0].function_call.args == {"topic": "반도체"}
+    assert calls[1].function_call.args["args"]["articles"].endswith(OMITTED)
+    assert history.size() < before / 5
+    assert_calls_paired(history.contents)
+
+
+def test_trim_drops_oldest_exchanges_whole():
+    history = ConversationHistory(max_bytes=2500)
+    for topic in ("반도체", "전기차", "금리", "환율"):
+        exchange(history, topic)
+    history.add_user_input("마지막 질문")
+
+    assert history.size() <= 2500
+    inputs = user_inputs(history)
+    assert "반도체 뉴스 요약해줘" not in inputs
+    assert inputs[-2:] == ["환율 뉴스 요약해줘", "마지막 질문"]
+    # 남은 기록은 사용자 입력으로 시작하고, 함수 호출과 응답은 짝을 이룬다
+    assert history.contents[0].role == "user" and history.contents[0].parts[0].text
+    assert_calls_paired(history.contents)
+
+
+def test_oversized_last_exchange_is_dropped():
+    history = ConversationHistory(max_bytes=100)
+    exchange(history, "반도체")
+    history.add_user_input("새 질문")
+    assert user_inputs(history) == ["새 질문"]
+    assert len(history.contents) == 1
+
+
+def test_prompt_cache_reuses_template_for_new_articles():
+    cache = PromptCache()
+
+    async def fetch(args):
+        return f"주제: {args['topic']}\n데이터:\n{args['articles_blob']}"
+
+    async def run():
+        return [
+            await cache.render("summarize_articles_prompt", {"topic": "반도체", "articles_blob": blob}, fetch)
+            for blob in ('{"articles":[1]}', '{"articles":[2]}')
+        ]
+
+    assert asyncio.run(run()) == ['주제: 반도체\n데이터:\n{"articles":[1]}', '주제: 반도체\n데이터:\n{"articles":[2]}']
+    assert cache.fetches == 1
+
+
+def test_prompt_cache_skips_templates_that_change_the_blob():
+    cache = PromptCache()
+
+    async def fetch(args):
+        # 본문을 잘라 넣는 프롬프트는 템플릿으로 재사용할 수 없다
+        return "데이터: " + args["articles_blob"][:5]
+
+    text = asyncio.run(cache.render("short_prompt", {"articles_blob": "0123456789"}, fetch))
+    assert text == "데이터: 01234"
+    assert cache.fetches == 2
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Settings
+from fake_naver import FakeNaver
+from tool.http_client import HttpClients
+from tool.quota import DailyQuota
+
+
+def test_async_clients_close_with_their_loop():
+    http = HttpClients(Settings(), {})
+    clients = []
+
+    async def use_client():
+        clients.append(http.async_client)
+
+    # asyncio.run마다 루프가 바뀌므로 클라이언트를 새로 만들고, 이전 것은 자기 루프에서 닫혀야 한다
+    asyncio.run(use_client())
+    asyncio.run(use_client())
+    assert clients[0] is not clients[1]
+    assert all(client.is_closed for client in clients)
+
+
+def test_aclose_closes_current_async_client():
+    http = HttpClients(Settings(), {})
+
+    async def use_and_close():
+        client = http.async_client
+        await http.aclose()
+        return client
+
+    client = asyncio.run(use_and_close())
+    assert client.is_closed
+
+
+def test_sync_requests_respect_host_limit(monkeypatch):
+    with FakeNaver(latency=0.1) as fake:
+        for key, value in fake.proxy_env.items():
+            monkeypatch.setenv(key, value)
+        http = HttpClients(Settings(http_max_per_host=2), {"X-Naver-Client-Id": "test", "X-Naver-Client-Secret": "test"})
+        started = time.perf_counter()
+        with ThreadPoolExecutor(6) as pool:
+            responses = list(pool.map(lambda _: http.get_sync(fake.search_url, stage="search", params={"query": "반도체"}), range(6)))
+        elapsed = time.perf_counter() - started
+        http.close()
+    assert all(response.status_code == 200 for response in responses)
+    # 동시에 2개씩만 나가므로 0.1초 지연 요청 6개는 세 번에 나뉘어 처리된다
+    assert elapsed >= 0.3
+
+
+def test_quota_counts_every_upstream_attempt(monkeypatch):
+    with FakeNaver() as fake:
+        for key, value in fake.proxy_env.items():
+            monkeypatch.setenv(key, value)
+        url = "http://flaky.example.kr/search"
+        http = HttpClients(Settings(http_retries=2, retry_backoff=0.01), {})
+        quota = DailyQuota(limit=100)
+
+        # 두 번 503으로 응답한 뒤 성공하므로 한도는 세 번 차감된다
+        fake.add_page(url, b"ok", fail_times=2)
+        assert http.get_sync(url, stage="search", quota=quota).status_code == 200
+        assert quota.used == 3
+
+        fake.add_page(url, b"ok", fail_times=2)
+
+        async def fetch():
+            response = await http.get(url, stage="search", quota=quota)
+            await http.aclose()
+            return response
+
+        assert asyncio.run(fetch()).status_code == 200
+        assert quota.used == 6
+        http.close()
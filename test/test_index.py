@@ -0,0 +1,28 @@
+import pytest
+
+from tool import index
+from tool.index import ArticleIndex
+from tool.records import ArticleRecord
+
+ARTICLES = [
+    ArticleRecord("반도체 수출 회복", "https://news.example.kr/1", "반도체가 9월 수출을 이끌었다. AI 서버 수요가 컸다."),
+    ArticleRecord("기준금리 동결", "https://news.example.kr/2", "한국은행이 기준금리를 동결했다."),
+]
+
+
+@pytest.mark.parametrize(("tokenizers", "expected"), [
+    (("trigram",), "trigram"),
+    # 오래된 SQLite처럼 trigram이 없으면 단어 단위 색인으로, FTS5를 쓸 수 없으면 LIKE 검색으로 낮춘다
+    (("missing", "unicode61"), "unicode61"),
+    (("missing",), None),
+])
+def test_search_degrades_without_trigram_tokenizer(monkeypatch, tokenizers, expected):
+    monkeypatch.setattr(index, "TOKENIZERS", tokenizers)
+    articles = ArticleIndex()
+    try:
+        assert articles.tokenizer == expected
+        articles.add(ARTICLES)
+        assert [a.url for a in articles.search("반도체 AI", limit=5)] == ["https://news.example.kr/1"]
+        assert [a.url for a in articles.search("기준금리", limit=5)] == ["https://news.example.kr/2"]
+    finally:
+        articles.close()
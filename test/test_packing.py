@@ -0,0 +1,71 @@
+import unicodedata
+
+from tool.normalize import clean_markup, normalize_articles
+from tool.packing import lead_sentences, pack_articles
+from tool.records import ArticleRecord
+
+LEAD = "정부가 반도체 클러스터 전력 지원 방안을 발표했다."
+BODY = "업계는 이번 대책이 투자 속도를 높일 것으로 기대하고 있다."
+BYLINE = "홍길동 기자 gildong@example.co.kr <저작권자 © 무단 전재 및 재배포 금지>"
+
+
+def article(index, text):
+    return ArticleRecord(f"기사 {index}", f"https://news.example.kr/{index}", text)
+
+
+def test_lead_sentences_drop_boilerplate_and_repeats():
+    assert lead_sentences(f"{LEAD} {BODY} {LEAD} {BYLINE}") == [LEAD, BODY]
+
+
+def test_lead_sentences_keep_body_sentences_about_copyright():
+    # '저작권'·'copyright'를 다루는 본문 문장은 서명 줄이 아니므로 남긴다
+    copyright_news = "음원 저작권 분쟁이 법원 판결로 일단락됐다."
+    quoted = "업계는 copyright 표기 의무화에도 반대했다."
+    assert lead_sentences(f"{LEAD} {copyright_news} {quoted} {BYLINE}") == [LEAD, copyright_news, quoted]
+
+
+def test_pack_articles_fits_budget_and_keeps_leads():
+    long_text = " ".join(f"{BODY[:-1]} {n}번째 문장이다." for n in range(200))
+    articles = [article(1, f"{LEAD} {long_text}"), article(2, f"{LEAD} {BODY}"), article(3, long_text)]
+    packed = pack_articles(articles, budget=3000, min_bytes=300)
+
+    size = sum(len((a.title + a.url + a.text).encode("utf-8")) for a in packed)
+    assert size <= 3000
+    assert [a.url for a in packed] == [a.url for a in articles]
+    assert packed[0].text.startswith(LEAD)
+    # 짧은 기사는 그대로, 남은 예산은 긴 기사들이 나눠 쓴다
+    assert packed[1].text == f"{LEAD} {BODY}"
+    assert len(packed[0].text.encode("utf-8")) > 1000
+
+
+def test_pack_articles_stops_when_budget_runs_out():
+    long_text = " ".join(f"{BODY[:-1]} {n}번째 문장이다." for n in range(50))
+    articles = [article(index, long_text) for index in range(10)]
+    packed = pack_articles(articles, budget=2000, min_bytes=500)
+    assert 1 <= len(packed) < 10
+    assert sum(len((a.title + a.url + a.text).encode("utf-8")) for a in packed) <= 2000
+
+
+def test_pack_articles_keeps_most_relevant_when_budget_is_short():
+    long_text = " ".join(f"{BODY[:-1]} {n}번째 문장이다." for n in range(50))
+    articles = [
+        ArticleRecord("증시 마감 시황", "https://news.example.kr/1", long_text),
+        ArticleRecord("환율 급등", "https://news.example.kr/2", long_text),
+        ArticleRecord("반도체 수출 회복", "https://news.example.kr/3", f"{LEAD} {long_text}"),
+    ]
+    # 예산에 두 건만 들어가면 뒤쪽이라도 제목에 검색어가 있는 기사를 남기고, 응답 순서는 유지한다
+    packed = pack_articles(articles, budget=1500, min_bytes=500, query="반도체 수출")
+    assert [a.url for a in packed] == ["https://news.example.kr/1", "https://news.example.kr/3"]
+    packed = pack_articles(articles, budget=1500, min_bytes=500)
+    assert [a.url for a in packed] == ["https://news.example.kr/1", "https://news.example.kr/2"]
+
+
+def test_clean_markup_unescapes_all_entities():
+    assert clean_markup("<b>HBM</b>  증설 &quot;확대&quot; &amp; &lt;속보&gt;") == 'HBM 증설 "확대" & <속보>'
+
+
+def test_normalize_articles_strips_bylines_and_composes_hangul():
+    text = f"[서울=뉴시스] 김민수 기자 = {LEAD}\u200b  {BODY} 문의 tip@example.com {BYLINE}"
+    (normalized,) = normalize_articles([article(1, unicodedata.normalize("NFD", text))])
+    assert normalized.text == f"{LEAD} {BODY} 문의"
+    assert normalized.title == "기사 1"